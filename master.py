@@ -40,18 +40,92 @@ Before running:
 """
 
 import argparse
-import sys
+import asyncio
+import functools
+import logging
 import os
+import time
 from datetime import datetime
-from pathlib import Path
 
-# Add scripts directory to path
-SCRIPT_DIR = Path(__file__).parent / "scripts"
-sys.path.insert(0, str(SCRIPT_DIR))
+logger = logging.getLogger("semrush_auto_analyzer")
+
+# Process start time, formatted once for the header
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+START_TIME = datetime.now()
+START_STR = START_TIME.strftime(TIMESTAMP_FORMAT)
 
 # Global config path (can be overridden by --config-file)
 CONFIG_PATH = "config/config.yaml"
 
+# --force: also bypass pipelines' own caches (e.g. reused SEMrush screenshots)
+FORCE = False
+
+# Pipeline dependency graph: pipeline -> pipelines whose outputs it reads.
+# Dependencies outside the selected node set are ignored.
+PIPELINE_DAG = {
+    'semrush': [],
+    'keywords': [],
+    'backlinks': [],
+    'traffic': [],
+    'paid_media': [],
+    'reviews': [],
+    'sentiment': ['reviews'],
+    'ai_visibility': [],
+    'projections': ['paid_media'],
+    'dashboard': ['keywords', 'backlinks', 'ai_visibility'],
+}
+
+# Concurrency limits each pipeline must acquire, as config sections holding
+# max_concurrent. Every Selenium pipeline drives the same debug Chrome, so
+# they all share the 'semrush' limit. Always acquired in this order.
+PIPELINE_LIMITS = {
+    'semrush': ('semrush',),
+    'keywords': ('semrush',),
+    'backlinks': ('semrush',),
+    'traffic': ('semrush',),
+    'paid_media': ('semrush',),
+    'reviews': ('semrush', 'google_reviews'),
+    'ai_visibility': ('semrush',),
+}
+DEFAULT_MAX_CONCURRENT = 1
+
+# What each pipeline's cached result depends on: config sections, plus input
+# files (relative to the data dir) written by upstream pipelines.
+PIPELINE_CACHE_DEPS = {
+    'semrush': (('target', 'competitors', 'semrush', 'market_keywords', 'industry', 'output'), ()),
+    'keywords': (('target', 'competitors', 'semrush', 'market_keywords', 'output'), ()),
+    'backlinks': (('target', 'competitors', 'semrush', 'output'), ()),
+    'traffic': (('competitors', 'semrush', 'market_keywords', 'output'), ()),
+    'paid_media': (('competitors', 'semrush', 'market_keywords', 'output'), ()),
+    'reviews': (('competitors', 'google_reviews', 'semrush', 'output'), ()),
+    'sentiment': (('analysis', 'output'),
+                  ('reviews/all_reviews.parquet', 'reviews/all_reviews.jsonl',
+                   'reviews/all_reviews.json', 'reviews/all_reviews.csv')),
+    'ai_visibility': (('target', 'competitors', 'semrush', 'market_keywords', 'output'), ()),
+    'projections': (('target', 'projections', 'output'),
+                    ('paid_media/paid_media_benchmarks.json',)),
+    'dashboard': (('target', 'dashboard', 'output'),
+                  ('semrush/keyword_market_data.json', 'semrush/backlink_data.json',
+                   'semrush/ai_visibility_data.json')),
+}
+DEFAULT_CACHE_MAX_AGE_HOURS = 24
+
+# What each pipeline writes: paths relative to the output dir, and to the data
+# dir. A cached run only counts while all of them still exist (directories
+# must be non-empty). The dashboard's destination comes from its own config.
+PIPELINE_OUTPUTS = {
+    'semrush': (('screenshots/semrush',), ()),
+    'keywords': ((), ('semrush/keyword_market_data.json',)),
+    'backlinks': ((), ('semrush/backlink_data.json',)),
+    'traffic': (('screenshots/traffic',), ()),
+    'paid_media': ((), ('paid_media/paid_media_benchmarks.json',)),
+    'reviews': ((), ('reviews/all_reviews.jsonl',)),
+    'sentiment': (('analysis/analysis.json',), ()),
+    'ai_visibility': ((), ('semrush/ai_visibility_data.json',)),
+    'projections': (('projections',), ()),
+    'dashboard': ((), ()),
+}
+
 
 def set_config_path(path):
     """Set the global config path."""
@@ -59,6 +133,12 @@ def set_config_path(path):
     CONFIG_PATH = path
 
 
+def set_force(force):
+    """Set the global --force flag."""
+    global FORCE
+    FORCE = force
+
+
 def print_header():
     """Print welcome header"""
     print("=" * 70)
@@ -70,15 +150,22 @@ def print_header():
     print("                                              ")
     print("        AUTO ANALYZER - Master Script         ")
     print("=" * 70)
-    print(f"  Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Started: {START_STR}")
     print(f"  Config: {CONFIG_PATH}")
     print("=" * 70)
     print()
 
 
+def completed_line():
+    """Format the summary footer with end time and elapsed time since start"""
+    now = datetime.now()
+    elapsed = (now - START_TIME).total_seconds()
+    return f"  Completed: {now.strftime(TIMESTAMP_FORMAT)} ({elapsed:.0f}s elapsed)"
+
+
 def show_config():
     """Display current configuration"""
-    from config_loader import load_config
+    from scripts.config_loader import load_config
     config = load_config(CONFIG_PATH)
 
     print("\n[CONFIG] CURRENT CONFIGURATION")
@@ -97,6 +184,8 @@ def show_config():
     print(f"\n[SEMRUSH] SEMrush Settings:")
     print(f"   Database: {config.get('semrush', {}).get('database', 'us')}")
     print(f"   Chrome Port: {config.get('semrush', {}).get('chrome_debug_port', 9222)}")
+    print(f"   Max Concurrent Pipelines: {get_max_concurrent(config, 'semrush')}")
+    print(f"   Max Concurrent Review Scrapes: {get_max_concurrent(config, 'google_reviews')}")
 
     print(f"\n[KEYWORDS] Market Keywords ({len(config.get('market_keywords', []))} total):")
     for kw in config.get('market_keywords', [])[:10]:
@@ -116,213 +205,253 @@ def show_config():
     print("\n" + "-" * 50)
 
 
+def pipeline(label, banner):
+    """
+    Decorator for run_* pipeline entry points: prints the section banner,
+    logs any exception with its traceback and reports failure as False,
+    and logs how long the pipeline took.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            print("\n" + "=" * 70)
+            print(banner)
+            print("=" * 70)
+
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                logger.exception("[ERROR] %s failed: %s", label, e)
+                return False
+            finally:
+                logger.info("[TIMING] %s: %.1fs", label, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@pipeline("SEMrush export", "[SEMRUSH] RUNNING SEMRUSH DATA EXPORT")
 def run_semrush_export():
     """Run SEMrush data export"""
-    print("\n" + "=" * 70)
-    print("[SEMRUSH] RUNNING SEMRUSH DATA EXPORT")
-    print("=" * 70)
-
-    try:
-        from semrush_exporter import SEMrushExporter
-        exporter = SEMrushExporter(CONFIG_PATH)
-        return exporter.run_full_export()
-    except Exception as e:
-        print(f"[ERROR] SEMrush export failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    from scripts.semrush_exporter import SEMrushExporter
+    exporter = SEMrushExporter(CONFIG_PATH, force=FORCE)
+    return exporter.run_full_export()
 
 
+@pipeline("Traffic analysis", "[TRAFFIC] RUNNING TRAFFIC ANALYSIS")
 def run_traffic_analysis():
     """Run traffic deep analysis"""
-    print("\n" + "=" * 70)
-    print("[TRAFFIC] RUNNING TRAFFIC ANALYSIS")
-    print("=" * 70)
-
-    try:
-        from traffic_analyzer import TrafficAnalyzer
-        analyzer = TrafficAnalyzer(CONFIG_PATH)
-        return analyzer.run_full_analysis()
-    except Exception as e:
-        print(f"[ERROR] Traffic analysis failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    from scripts.traffic_analyzer import TrafficAnalyzer
+    analyzer = TrafficAnalyzer(CONFIG_PATH)
+    return analyzer.run_full_analysis()
 
 
+@pipeline("Paid media benchmarks", "[PAID] RUNNING PAID MEDIA BENCHMARKS")
 def run_paid_media_benchmarks():
     """Run paid media benchmarks analysis"""
-    print("\n" + "=" * 70)
-    print("[PAID] RUNNING PAID MEDIA BENCHMARKS")
-    print("=" * 70)
-
-    try:
-        from paid_media_benchmarks import PaidMediaBenchmarks
-        analyzer = PaidMediaBenchmarks(CONFIG_PATH)
-        return analyzer.run()
-    except Exception as e:
-        print(f"[ERROR] Paid media benchmarks failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    from scripts.paid_media_benchmarks import PaidMediaBenchmarks
+    analyzer = PaidMediaBenchmarks(CONFIG_PATH)
+    return analyzer.run()
 
 
+@pipeline("Reviews scraper", "[REVIEWS] RUNNING REVIEWS SCRAPER")
 def run_reviews_scraper():
     """Run Google Reviews scraper"""
-    print("\n" + "=" * 70)
-    print("[REVIEWS] RUNNING REVIEWS SCRAPER")
-    print("=" * 70)
-
-    try:
-        from reviews_scraper import ReviewsScraper
-        scraper = ReviewsScraper(CONFIG_PATH)
-        results = scraper.run_full_scrape()
-        return len(results) > 0
-    except Exception as e:
-        print(f"[ERROR] Reviews scraper failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    from scripts.reviews_scraper import ReviewsScraper
+    scraper = ReviewsScraper(CONFIG_PATH)
+    review_count = scraper.run_full_scrape()
+    return review_count > 0
 
 
+@pipeline("Sentiment analysis", "[SENTIMENT] RUNNING SENTIMENT ANALYSIS")
 def run_sentiment_analysis():
     """Run sentiment analysis"""
-    print("\n" + "=" * 70)
-    print("[SENTIMENT] RUNNING SENTIMENT ANALYSIS")
-    print("=" * 70)
-
-    try:
-        from sentiment_analyzer import SentimentAnalyzer
-        analyzer = SentimentAnalyzer(CONFIG_PATH)
-        report = analyzer.run()
-        return report is not None
-    except Exception as e:
-        print(f"[ERROR] Sentiment analysis failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    from scripts.sentiment_analyzer import SentimentAnalyzer
+    analyzer = SentimentAnalyzer(CONFIG_PATH)
+    report = analyzer.run()
+    return report is not None
 
 
+@pipeline("Growth projections", "[PROJECTIONS] RUNNING GROWTH PROJECTIONS")
 def run_growth_projections(interactive=False, spend=None, aov=None, cpc=None, cr=None, months=6):
     """Run growth projections"""
-    print("\n" + "=" * 70)
-    print("[PROJECTIONS] RUNNING GROWTH PROJECTIONS")
-    print("=" * 70)
-
-    try:
-        from growth_projector import GrowthProjector
-        projector = GrowthProjector(CONFIG_PATH)
-
-        if interactive:
-            projector.run_interactive()
-            return True
-        elif spend and aov:
-            # Use CLI arguments
-            projections = projector.generate_projections(
-                monthly_ad_spend=spend,
-                aov=aov,
-                cpc=cpc,
-                conversion_rate=cr,
-                months=months
-            )
-            projector.print_projection_table(projections)
-            projector.save_projections(projections)
-            return True
-        else:
-            result = projector.run_from_config()
-            return result is not None
-    except Exception as e:
-        print(f"[ERROR] Growth projections failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    from scripts.growth_projector import GrowthProjector
+    projector = GrowthProjector(CONFIG_PATH)
+
+    if interactive:
+        projector.run_interactive()
+        return True
+    elif spend and aov:
+        # Use CLI arguments
+        projections = projector.generate_projections(
+            monthly_ad_spend=spend,
+            aov=aov,
+            cpc=cpc,
+            conversion_rate=cr,
+            months=months
+        )
+        projector.print_projection_table(projections)
+        projector.save_projections(projections)
+        return True
+    else:
+        result = projector.run_from_config()
+        return result is not None
 
 
+@pipeline("Keyword intelligence", "[KEYWORDS] RUNNING KEYWORD INTELLIGENCE")
 def run_keyword_intelligence():
     """Run keyword intelligence scraper (Selenium-based)"""
-    print("\n" + "=" * 70)
-    print("[KEYWORDS] RUNNING KEYWORD INTELLIGENCE")
-    print("=" * 70)
-
-    try:
-        from keyword_intelligence import run_keyword_intelligence as _run
-        config = load_config(CONFIG_PATH)
-        return _run(config)
-    except Exception as e:
-        print(f"[ERROR] Keyword intelligence failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    from scripts.config_loader import load_config
+    from scripts.keyword_intelligence import run_keyword_intelligence as _run
+    config = load_config(CONFIG_PATH)
+    return _run(config)
 
 
+@pipeline("Backlink analysis", "[BACKLINKS] RUNNING BACKLINK ANALYSIS")
 def run_backlink_analysis():
     """Run backlink analysis scraper (Selenium-based)"""
-    print("\n" + "=" * 70)
-    print("[BACKLINKS] RUNNING BACKLINK ANALYSIS")
-    print("=" * 70)
-
-    try:
-        from backlink_analyzer import run_backlink_analysis as _run
-        config = load_config(CONFIG_PATH)
-        return _run(config)
-    except Exception as e:
-        print(f"[ERROR] Backlink analysis failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    from scripts.config_loader import load_config
+    from scripts.backlink_analyzer import run_backlink_analysis as _run
+    config = load_config(CONFIG_PATH)
+    return _run(config)
 
 
+@pipeline("AI visibility analysis", "[AI] RUNNING AI VISIBILITY ANALYSIS")
 def run_ai_visibility():
     """Run AI visibility analysis (Selenium + config-based)"""
-    print("\n" + "=" * 70)
-    print("[AI] RUNNING AI VISIBILITY ANALYSIS")
-    print("=" * 70)
-
-    try:
-        from ai_visibility import run_ai_visibility_analysis as _run
-        config = load_config(CONFIG_PATH)
-        return _run(config)
-    except Exception as e:
-        print(f"[ERROR] AI visibility analysis failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    from scripts.config_loader import load_config
+    from scripts.ai_visibility import run_ai_visibility_analysis as _run
+    config = load_config(CONFIG_PATH)
+    return _run(config)
 
 
+@pipeline("Dashboard export", "[DASHBOARD] EXPORTING TO DASHBOARD")
 def run_dashboard_export():
     """Export data to Google Ads Dashboard"""
-    print("\n" + "=" * 70)
-    print("[DASHBOARD] EXPORTING TO DASHBOARD")
-    print("=" * 70)
+    from scripts.config_loader import load_config
+    from scripts.dashboard_exporter import export_to_dashboard
+    config = load_config(CONFIG_PATH)
+    files = export_to_dashboard(config, "data/semrush")
+    return files is not None and len(files) > 0
 
-    try:
-        from dashboard_exporter import export_to_dashboard
-        config = load_config(CONFIG_PATH)
-        files = export_to_dashboard(config, "data/semrush")
-        return files is not None and len(files) > 0
-    except Exception as e:
-        print(f"[ERROR] Dashboard export failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
 
+async def _run_async(fn, *args, **kwargs):
+    """Run a blocking pipeline function in a worker thread."""
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+PIPELINE_RUNNERS = {
+    'semrush': run_semrush_export,
+    'keywords': run_keyword_intelligence,
+    'backlinks': run_backlink_analysis,
+    'traffic': run_traffic_analysis,
+    'paid_media': run_paid_media_benchmarks,
+    'reviews': run_reviews_scraper,
+    'sentiment': run_sentiment_analysis,
+    'ai_visibility': run_ai_visibility,
+    'projections': run_growth_projections,
+    'dashboard': run_dashboard_export,
+}
+
+
+async def _run_limited(fn, semaphores):
+    """Run a pipeline in a worker thread while holding the given semaphores."""
+    if not semaphores:
+        return await _run_async(fn)
+    async with semaphores[0]:
+        return await _run_limited(fn, semaphores[1:])
+
+
+def get_max_concurrent(config, section):
+    """Read <section>.max_concurrent from config (minimum 1)"""
+    value = (config.get(section) or {}).get('max_concurrent', DEFAULT_MAX_CONCURRENT)
+    return max(1, int(value))
+
+
+def pipeline_outputs(config, node):
+    """Absolute paths of the files/directories a pipeline writes"""
+    from scripts.config_loader import get_output_dir, get_data_dir
+
+    output_paths, data_paths = PIPELINE_OUTPUTS.get(node, ((), ()))
+    output_dir, data_dir = get_output_dir(config), get_data_dir(config)
+    return [str(output_dir / p) for p in output_paths] + [str(data_dir / p) for p in data_paths]
+
+
+def pipeline_hash(config, node):
+    """Hash of the config sections and upstream files a pipeline depends on"""
+    from scripts.config_loader import get_data_dir
+    from scripts.result_cache import config_hash
+
+    sections, inputs = PIPELINE_CACHE_DEPS[node]
+    data_dir = get_data_dir(config)
+    return config_hash(node, config, sections, [data_dir / p for p in inputs])
 
-def run_all():
-    """Run all pipelines"""
-    results = {}
 
+async def run_dag(nodes, force=False):
+    """
+    Run the selected pipelines, starting each one as soon as the pipelines
+    it depends on have finished. Returns {pipeline: success} in DAG order.
+
+    Pipelines that already succeeded with the same config/input hash within
+    cache.max_age_hours are skipped unless force is set.
+    """
+    from scripts.config_loader import load_config, get_data_dir
+    from scripts.result_cache import ResultCache
+    config = load_config(CONFIG_PATH)
+    cache = ResultCache(get_data_dir(config) / "result_cache.sqlite3")
+    max_age = (config.get('cache') or {}).get('max_age_hours', DEFAULT_CACHE_MAX_AGE_HOURS) * 3600
+    hashes = {}
+
+    nodes = set(nodes)
+    deps = {n: set(PIPELINE_DAG[n]) & nodes for n in nodes}
+    # Semaphores are bound to the running loop, so build them per run
+    sections = {s for n in nodes for s in PIPELINE_LIMITS.get(n, ())}
+    semaphores = {s: asyncio.Semaphore(get_max_concurrent(config, s)) for s in sections}
+    pending = set(nodes)
+    running = {}
+    done = {}
+
+    while pending or running:
+        ready = [n for n in PIPELINE_DAG if n in pending and deps[n] <= done.keys()]
+        while ready:
+            for node in ready:
+                pending.discard(node)
+                hashes[node] = pipeline_hash(config, node)
+                if not force and cache.hit(node, hashes[node], max_age):
+                    # Finishes immediately, which may unblock more nodes
+                    done[node] = True
+                    print(f"[DAG] TASK_CACHED: {node} (unchanged, use --force to re-run)")
+                    continue
+                print(f"[DAG] TASK_STARTED: {node}")
+                limits = [semaphores[s] for s in PIPELINE_LIMITS.get(node, ())]
+                task = asyncio.create_task(_run_limited(PIPELINE_RUNNERS[node], limits))
+                running[task] = node
+            ready = [n for n in PIPELINE_DAG if n in pending and deps[n] <= done.keys()]
+
+        if not running:
+            if pending:
+                raise RuntimeError(f"Unsatisfiable pipeline dependencies: {sorted(pending)}")
+            break
+
+        finished, _ = await asyncio.wait(set(running), return_when=asyncio.FIRST_COMPLETED)
+        for task in finished:
+            node = running.pop(task)
+            done[node] = task.result()
+            print(f"[DAG] TASK_COMPLETED: {node} ({'ok' if done[node] else 'failed'})")
+            if done[node]:
+                cache.put(node, hashes[node], {
+                    'config_file': CONFIG_PATH,
+                    'outputs': pipeline_outputs(config, node),
+                })
+
+    return {n: done[n] for n in PIPELINE_DAG if n in done}
+
+
+async def run_all(force=False):
+    """Run all pipelines"""
     print("\n[START] Running all analysis pipelines...\n")
 
-    results['semrush'] = run_semrush_export()
-    results['keywords'] = run_keyword_intelligence()
-    results['backlinks'] = run_backlink_analysis()
-    results['traffic'] = run_traffic_analysis()
-    results['paid_media'] = run_paid_media_benchmarks()
-    results['reviews'] = run_reviews_scraper()
-    results['sentiment'] = run_sentiment_analysis()
-    results['ai_visibility'] = run_ai_visibility()
-    results['projections'] = run_growth_projections()
-    results['dashboard'] = run_dashboard_export()
+    results = await run_dag(PIPELINE_DAG, force=force)
 
     # Summary
     print("\n" + "=" * 70)
@@ -334,38 +463,22 @@ def run_all():
         print(f"   {pipeline.replace('_', ' ').title()}: {status}")
 
     print("\n" + "=" * 70)
-    print(f"  Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(completed_line())
     print("=" * 70)
 
     return all(results.values())
 
 
-def run_new_business_analysis():
+async def run_new_business_analysis(force=False):
     """
     Run analysis pipeline optimized for new business projections.
     Focuses on competitor benchmarks and growth projections.
     """
-    results = {}
-
     print("\n[NEW BUSINESS] Running new business analysis pipeline...\n")
     print("This pipeline is optimized for pre-launch or newly launched businesses.")
     print("Focus: Competitor benchmarks, paid media CPCs, growth projections\n")
 
-    # Step 1: Get competitor paid media benchmarks (CPC, ad spend)
-    print("\n[Step 1/4] Analyzing competitor paid media...")
-    results['paid_media'] = run_paid_media_benchmarks()
-
-    # Step 2: Traffic analysis for competitor benchmarks
-    print("\n[Step 2/4] Analyzing competitor traffic patterns...")
-    results['traffic'] = run_traffic_analysis()
-
-    # Step 3: Competitor reviews for market insights
-    print("\n[Step 3/4] Scraping competitor reviews...")
-    results['reviews'] = run_reviews_scraper()
-
-    # Step 4: Generate growth projections
-    print("\n[Step 4/4] Generating growth projections...")
-    results['projections'] = run_growth_projections()
+    results = await run_dag({'paid_media', 'traffic', 'reviews', 'projections'}, force=force)
 
     # Summary
     print("\n" + "=" * 70)
@@ -383,55 +496,25 @@ def run_new_business_analysis():
     print("   - output/analysis/ - Sentiment analysis reports")
 
     print("\n" + "=" * 70)
-    print(f"  Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(completed_line())
     print("=" * 70)
 
     return all(results.values())
 
 
-def run_established_business_analysis():
+async def run_established_business_analysis(force=False):
     """
     Run analysis pipeline optimized for established businesses.
     Focuses on own traffic analysis, competitor comparison, and optimization opportunities.
     """
-    results = {}
-
     print("\n[ESTABLISHED BUSINESS] Running established business analysis pipeline...\n")
     print("This pipeline is for businesses with 6+ months of traffic data.")
     print("Focus: Own traffic analysis, competitor gaps, optimization opportunities\n")
 
-    # Step 1: Full SEMrush export (own domain + competitors)
-    print("\n[Step 1/8] Exporting SEMrush data (organic keywords, backlinks)...")
-    results['semrush'] = run_semrush_export()
-
-    # Step 2: Keyword intelligence (API-based Volume/KD/CPC/Intent)
-    print("\n[Step 2/8] Running keyword intelligence...")
-    results['keywords'] = run_keyword_intelligence()
-
-    # Step 3: Backlink analysis
-    print("\n[Step 3/8] Analyzing backlink profiles...")
-    results['backlinks'] = run_backlink_analysis()
-
-    # Step 4: Deep traffic analysis (includes own domain)
-    print("\n[Step 4/8] Deep traffic analysis...")
-    results['traffic'] = run_traffic_analysis()
-
-    # Step 5: Paid media comparison
-    print("\n[Step 5/8] Analyzing paid media landscape...")
-    results['paid_media'] = run_paid_media_benchmarks()
-
-    # Step 6: Competitor reviews for market positioning
-    print("\n[Step 6/8] Scraping competitor reviews...")
-    results['reviews'] = run_reviews_scraper()
-
-    # Step 7: Sentiment + AI visibility
-    print("\n[Step 7/8] Running sentiment & AI visibility analysis...")
-    results['sentiment'] = run_sentiment_analysis()
-    results['ai_visibility'] = run_ai_visibility()
-
-    # Step 8: Dashboard export
-    print("\n[Step 8/8] Exporting to dashboard...")
-    results['dashboard'] = run_dashboard_export()
+    results = await run_dag({
+        'semrush', 'keywords', 'backlinks', 'traffic', 'paid_media',
+        'reviews', 'sentiment', 'ai_visibility', 'dashboard'
+    }, force=force)
 
     # Summary
     print("\n" + "=" * 70)
@@ -455,14 +538,14 @@ def run_established_business_analysis():
     print("   4. Use sentiment data to improve product/service")
 
     print("\n" + "=" * 70)
-    print(f"  Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(completed_line())
     print("=" * 70)
 
     return all(results.values())
 
 
 def main():
-    from config_loader import ensure_directories, load_config
+    from scripts.config_loader import ensure_directories, load_config
 
     parser = argparse.ArgumentParser(
         description="SemRush Auto Analyzer - Master Control Script",
@@ -530,14 +613,20 @@ Setup:
     parser.add_argument('--cr', type=float, help='Conversion rate (%%)')
     parser.add_argument('--months', type=int, default=6, help='Months to project (default: 6)')
 
+    parser.add_argument('--force', action='store_true',
+                        help='Re-run pipelines even if cached results are unchanged (--all / --business-age), '
+                             'and re-capture SEMrush screenshots (--semrush too)')
     parser.add_argument('--config', action='store_true', help='Show current config')
     parser.add_argument('--config-file', type=str, default='config/config.yaml',
                         help='Path to configuration file (default: config/config.yaml)')
 
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Set config path
     set_config_path(args.config_file)
+    set_force(args.force)
 
     print_header()
 
@@ -552,9 +641,9 @@ Setup:
 
     # Run specific pipelines
     if args.business_age == 'new' or args.new_business:
-        run_new_business_analysis()
+        asyncio.run(run_new_business_analysis(force=args.force))
     elif args.business_age == 'established':
-        run_established_business_analysis()
+        asyncio.run(run_established_business_analysis(force=args.force))
     elif args.semrush:
         run_semrush_export()
     elif args.traffic:
@@ -584,7 +673,7 @@ Setup:
     elif args.dashboard:
         run_dashboard_export()
     elif args.all:
-        run_all()
+        asyncio.run(run_all(force=args.force))
     else:
         # No args - show help
         parser.print_help()
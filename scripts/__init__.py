@@ -0,0 +1 @@
+"""SemRush Auto Analyzer pipeline modules."""
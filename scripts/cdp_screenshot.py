@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+CDP Full-Page Screenshots
+Page.captureScreenshot params that capture the whole document at once,
+shared by the SEMrush exporter and the traffic analyzer.
+"""
+
+
+def full_page_params(metrics):
+    """
+    Page.captureScreenshot params covering the whole document, from a
+    Page.getLayoutMetrics result. captureBeyondViewport alone still returns
+    a viewport-sized image; the clip is what sizes the capture.
+    """
+    size = metrics.get("cssContentSize") or metrics["contentSize"]
+    return {
+        "clip": {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": 1},
+        "captureBeyondViewport": True,
+    }
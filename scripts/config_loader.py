@@ -4,10 +4,50 @@ Configuration Loader
 Loads and validates config.yaml settings
 """
 
+import json
 import os
 import yaml
 from pathlib import Path
 
+# Prefer the libyaml C parser, fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Optional faster JSON parser/serializer for data files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Repository root (config/, output/ and data/ are resolved against it)
+_SCRIPT_DIR = Path(__file__).resolve().parent.parent
+
+# Leaf directories created by ensure_directories(), relative to the output/data dirs
+OUTPUT_SUBDIRS = (
+    "screenshots/semrush",
+    "screenshots/traffic",
+    "screenshots/paid_media",
+    "exports",
+    "analysis",
+    "projections",
+)
+DATA_SUBDIRS = (
+    "reviews",
+    "semrush",
+    "paid_media",
+)
+
+# Parsed files: path -> (mtime_ns, data). A changed mtime invalidates the entry.
+_FILE_CACHE = {}
+
+# Derived lookups: id(config) -> (config, views)
+_VIEW_CACHE = {}
+
+# (output_dir, data_dir) pairs ensure_directories() has already created
+_ENSURED = set()
+
 
 def get_config_path(config_file=None):
     """Get path to config file"""
@@ -16,91 +56,174 @@ def get_config_path(config_file=None):
         if os.path.isabs(config_file):
             return Path(config_file)
         # If relative, resolve from script parent directory
-        script_dir = Path(__file__).parent.parent
-        return script_dir / config_file
+        return _SCRIPT_DIR / config_file
     # Default config path
-    script_dir = Path(__file__).parent.parent
-    return script_dir / "config" / "config.yaml"
+    return _SCRIPT_DIR / "config" / "config.yaml"
+
+
+def _load_cached(path, parse):
+    """
+    Parse a file with parse(f), caching the result per (path, mtime).
+    Raises FileNotFoundError if the file does not exist.
+    """
+    mtime = os.stat(path).st_mtime_ns
+
+    cached = _FILE_CACHE.get(str(path))
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'r') as f:
+        data = parse(f)
+    _FILE_CACHE[str(path)] = (mtime, data)
+
+    return data
 
 
 def load_config(config_file=None):
-    """Load configuration from YAML file"""
+    """
+    Load configuration from YAML file.
+
+    Results are cached per (path, mtime), so repeated calls only re-parse
+    the file after it changes. The returned dict is shared between callers
+    and must be treated as read-only.
+    """
     config_path = get_config_path(config_file)
 
-    if not config_path.exists():
+    try:
+        return _load_cached(config_path, lambda f: yaml.load(f, Loader=_YamlLoader))
+    except FileNotFoundError:
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
 
-    return config
+def _parse_json(f):
+    """Parse an open JSON file, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(f.read())
+    return json.load(f)
+
+
+def load_json(path):
+    """
+    Load a JSON data file (e.g. benchmarks written by another pipeline),
+    cached per (path, mtime) like load_config. Treat the result as read-only.
+    """
+    return _load_cached(path, _parse_json)
+
+
+def save_json(path, data, indent=2, default=None):
+    """
+    Write data as JSON, with orjson when available. indent=None writes
+    compact JSON for files only read by other scripts. default converts
+    otherwise unserializable values, as in json.dump (orjson also handles
+    numpy scalars and arrays natively).
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent is not None:
+            option |= orjson.OPT_INDENT_2
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, default=default, option=option))
+        return
+    with open(path, 'w') as f:
+        if indent is None:
+            json.dump(data, f, separators=(',', ':'), default=default)
+        else:
+            json.dump(data, f, indent=indent, default=default)
+
+
+def _config_views(config):
+    """
+    Derived directory/target/competitor lookups for a loaded config,
+    computed once per config object. The config is stored alongside its
+    views so a recycled id() can never return views for a different dict.
+    """
+    cached = _VIEW_CACHE.get(id(config))
+    if cached and cached[0] is config:
+        return cached[1]
+
+    target = config.get('target', {})
+    competitors = config.get('competitors', [])
+    target_domain = target.get('domain', '')
+
+    # (domain, name) pairs in one pass over the competitor list
+    pairs = [(domain, c.get('name')) for c in competitors if (domain := c.get('domain'))]
+    competitor_domains = tuple(domain for domain, _ in pairs)
+    competitor_names = dict(pairs)
+
+    output = config.get('output', {})
+
+    views = {
+        'output_dir': _SCRIPT_DIR / (output.get('base_dir') or "output"),
+        'data_dir': _SCRIPT_DIR / (output.get('data_dir') or "data"),
+        'target_domain': target_domain,
+        'target_name': target.get('name', ''),
+        'competitor_domains': competitor_domains,
+        'competitor_names': competitor_names,
+        'all_domains': ((target_domain,) if target_domain else ()) + competitor_domains,
+    }
+    _VIEW_CACHE[id(config)] = (config, views)
+    return views
 
 
 def get_target_domain(config):
     """Get target domain from config"""
-    return config.get('target', {}).get('domain', '')
+    return _config_views(config)['target_domain']
 
 
 def get_target_name(config):
     """Get target name from config"""
-    return config.get('target', {}).get('name', '')
+    return _config_views(config)['target_name']
 
 
 def get_competitor_domains(config):
-    """Get list of competitor domains"""
-    competitors = config.get('competitors', [])
-    return [c.get('domain') for c in competitors if c.get('domain')]
+    """Get tuple of competitor domains"""
+    return _config_views(config)['competitor_domains']
 
 
 def get_competitor_names(config):
-    """Get dict mapping domain to name"""
-    competitors = config.get('competitors', [])
-    return {c.get('domain'): c.get('name') for c in competitors}
+    """Get dict mapping domain to name (shared, treat as read-only)"""
+    return _config_views(config)['competitor_names']
 
 
 def get_all_domains(config):
     """Get target + all competitor domains"""
-    domains = []
-    target = get_target_domain(config)
-    if target:
-        domains.append(target)
-    domains.extend(get_competitor_domains(config))
-    return domains
+    return _config_views(config)['all_domains']
 
 
 def get_output_dir(config=None):
     """Get output directory path"""
-    script_dir = Path(__file__).parent.parent
-    if config and config.get('output', {}).get('base_dir'):
-        return script_dir / config['output']['base_dir']
-    return script_dir / "output"
+    if config:
+        return _config_views(config)['output_dir']
+    return _SCRIPT_DIR / "output"
 
 
 def get_data_dir(config=None):
     """Get data directory path"""
-    script_dir = Path(__file__).parent.parent
-    if config and config.get('output', {}).get('data_dir'):
-        return script_dir / config['output']['data_dir']
-    return script_dir / "data"
+    if config:
+        return _config_views(config)['data_dir']
+    return _SCRIPT_DIR / "data"
 
 
 def ensure_directories(config=None):
-    """Ensure output and data directories exist"""
+    """Ensure output and data directories exist, returns (output_dir, data_dir)"""
     output_dir = get_output_dir(config)
     data_dir = get_data_dir(config)
 
-    output_dir.mkdir(exist_ok=True)
-    data_dir.mkdir(exist_ok=True)
-    (output_dir / "screenshots").mkdir(exist_ok=True)
-    (output_dir / "screenshots" / "semrush").mkdir(exist_ok=True)
-    (output_dir / "screenshots" / "traffic").mkdir(exist_ok=True)
-    (output_dir / "screenshots" / "paid_media").mkdir(exist_ok=True)
-    (output_dir / "exports").mkdir(exist_ok=True)
-    (output_dir / "analysis").mkdir(exist_ok=True)
-    (output_dir / "projections").mkdir(exist_ok=True)
-    (data_dir / "reviews").mkdir(exist_ok=True)
-    (data_dir / "semrush").mkdir(exist_ok=True)
-    (data_dir / "paid_media").mkdir(exist_ok=True)
+    # Already created in this process
+    if (output_dir, data_dir) in _ENSURED:
+        return output_dir, data_dir
+
+    # Leaf directories only - makedirs creates the intermediate ones.
+    # Check first: makedirs(exist_ok=True) on an existing dir costs a failed
+    # mkdir plus a stat, the check alone is a single stat.
+    for base, subdirs in ((output_dir, OUTPUT_SUBDIRS), (data_dir, DATA_SUBDIRS)):
+        for subdir in subdirs:
+            path = os.path.join(base, subdir)
+            if not os.path.isdir(path):
+                os.makedirs(path, exist_ok=True)
+    _ENSURED.add((output_dir, data_dir))
+
+    return output_dir, data_dir
 
 
 if __name__ == "__main__":
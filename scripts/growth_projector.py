@@ -6,77 +6,343 @@ based on paid media benchmarks and organic growth models.
 """
 
 import os
+import re
 import sys
-import json
 import csv
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
     from scripts.config_loader import (
-        load_config, get_output_dir, get_data_dir, ensure_directories,
-        get_target_name
+        load_config, load_json, save_json, ensure_directories, get_target_name
     )
 except ImportError:
     from config_loader import (
-        load_config, get_output_dir, get_data_dir, ensure_directories,
-        get_target_name
+        load_config, load_json, save_json, ensure_directories, get_target_name
     )
 
 
+# print_projection_table layout
+_HEADER_ROW = (
+    f"{'Month':>6} {'Ad Spend':>12} {'CPC':>8} {'Paid Traffic':>14} {'Organic %':>10} "
+    f"{'Orders':>10} {'Revenue':>14} {'ROAS':>8} {'CAC':>10}"
+)
+_ROW_FMT = (
+    "{month:>6} ${ad_spend:>10,.0f} ${effective_cpc:>6.2f} {paid_traffic:>13,.0f} "
+    "{organic_pct:>9.1f}% {total_orders:>9.0f} ${total_revenue:>12,.0f} {roas:>7.2f}x ${cac:>8.0f}"
+)
+
+
+# Currency/percent decoration and thousands separators accepted in numeric input
+_NUM_RX = re.compile(r'[\s,$%]+')
+
+
+def _parse_num(text: str, default=None, cast=float):
+    """Parse a user-typed number like '$5,000' or '4.5%'; blank input gives default"""
+    cleaned = _NUM_RX.sub('', text)
+    return cast(cleaned) if cleaned else default
+
+
+# save_projections text report: rules are expanded here, fields by str.format
+_REPORT_TEMPLATE = f"""\
+{'=' * 70}
+GROWTH PROJECTION REPORT: {{target_name}}
+Generated: {{generated}}
+{'=' * 70}
+
+PROJECTION INPUTS:
+{'-' * 40}
+Monthly Ad Spend: ${{inputs[monthly_ad_spend]:,.2f}}
+Average Order Value (AOV): ${{inputs[aov]:,.2f}}
+Base Cost Per Click (CPC): ${{inputs[base_cpc]:.2f}}
+Base Conversion Rate: {{inputs[base_conversion_rate]}}%
+Projection Period: {{inputs[months]}} months
+
+
+3-MONTH PROJECTION:
+{'-' * 40}
+Total Marketing Spend: ${{s3[total_spend]:,.2f}}
+Projected Revenue: ${{s3[total_revenue]:,.2f}}
+Projected Orders: {{s3[total_orders]:,.0f}}
+Return on Ad Spend (ROAS): {{s3[roas]}}x
+Traffic Split: {{s3[paid_traffic_pct]}}% Paid / {{s3[organic_traffic_pct]}}% Organic
+
+
+6-MONTH PROJECTION:
+{'-' * 40}
+Total Marketing Spend: ${{s6[total_spend]:,.2f}}
+Projected Revenue: ${{s6[total_revenue]:,.2f}}
+Projected Orders: {{s6[total_orders]:,.0f}}
+Return on Ad Spend (ROAS): {{s6[roas]}}x
+Traffic Split: {{s6[paid_traffic_pct]}}% Paid / {{s6[organic_traffic_pct]}}% Organic
+Average Customer Acquisition Cost: ${{summary[avg_cac]:,.2f}}
+
+
+KEY ASSUMPTIONS:
+{'-' * 40}
+1. CPC optimizes 5-10% per month as algorithms learn
+2. Conversion rate improves 50% by month 6 (reviews, retargeting)
+3. Organic traffic grows from ~5% to ~18% over 6 months
+4. Organic traffic converts 30% higher than paid (warmer)
+5. New domain SEO takes 2-3 months to show results
+
+
+VALIDATION NOTES:
+{'-' * 40}
+- These projections are based on industry benchmarks
+- Actual results will vary based on creative quality,
+  targeting precision, and market conditions
+- Review and adjust monthly based on actual performance
+- The 90% paid / 10% organic split in month 1 is typical
+- The ~80% paid / 20% organic split by month 6 requires
+  consistent SEO and content investment
+"""
+
+# Computed per-month fields (after month/ad_spend) and the precision they
+# are saved with; None rounds to a whole number.
+_MONTHLY_FIELDS = (
+    'effective_cpc', 'effective_cr', 'paid_traffic', 'paid_orders', 'paid_revenue',
+    'organic_pct', 'organic_traffic', 'organic_orders', 'organic_revenue',
+    'total_traffic', 'total_orders', 'total_revenue', 'roas', 'cac'
+)
+_MONTHLY_DIGITS = {
+    'month': None, 'ad_spend': 2, 'effective_cpc': 2, 'effective_cr': 2,
+    'paid_traffic': None, 'paid_orders': 1, 'paid_revenue': 2,
+    'organic_pct': 1, 'organic_traffic': None, 'organic_orders': 1, 'organic_revenue': 2,
+    'total_traffic': None, 'total_orders': 1, 'total_revenue': 2,
+    'roas': 2, 'cac': 2,
+}
+
+
+# Structured array layout returned by calculate_monthly_projections
+MONTHLY_DTYPE = np.dtype(
+    [('month', 'i4'), ('ad_spend', 'f8')] + [(name, 'f8') for name in _MONTHLY_FIELDS]
+)
+
+
+def monthly_records(monthly: np.ndarray) -> List[Dict]:
+    """Per-month dicts (plain Python numbers) from a MONTHLY_DTYPE array"""
+    names = monthly.dtype.names
+    return [dict(zip(names, row)) for row in monthly.tolist()]
+
+
+def _round_monthly(m: Dict, digits=_MONTHLY_DIGITS) -> Dict:
+    """Copy of a monthly projection rounded to its saved precision"""
+    return {k: round(v, digits[k]) for k, v in m.items()}
+
+
+# Default industry benchmarks (used if no benchmark data available).
+# Read-only and shared by every projector; curves list months 1..12 in order.
+DEFAULT_BENCHMARKS = MappingProxyType({
+    'luxury_ecommerce': MappingProxyType({
+        'avg_cpc': 2.50,
+        'avg_cpm': 18.00,
+        'avg_ctr': 1.2,  # percent
+        'conversion_rate_month_1_3': 1.5,  # percent, new brand no social proof
+        'conversion_rate_month_4_6': 2.5,  # percent, with reviews/retargeting
+        'conversion_rate_month_7_12': 3.5,  # percent, established
+        'organic_growth_curve': (  # percent of total traffic from organic
+            5, 7, 10, 12, 15, 18,
+            22, 25, 28, 30, 32, 35
+        ),
+        'cpc_optimization_curve': (  # CPC reduction multiplier by month
+            1.0, 0.95, 0.90, 0.85, 0.82, 0.80,
+            0.78, 0.76, 0.75, 0.74, 0.73, 0.72
+        )
+    })
+})
+
+
+def _curve_table(curve: Tuple[float, ...], default: float) -> np.ndarray:
+    """
+    Turn a months 1..N curve into an array indexed by month number.
+    Index 0 and the final slot hold `default`, so clipping a month into
+    range yields `default` for months outside the curve.
+    """
+    return np.array((default,) + tuple(curve) + (default,))
+
+
+def _curve_lookup(table: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Vectorized curve lookup by month number against a _curve_table()"""
+    return table[np.clip(months, 0, len(table) - 1)]
+
+
+# Curves as month-indexed lookup tables, built once at import
+_CURVE_TABLES = {
+    industry: {
+        'cpc_optimization_curve': _curve_table(b['cpc_optimization_curve'], 0.75),
+        'organic_growth_curve': _curve_table(b['organic_growth_curve'], 35),
+    }
+    for industry, b in DEFAULT_BENCHMARKS.items()
+}
+
+
+def project_months(
+    months: List[int],
+    monthly_ad_spend: float,
+    aov: float,
+    base_cpc: float,
+    base_conversion_rate: float,
+    industry: str = 'luxury_ecommerce'
+) -> np.ndarray:
+    """
+    Core projection model (no I/O), see GrowthProjector.calculate_monthly_projections.
+    Module-level so it can run in worker processes.
+    """
+    curves = _CURVE_TABLES.get(industry, _CURVE_TABLES['luxury_ecommerce'])
+    month_arr = np.asarray(months)
+
+    # Apply optimization curves
+    cpc_multiplier = _curve_lookup(curves['cpc_optimization_curve'], month_arr)
+    effective_cpc = base_cpc * cpc_multiplier
+
+    # Conversion rate improves over time (+50% by month 6, +100% by month 12)
+    effective_cr = np.where(
+        month_arr <= 3, base_conversion_rate,
+        np.where(month_arr <= 6, base_conversion_rate * 1.5, base_conversion_rate * 2.0)
+    )
+
+    # Calculate paid traffic
+    paid_clicks = monthly_ad_spend / effective_cpc
+    paid_orders = paid_clicks * (effective_cr / 100)
+    paid_revenue = paid_orders * aov
+
+    # Calculate organic traffic (grows over time for new brands)
+    organic_pct = _curve_lookup(curves['organic_growth_curve'], month_arr) / 100
+    # Organic traffic is organic_pct of total, so paid is (1 - organic_pct)
+    # Total clicks = paid_clicks / (1 - organic_pct)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total_traffic = np.where(organic_pct < 1, paid_clicks / (1 - organic_pct), paid_clicks)
+    organic_traffic = total_traffic * organic_pct
+
+    # Organic has higher conversion (warmer traffic)
+    organic_cr = effective_cr * 1.3  # 30% higher than paid
+    organic_orders = organic_traffic * (organic_cr / 100)
+    organic_revenue = organic_orders * aov
+
+    # Total metrics
+    total_orders = paid_orders + organic_orders
+    total_revenue = paid_revenue + organic_revenue
+
+    # ROAS and CAC
+    roas = total_revenue / monthly_ad_spend if monthly_ad_spend > 0 else np.zeros_like(total_revenue)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cac = np.where(total_orders > 0, monthly_ad_spend / total_orders, 0)
+
+    columns = (
+        effective_cpc, effective_cr, paid_clicks, paid_orders, paid_revenue,
+        organic_pct * 100, organic_traffic, organic_orders, organic_revenue,
+        total_traffic, total_orders, total_revenue, roas, cac
+    )
+    monthly = np.empty(len(month_arr), dtype=MONTHLY_DTYPE)
+    monthly['month'] = month_arr
+    monthly['ad_spend'] = monthly_ad_spend
+    for name, column in zip(_MONTHLY_FIELDS, columns):
+        monthly[name] = column
+    return monthly
+
+
+def summarize_projection(monthly: np.ndarray) -> Dict:
+    """3-month / 6-month totals for a MONTHLY_DTYPE array"""
+    total_spend = float(monthly['ad_spend'].sum())
+    total_revenue = float(monthly['total_revenue'].sum())
+    total_orders = float(monthly['total_orders'].sum())
+
+    # 3-month summary
+    m3 = monthly[:3]
+    m3_spend = float(m3['ad_spend'].sum())
+    m3_revenue = float(m3['total_revenue'].sum())
+    m3_orders = float(m3['total_orders'].sum())
+    m3_organic_pct = float(monthly['organic_pct'][2]) if len(monthly) >= 3 else 0
+
+    # 6-month summary
+    m6_organic_pct = float(monthly['organic_pct'][min(len(monthly), 6) - 1])
+
+    return {
+        '3_month': {
+            'total_spend': round(m3_spend, 2),
+            'total_revenue': round(m3_revenue, 2),
+            'total_orders': round(m3_orders, 1),
+            'roas': round(m3_revenue / m3_spend, 2) if m3_spend > 0 else 0,
+            'organic_traffic_pct': round(m3_organic_pct, 1),
+            'paid_traffic_pct': round(100 - m3_organic_pct, 1)
+        },
+        '6_month': {
+            'total_spend': round(total_spend, 2),
+            'total_revenue': round(total_revenue, 2),
+            'total_orders': round(total_orders, 1),
+            'roas': round(total_revenue / total_spend, 2) if total_spend > 0 else 0,
+            'organic_traffic_pct': round(m6_organic_pct, 1),
+            'paid_traffic_pct': round(100 - m6_organic_pct, 1)
+        },
+        'avg_cac': round(total_spend / total_orders, 2) if total_orders > 0 else 0
+    }
+
+
+def _project_scenario(params: Tuple[float, float, float, float, int]) -> Dict:
+    """Worker for generate_projection_grid: one (spend, aov, cpc, cr, months) scenario"""
+    monthly_ad_spend, aov, cpc, conversion_rate, months = params
+    monthly = project_months(list(range(1, months + 1)), monthly_ad_spend, aov, cpc, conversion_rate)
+    return {
+        'inputs': {
+            'monthly_ad_spend': monthly_ad_spend,
+            'aov': aov,
+            'base_cpc': cpc,
+            'base_conversion_rate': conversion_rate,
+            'months': months
+        },
+        'monthly': monthly,
+        'summary': summarize_projection(monthly),
+    }
+
+
 class GrowthProjector:
     """
     Projects traffic, orders, and revenue growth for new business launches.
     Uses paid media benchmarks and organic growth models.
     """
 
-    # Default industry benchmarks (used if no benchmark data available)
-    DEFAULT_BENCHMARKS = {
-        'luxury_ecommerce': {
-            'avg_cpc': 2.50,
-            'avg_cpm': 18.00,
-            'avg_ctr': 1.2,  # percent
-            'conversion_rate_month_1_3': 1.5,  # percent, new brand no social proof
-            'conversion_rate_month_4_6': 2.5,  # percent, with reviews/retargeting
-            'conversion_rate_month_7_12': 3.5,  # percent, established
-            'organic_growth_curve': {  # percent of total traffic from organic
-                1: 5, 2: 7, 3: 10, 4: 12, 5: 15, 6: 18,
-                7: 22, 8: 25, 9: 28, 10: 30, 11: 32, 12: 35
-            },
-            'cpc_optimization_curve': {  # CPC reduction multiplier by month
-                1: 1.0, 2: 0.95, 3: 0.90, 4: 0.85, 5: 0.82, 6: 0.80,
-                7: 0.78, 8: 0.76, 9: 0.75, 10: 0.74, 11: 0.73, 12: 0.72
-            }
-        }
-    }
+    # Class-level alias for existing GrowthProjector.DEFAULT_BENCHMARKS callers
+    DEFAULT_BENCHMARKS = DEFAULT_BENCHMARKS
 
     def __init__(self, config_path: str = 'config/config.yaml'):
         self.config = load_config(config_path)
-        ensure_directories(self.config)
 
-        self.output_dir = get_output_dir(self.config)
-        self.data_dir = get_data_dir(self.config)
+        # ensure_directories already creates output/projections. Paths are
+        # kept as plain strings since everything below joins with os.path.
+        output_dir, data_dir = ensure_directories(self.config)
+        self.output_dir = os.fspath(output_dir)
+        self.data_dir = os.fspath(data_dir)
         self.projections_dir = os.path.join(self.output_dir, 'projections')
-        os.makedirs(self.projections_dir, exist_ok=True)
 
         self.target_name = get_target_name(self.config)
         self.benchmarks = self._load_benchmarks()
         self.projection_config = self.config.get('projections', {})
 
     def _load_benchmarks(self) -> Dict:
-        """Load benchmark data from paid_media_benchmarks.json if available."""
+        """
+        Load benchmark data from paid_media_benchmarks.json if available.
+        load_json keeps the parsed file per (path, mtime), so every projector
+        in a process shares one parse until the paid media pipeline rewrites it.
+        """
         benchmark_path = os.path.join(self.data_dir, 'paid_media', 'paid_media_benchmarks.json')
 
-        if os.path.exists(benchmark_path):
-            print(f"[OK] Loading benchmarks from {benchmark_path}")
-            with open(benchmark_path, 'r') as f:
-                return json.load(f)
-        else:
+        try:
+            benchmarks = load_json(benchmark_path)
+        except FileNotFoundError:
             print("[Warning] No benchmark data found, using industry defaults")
-            return {'industry_averages': self.DEFAULT_BENCHMARKS['luxury_ecommerce']}
+            return {'industry_averages': DEFAULT_BENCHMARKS['luxury_ecommerce']}
+
+        print(f"[OK] Loading benchmarks from {benchmark_path}")
+        return benchmarks
 
     def calculate_monthly_projection(
         self,
@@ -101,62 +367,47 @@ class GrowthProjector:
         Returns:
             Dict with all projection metrics for the month
         """
-        defaults = self.DEFAULT_BENCHMARKS.get(industry, self.DEFAULT_BENCHMARKS['luxury_ecommerce'])
-
-        # Apply optimization curves
-        cpc_multiplier = defaults['cpc_optimization_curve'].get(month, 0.75)
-        effective_cpc = base_cpc * cpc_multiplier
-
-        # Conversion rate improves over time
-        if month <= 3:
-            effective_cr = base_conversion_rate
-        elif month <= 6:
-            effective_cr = base_conversion_rate * 1.5  # 50% improvement by month 6
-        else:
-            effective_cr = base_conversion_rate * 2.0  # 100% improvement by month 12
-
-        # Calculate paid traffic
-        paid_clicks = monthly_ad_spend / effective_cpc
-        paid_orders = paid_clicks * (effective_cr / 100)
-        paid_revenue = paid_orders * aov
-
-        # Calculate organic traffic (grows over time for new brands)
-        organic_pct = defaults['organic_growth_curve'].get(month, 35) / 100
-        # Organic traffic is organic_pct of total, so paid is (1 - organic_pct)
-        # Total clicks = paid_clicks / (1 - organic_pct)
-        total_traffic = paid_clicks / (1 - organic_pct) if organic_pct < 1 else paid_clicks
-        organic_traffic = total_traffic * organic_pct
-
-        # Organic has higher conversion (warmer traffic)
-        organic_cr = effective_cr * 1.3  # 30% higher than paid
-        organic_orders = organic_traffic * (organic_cr / 100)
-        organic_revenue = organic_orders * aov
-
-        # Total metrics
-        total_orders = paid_orders + organic_orders
-        total_revenue = paid_revenue + organic_revenue
-
-        # ROAS calculation
-        roas = total_revenue / monthly_ad_spend if monthly_ad_spend > 0 else 0
-
-        return {
-            'month': month,
-            'ad_spend': round(monthly_ad_spend, 2),
-            'effective_cpc': round(effective_cpc, 2),
-            'effective_cr': round(effective_cr, 2),
-            'paid_traffic': round(paid_clicks),
-            'paid_orders': round(paid_orders, 1),
-            'paid_revenue': round(paid_revenue, 2),
-            'organic_pct': round(organic_pct * 100, 1),
-            'organic_traffic': round(organic_traffic),
-            'organic_orders': round(organic_orders, 1),
-            'organic_revenue': round(organic_revenue, 2),
-            'total_traffic': round(total_traffic),
-            'total_orders': round(total_orders, 1),
-            'total_revenue': round(total_revenue, 2),
-            'roas': round(roas, 2),
-            'cac': round(monthly_ad_spend / total_orders, 2) if total_orders > 0 else 0
-        }
+        return monthly_records(self.calculate_monthly_projections(
+            [month], monthly_ad_spend, aov, base_cpc, base_conversion_rate, industry
+        ))[0]
+
+    def calculate_monthly_projections(
+        self,
+        months: List[int],
+        monthly_ad_spend: float,
+        aov: float,
+        base_cpc: float,
+        base_conversion_rate: float,
+        industry: str = 'luxury_ecommerce'
+    ) -> np.ndarray:
+        """
+        Calculate projections for several months at once.
+
+        Same model as calculate_monthly_projection, evaluated as NumPy arrays
+        over all months so sensitivity sweeps don't pay per-month overhead.
+
+        Values are kept at full precision; rounding happens only when the
+        projections are printed or saved (see _round_monthly).
+
+        Returns:
+            MONTHLY_DTYPE structured array, one row per entry of `months`
+            (monthly_records() converts it to dicts)
+        """
+        return project_months(
+            months, monthly_ad_spend, aov, base_cpc, base_conversion_rate, industry
+        )
+
+    def _resolve_rates(self, cpc: Optional[float], conversion_rate: Optional[float]) -> Tuple[float, float]:
+        """Fill in a missing CPC / conversion rate from benchmarks or defaults."""
+        if cpc is None:
+            cpc = self.benchmarks.get('industry_averages', {}).get('avg_cpc')
+            if cpc is None:
+                cpc = DEFAULT_BENCHMARKS['luxury_ecommerce']['avg_cpc']
+
+        if conversion_rate is None:
+            conversion_rate = DEFAULT_BENCHMARKS['luxury_ecommerce']['conversion_rate_month_1_3']
+
+        return cpc, conversion_rate
 
     def generate_projections(
         self,
@@ -164,7 +415,8 @@ class GrowthProjector:
         aov: float,
         cpc: Optional[float] = None,
         conversion_rate: Optional[float] = None,
-        months: int = 6
+        months: int = 6,
+        now: Optional[datetime] = None
     ) -> Dict:
         """
         Generate full projection model for specified number of months.
@@ -175,18 +427,16 @@ class GrowthProjector:
             cpc: Cost Per Click (uses benchmark if not provided)
             conversion_rate: Starting conversion rate (uses benchmark if not provided)
             months: Number of months to project (default 6)
+            now: Generation time (defaults to datetime.now())
 
         Returns:
-            Dict with monthly projections and summary
+            Dict with monthly projections (MONTHLY_DTYPE array) and summary
         """
-        # Use benchmark data or defaults
-        if cpc is None:
-            cpc = self.benchmarks.get('industry_averages', {}).get('avg_cpc')
-            if cpc is None:
-                cpc = self.DEFAULT_BENCHMARKS['luxury_ecommerce']['avg_cpc']
+        if now is None:
+            now = datetime.now()
 
-        if conversion_rate is None:
-            conversion_rate = self.DEFAULT_BENCHMARKS['luxury_ecommerce']['conversion_rate_month_1_3']
+        # Use benchmark data or defaults
+        cpc, conversion_rate = self._resolve_rates(cpc, conversion_rate)
 
         print(f"\n{'='*60}")
         print(f"GROWTH PROJECTIONS FOR {self.target_name.upper()}")
@@ -206,103 +456,115 @@ class GrowthProjector:
                 'base_conversion_rate': conversion_rate,
                 'months': months
             },
-            'monthly': [],
+            'monthly': None,
             'summary': {},
-            'generated_at': datetime.now().isoformat()
+            'generated_at': now.isoformat()
         }
 
         # Generate monthly projections
-        for month in range(1, months + 1):
-            monthly = self.calculate_monthly_projection(
-                month=month,
-                monthly_ad_spend=monthly_ad_spend,
-                aov=aov,
-                base_cpc=cpc,
-                base_conversion_rate=conversion_rate
-            )
-            projections['monthly'].append(monthly)
+        monthly = self.calculate_monthly_projections(
+            months=list(range(1, months + 1)),
+            monthly_ad_spend=monthly_ad_spend,
+            aov=aov,
+            base_cpc=cpc,
+            base_conversion_rate=conversion_rate
+        )
+        projections['monthly'] = monthly
 
         # Calculate summary
-        total_spend = sum(m['ad_spend'] for m in projections['monthly'])
-        total_revenue = sum(m['total_revenue'] for m in projections['monthly'])
-        total_orders = sum(m['total_orders'] for m in projections['monthly'])
-
-        # 3-month summary
-        m3_spend = sum(m['ad_spend'] for m in projections['monthly'][:3])
-        m3_revenue = sum(m['total_revenue'] for m in projections['monthly'][:3])
-        m3_orders = sum(m['total_orders'] for m in projections['monthly'][:3])
-        m3_organic_pct = projections['monthly'][2]['organic_pct'] if len(projections['monthly']) >= 3 else 0
-
-        # 6-month summary
-        m6_organic_pct = projections['monthly'][5]['organic_pct'] if len(projections['monthly']) >= 6 else projections['monthly'][-1]['organic_pct']
-
-        projections['summary'] = {
-            '3_month': {
-                'total_spend': round(m3_spend, 2),
-                'total_revenue': round(m3_revenue, 2),
-                'total_orders': round(m3_orders, 1),
-                'roas': round(m3_revenue / m3_spend, 2) if m3_spend > 0 else 0,
-                'organic_traffic_pct': m3_organic_pct,
-                'paid_traffic_pct': round(100 - m3_organic_pct, 1)
-            },
-            '6_month': {
-                'total_spend': round(total_spend, 2),
-                'total_revenue': round(total_revenue, 2),
-                'total_orders': round(total_orders, 1),
-                'roas': round(total_revenue / total_spend, 2) if total_spend > 0 else 0,
-                'organic_traffic_pct': m6_organic_pct,
-                'paid_traffic_pct': round(100 - m6_organic_pct, 1)
-            },
-            'avg_cac': round(total_spend / total_orders, 2) if total_orders > 0 else 0
-        }
+        projections['summary'] = summarize_projection(monthly)
 
         return projections
 
-    def print_projection_table(self, projections: Dict):
-        """Print formatted projection table."""
-        print(f"\n{'='*100}")
-        print("MONTHLY PROJECTIONS")
-        print(f"{'='*100}")
-        print(f"{'Month':>6} {'Ad Spend':>12} {'CPC':>8} {'Paid Traffic':>14} {'Organic %':>10} {'Orders':>10} {'Revenue':>14} {'ROAS':>8} {'CAC':>10}")
-        print("-" * 100)
+    def generate_projection_grid(
+        self,
+        spend_list: List[float],
+        aov_list: List[float],
+        cpc_list: List[Optional[float]] = (None,),
+        cr_list: List[Optional[float]] = (None,),
+        months: int = 6,
+        max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[Tuple, Dict]]:
+        """
+        Project every spend x AOV x CPC x CR combination across worker processes.
 
-        for m in projections['monthly']:
-            print(f"{m['month']:>6} ${m['ad_spend']:>10,.0f} ${m['effective_cpc']:>6.2f} {m['paid_traffic']:>13,} {m['organic_pct']:>9.1f}% {m['total_orders']:>9.0f} ${m['total_revenue']:>12,.0f} {m['roas']:>7.2f}x ${m['cac']:>8.0f}")
+        Args:
+            spend_list: Monthly ad spend values
+            aov_list: Average Order Values
+            cpc_list: CPC values (None uses the benchmark)
+            cr_list: Starting conversion rates (None uses the benchmark)
+            months: Number of months to project
+            max_workers: Worker processes (default os.cpu_count())
+
+        Yields:
+            ((spend, aov, cpc, cr, months), projection) in grid order, where
+            projection has the same inputs/monthly/summary keys as
+            generate_projections (without printing or generated_at)
+        """
+        grid = [
+            (spend, aov, *self._resolve_rates(cpc, cr), months)
+            for spend, aov, cpc, cr in itertools.product(spend_list, aov_list, cpc_list, cr_list)
+        ]
+        # Each scenario is a few microseconds of NumPy, so hand them out in chunks
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(grid) // (workers * 4))
 
-        print("-" * 100)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from zip(grid, executor.map(_project_scenario, grid, chunksize=chunksize))
 
-        # Print summaries
+    def print_projection_table(self, projections: Dict):
+        """Print formatted projection table."""
         s3 = projections['summary']['3_month']
         s6 = projections['summary']['6_month']
 
-        print(f"\n3-MONTH SUMMARY:")
-        print(f"  Total Spend: ${s3['total_spend']:,.2f}")
-        print(f"  Total Revenue: ${s3['total_revenue']:,.2f}")
-        print(f"  Total Orders: {s3['total_orders']:,.0f}")
-        print(f"  ROAS: {s3['roas']}x")
-        print(f"  Traffic Split: {s3['paid_traffic_pct']}% Paid / {s3['organic_traffic_pct']}% Organic")
-
-        print(f"\n6-MONTH SUMMARY:")
-        print(f"  Total Spend: ${s6['total_spend']:,.2f}")
-        print(f"  Total Revenue: ${s6['total_revenue']:,.2f}")
-        print(f"  Total Orders: {s6['total_orders']:,.0f}")
-        print(f"  ROAS: {s6['roas']}x")
-        print(f"  Traffic Split: {s6['paid_traffic_pct']}% Paid / {s6['organic_traffic_pct']}% Organic")
-        print(f"  Average CAC: ${projections['summary']['avg_cac']:,.2f}")
+        lines = [
+            f"\n{'='*100}",
+            "MONTHLY PROJECTIONS",
+            f"{'='*100}",
+            _HEADER_ROW,
+            "-" * 100,
+        ]
+        row = _ROW_FMT.format_map
+        lines.extend(row(m) for m in monthly_records(projections['monthly']))
+        lines.append("-" * 100)
+
+        # Summaries
+        lines += [
+            f"\n3-MONTH SUMMARY:",
+            f"  Total Spend: ${s3['total_spend']:,.2f}",
+            f"  Total Revenue: ${s3['total_revenue']:,.2f}",
+            f"  Total Orders: {s3['total_orders']:,.0f}",
+            f"  ROAS: {s3['roas']}x",
+            f"  Traffic Split: {s3['paid_traffic_pct']}% Paid / {s3['organic_traffic_pct']}% Organic",
+            f"\n6-MONTH SUMMARY:",
+            f"  Total Spend: ${s6['total_spend']:,.2f}",
+            f"  Total Revenue: ${s6['total_revenue']:,.2f}",
+            f"  Total Orders: {s6['total_orders']:,.0f}",
+            f"  ROAS: {s6['roas']}x",
+            f"  Traffic Split: {s6['paid_traffic_pct']}% Paid / {s6['organic_traffic_pct']}% Organic",
+            f"  Average CAC: ${projections['summary']['avg_cac']:,.2f}",
+        ]
+
+        # One write instead of a print() per line
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def save_projections(self, projections: Dict, filename_prefix: str = 'growth_projection'):
         """Save projections to JSON and CSV files."""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # File names and the report header use the generation time, so all
+        # outputs of one projection carry the same timestamp
+        now = datetime.fromisoformat(projections['generated_at'])
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
 
         # Save JSON
+        monthly = [_round_monthly(m) for m in monthly_records(projections['monthly'])]
+
         json_path = os.path.join(self.projections_dir, f"{filename_prefix}_{timestamp}.json")
-        with open(json_path, 'w') as f:
-            json.dump(projections, f, indent=2)
+        save_json(json_path, {**projections, 'monthly': monthly})
         print(f"\n[Saved] {json_path}")
 
         # Save CSV
         csv_path = os.path.join(self.projections_dir, f"{filename_prefix}_{timestamp}.csv")
-        with open(csv_path, 'w', newline='') as f:
+        with open(csv_path, 'w', newline='', buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow([
                 'Month', 'Ad Spend', 'Effective CPC', 'Conversion Rate',
@@ -310,68 +572,25 @@ class GrowthProjector:
                 'Organic %', 'Organic Traffic', 'Organic Orders', 'Organic Revenue',
                 'Total Traffic', 'Total Orders', 'Total Revenue', 'ROAS', 'CAC'
             ])
-            for m in projections['monthly']:
-                writer.writerow([
-                    m['month'], m['ad_spend'], m['effective_cpc'], m['effective_cr'],
-                    m['paid_traffic'], m['paid_orders'], m['paid_revenue'],
-                    m['organic_pct'], m['organic_traffic'], m['organic_orders'], m['organic_revenue'],
-                    m['total_traffic'], m['total_orders'], m['total_revenue'], m['roas'], m['cac']
-                ])
+            writer.writerows([
+                m['month'], m['ad_spend'], m['effective_cpc'], m['effective_cr'],
+                m['paid_traffic'], m['paid_orders'], m['paid_revenue'],
+                m['organic_pct'], m['organic_traffic'], m['organic_orders'], m['organic_revenue'],
+                m['total_traffic'], m['total_orders'], m['total_revenue'], m['roas'], m['cac']
+            ] for m in monthly)
         print(f"[Saved] {csv_path}")
 
         # Save summary report
         report_path = os.path.join(self.projections_dir, f"{filename_prefix}_report_{timestamp}.txt")
-        with open(report_path, 'w') as f:
-            f.write("=" * 70 + "\n")
-            f.write(f"GROWTH PROJECTION REPORT: {self.target_name}\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 70 + "\n\n")
-
-            f.write("PROJECTION INPUTS:\n")
-            f.write("-" * 40 + "\n")
-            inputs = projections['inputs']
-            f.write(f"Monthly Ad Spend: ${inputs['monthly_ad_spend']:,.2f}\n")
-            f.write(f"Average Order Value (AOV): ${inputs['aov']:,.2f}\n")
-            f.write(f"Base Cost Per Click (CPC): ${inputs['base_cpc']:.2f}\n")
-            f.write(f"Base Conversion Rate: {inputs['base_conversion_rate']}%\n")
-            f.write(f"Projection Period: {inputs['months']} months\n")
-
-            f.write("\n\n3-MONTH PROJECTION:\n")
-            f.write("-" * 40 + "\n")
-            s3 = projections['summary']['3_month']
-            f.write(f"Total Marketing Spend: ${s3['total_spend']:,.2f}\n")
-            f.write(f"Projected Revenue: ${s3['total_revenue']:,.2f}\n")
-            f.write(f"Projected Orders: {s3['total_orders']:,.0f}\n")
-            f.write(f"Return on Ad Spend (ROAS): {s3['roas']}x\n")
-            f.write(f"Traffic Split: {s3['paid_traffic_pct']}% Paid / {s3['organic_traffic_pct']}% Organic\n")
-
-            f.write("\n\n6-MONTH PROJECTION:\n")
-            f.write("-" * 40 + "\n")
-            s6 = projections['summary']['6_month']
-            f.write(f"Total Marketing Spend: ${s6['total_spend']:,.2f}\n")
-            f.write(f"Projected Revenue: ${s6['total_revenue']:,.2f}\n")
-            f.write(f"Projected Orders: {s6['total_orders']:,.0f}\n")
-            f.write(f"Return on Ad Spend (ROAS): {s6['roas']}x\n")
-            f.write(f"Traffic Split: {s6['paid_traffic_pct']}% Paid / {s6['organic_traffic_pct']}% Organic\n")
-            f.write(f"Average Customer Acquisition Cost: ${projections['summary']['avg_cac']:,.2f}\n")
-
-            f.write("\n\nKEY ASSUMPTIONS:\n")
-            f.write("-" * 40 + "\n")
-            f.write("1. CPC optimizes 5-10% per month as algorithms learn\n")
-            f.write("2. Conversion rate improves 50% by month 6 (reviews, retargeting)\n")
-            f.write("3. Organic traffic grows from ~5% to ~18% over 6 months\n")
-            f.write("4. Organic traffic converts 30% higher than paid (warmer)\n")
-            f.write("5. New domain SEO takes 2-3 months to show results\n")
-
-            f.write("\n\nVALIDATION NOTES:\n")
-            f.write("-" * 40 + "\n")
-            f.write("- These projections are based on industry benchmarks\n")
-            f.write("- Actual results will vary based on creative quality,\n")
-            f.write("  targeting precision, and market conditions\n")
-            f.write("- Review and adjust monthly based on actual performance\n")
-            f.write("- The 90% paid / 10% organic split in month 1 is typical\n")
-            f.write("- The ~80% paid / 20% organic split by month 6 requires\n")
-            f.write("  consistent SEO and content investment\n")
+        with open(report_path, 'w', buffering=1 << 16) as f:
+            f.write(_REPORT_TEMPLATE.format(
+                target_name=self.target_name,
+                generated=now.strftime('%Y-%m-%d %H:%M:%S'),
+                inputs=projections['inputs'],
+                s3=projections['summary']['3_month'],
+                s6=projections['summary']['6_month'],
+                summary=projections['summary'],
+            ))
 
         print(f"[Saved] {report_path}")
 
@@ -385,17 +604,14 @@ class GrowthProjector:
 
         # Get inputs
         try:
-            monthly_spend = float(input("\nMonthly Ad Spend ($): ").replace(',', '').replace('$', ''))
-            aov = float(input("Average Order Value ($): ").replace(',', '').replace('$', ''))
-
-            cpc_input = input("Cost Per Click ($ or Enter for benchmark): ").strip()
-            cpc = float(cpc_input.replace('$', '')) if cpc_input else None
-
-            cr_input = input("Conversion Rate (% or Enter for benchmark): ").strip()
-            cr = float(cr_input.replace('%', '')) if cr_input else None
-
-            months_input = input("Projection months (default 6): ").strip()
-            months = int(months_input) if months_input else 6
+            monthly_spend = _parse_num(input("\nMonthly Ad Spend ($): "))
+            aov = _parse_num(input("Average Order Value ($): "))
+            if monthly_spend is None or aov is None:
+                raise ValueError("ad spend and AOV are required")
+
+            cpc = _parse_num(input("Cost Per Click ($ or Enter for benchmark): "))
+            cr = _parse_num(input("Conversion Rate (% or Enter for benchmark): "))
+            months = _parse_num(input("Projection months (default 6): "), default=6, cast=int)
 
         except ValueError as e:
             print(f"[Error] Invalid input: {e}")
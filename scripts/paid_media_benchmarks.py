@@ -8,9 +8,13 @@ for new business projection modeling.
 import os
 import sys
 import time
-import json
 import csv
+import re
+from bisect import insort
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
 from datetime import datetime
+from urllib.parse import quote
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,24 +26,148 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+# Optional: direct JSON lookups for keyword metrics (semrush.keyword_api_url)
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
 try:
     from scripts.config_loader import (
-        load_config, get_target_domain, get_competitor_domains,
+        load_config, load_json, save_json, get_target_domain, get_competitor_domains,
         get_all_domains, get_output_dir, get_data_dir, ensure_directories,
         get_target_name, get_competitor_names
     )
+    from scripts.webdriver_pool import widen_connection_pool
 except ImportError:
     from config_loader import (
-        load_config, get_target_domain, get_competitor_domains,
+        load_config, load_json, save_json, get_target_domain, get_competitor_domains,
         get_all_domains, get_output_dir, get_data_dir, ensure_directories,
         get_target_name, get_competitor_names
     )
+    from webdriver_pool import widen_connection_pool
+
+# Max seconds to wait for SEMrush report content after navigating
+PAGE_LOAD_TIMEOUT = 10
+
+# Default days to reuse scraped competitor/keyword data (cache.scrape_max_age_days);
+# CPCs move slowly
+DEFAULT_SCRAPE_MAX_AGE_DAYS = 7
+
+# Requests Chrome skips on SEMrush pages. Stylesheets still load: visibility
+# checks and element text depend on them.
+BLOCKED_URL_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff*", "*.ttf",
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*", "*hotjar*",
+)
+
+# Session cookies copied from the primary browser into worker browsers, and the
+# Network.getAllCookies fields that Network.setCookies accepts back
+SESSION_COOKIE_DOMAIN = "semrush.com"
+SESSION_COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'expires', 'httpOnly', 'secure', 'sameSite')
+
+# Buffer size for the CSV/summary exports, so each file is a single write
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Pause between competitors on the same browser
+COMPETITOR_DELAY = 2
+
+# Keyword requests start at least KEYWORD_MIN_INTERVAL seconds apart (time
+# spent loading the page counts). A rate-limit response doubles the interval up
+# to KEYWORD_MAX_INTERVAL and retries; each clean response halves it again.
+KEYWORD_MIN_INTERVAL = 0.5
+KEYWORD_MAX_INTERVAL = 60
+KEYWORD_MAX_ATTEMPTS = 3
+
+# _fetch_keyword_api result for a 429: the attempt failed, don't fall back to
+# the browser until the next throttled attempt
+RATE_LIMITED = object()
+
+# SEMrush rate-limit page text, checked in one call after each keyword page
+RATE_LIMIT_MARKERS = ["too many requests", "you've reached the limit"]
+RATE_LIMIT_JS = """
+const text = document.body ? document.body.innerText.toLowerCase() : "";
+return arguments[0].some((marker) => text.includes(marker));
+"""
+
+# Report selectors, tried in order; also used to detect that a page has rendered
+ADVERTISING_METRIC_SELECTORS = [
+    "[data-test='paid-keywords'] .srf-report-card__data",
+    ".srf-report-card__data",
+    "[class*='overview'] [class*='value']"
+]
+ADVERTISING_TABLE_SELECTORS = [
+    "table tbody tr",
+    "[data-test='positions-table'] tr",
+    ".srf-table tbody tr"
+]
+KEYWORD_METRIC_SELECTORS = [
+    "[data-test='keyword-overview'] .srf-report-card__data",
+    ".srf-report-card__data",
+    "[class*='metric'] [class*='value']"
+]
+PLA_METRIC_SELECTOR = ".srf-report-card__data"
+POPUP_SELECTORS = (
+    "button[data-test='close-modal']",
+    ".srf-modal__close",
+    "[aria-label='Close']",
+    ".srf-popup__close",
+    "button.close-button"
+)
+
+# For each selector in arguments[0], the trimmed <td> texts of its first
+# arguments[1] matching rows - one round-trip instead of one per cell
+TABLE_ROWS_JS = """
+const [selectors, limit] = arguments;
+return selectors.map((sel) =>
+    Array.from(document.querySelectorAll(sel)).slice(0, limit).map((row) =>
+        Array.from(row.querySelectorAll("td")).map((td) => td.innerText.trim())
+    )
+);
+"""
+
+# Decoration stripped from scraped numbers in one C-level pass ("$1,250" -> "1250")
+_STRIP = str.maketrans('', '', '$,')
+
+# Numeric part of a scraped CPC ("$1.25") or volume ("1.2K")
+_CPC_RE = re.compile(r'\d+(?:\.\d+)?')
+_VOLUME_NUM_RE = re.compile(r'\d+(?:\.\d+)?')
+_VOLUME_MULTIPLIERS = {'K': 1_000, 'M': 1_000_000}
+
+
+def _parse_cpc(value):
+    """Float CPC from a scraped or API value, None if it has no number"""
+    match = _CPC_RE.search(str(value).translate(_STRIP))
+    return float(match.group()) if match else None
+
+
+def _parse_volume(value):
+    """Float search volume, expanding K/M suffixes; None if not a volume"""
+    text = str(value).translate(_STRIP).strip().upper()
+    multiplier = _VOLUME_MULTIPLIERS.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    if not _VOLUME_NUM_RE.fullmatch(text):
+        return None
+    return float(text) * multiplier
+
+
+def _cookie_param(cookie):
+    """Network.setCookies parameters for a Network.getAllCookies entry"""
+    param = {key: cookie[key] for key in SESSION_COOKIE_FIELDS if key in cookie}
+    if cookie.get('session'):
+        # Session cookies report expires=-1; leaving it out keeps them session-only
+        param.pop('expires', None)
+    return param
 
 
 class PaidMediaBenchmarks:
     """Extracts paid media benchmarks from SEMrush for projection modeling."""
 
     def __init__(self, config_path='config/config.yaml'):
+        self.config_path = config_path
         self.config = load_config(config_path)
         ensure_directories(self.config)
 
@@ -51,7 +179,24 @@ class PaidMediaBenchmarks:
         os.makedirs(self.screenshots_dir, exist_ok=True)
         os.makedirs(self.exports_dir, exist_ok=True)
 
+        # Screenshots of every report page are debug output; by default only
+        # pages where extraction came back empty are captured
+        self.debug_screenshots = self.config.get('debug', {}).get('screenshots', False)
+
+        # Scraped results reused across runs; 0 days disables the cache
+        max_age_days = self.config.get('cache', {}).get('scrape_max_age_days', DEFAULT_SCRAPE_MAX_AGE_DAYS)
+        self.scrape_cache_ttl = max_age_days * 24 * 3600
+        self.scrape_cache_path = os.path.join(self.exports_dir, 'scrape_cache.json')
+        self.scrape_cache = self._load_scrape_cache()
+
         self.driver = None
+        self.wait = None
+        self.api_session = None
+        self.api_disabled = False
+
+        # Adaptive spacing of keyword requests, see KEYWORD_MIN_INTERVAL
+        self.keyword_interval = KEYWORD_MIN_INTERVAL
+        self.last_keyword_request = 0.0
         self.database = self.config.get('semrush', {}).get('database', 'us')
         self.benchmarks = {
             'competitors': {},
@@ -60,31 +205,91 @@ class PaidMediaBenchmarks:
             'extracted_at': datetime.now().isoformat()
         }
 
-    def connect_to_chrome(self):
+        # Running CPC/volume statistics, updated as each competitor and keyword
+        # comes in so averages never need a full re-parse (see _record_cpcs)
+        self.cpc_values = []  # kept sorted
+        self.cpc_sum = 0.0
+        self.volume_sum = 0.0
+        self.volume_count = 0
+
+    def connect_to_chrome(self, debug_port=None):
         """Connect to existing Chrome session with SEMrush logged in."""
         chrome_options = Options()
-        debug_port = self.config.get('semrush', {}).get('chrome_debug_port', 9222)
+        if debug_port is None:
+            debug_port = self.config.get('semrush', {}).get('chrome_debug_port', 9222)
         chrome_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
+        # driver.get returns at DOMContentLoaded; wait_for_any covers the report
+        # content. Image prefs can't apply to a running browser, see
+        # block_heavy_resources instead.
+        chrome_options.page_load_strategy = 'eager'
 
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            self.driver = widen_connection_pool(webdriver.Chrome(options=chrome_options))
+            self.wait = WebDriverWait(self.driver, PAGE_LOAD_TIMEOUT)
+            self.block_heavy_resources()
             print(f"[OK] Connected to Chrome on port {debug_port}")
             return True
         except Exception as e:
             print(f"[ERROR] Could not connect to Chrome: {e}")
-            print("Make sure Chrome is running with: --remote-debugging-port=9222")
+            print(f"Make sure Chrome is running with: --remote-debugging-port={debug_port}")
+            return False
+
+    def block_heavy_resources(self, blocked=True):
+        """
+        Stop (or with blocked=False, resume) the tab loading images, fonts and
+        trackers (report text is unaffected).
+        """
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            urls = list(BLOCKED_URL_PATTERNS) if blocked else []
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+        except Exception as e:
+            print(f"  [Warning] Could not change blocked page resources: {e}")
+
+    def get_session_cookies(self):
+        """
+        SEMrush cookies of the connected browser, read over the DevTools
+        protocol so they are available whatever page the tab is on.
+        """
+        try:
+            cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {})['cookies']
+        except Exception as e:
+            print(f"  [Warning] Could not read session cookies: {e}")
+            return []
+        return [
+            _cookie_param(cookie) for cookie in cookies
+            if cookie.get('domain', '').endswith(SESSION_COOKIE_DOMAIN)
+        ]
+
+    def set_session_cookies(self, cookies):
+        """Install cookies from get_session_cookies() without navigating first."""
+        if not cookies:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Network.setCookies", {'cookies': list(cookies)})
+            print(f"  [OK] Reused {len(cookies)} SEMrush session cookies")
+        except Exception as e:
+            print(f"  [Warning] Could not set session cookies: {e}")
+
+    def wait_for_any(self, selectors):
+        """
+        Wait until any of the CSS selectors is present, instead of sleeping a
+        fixed time after navigation. Returns False if the page never rendered
+        them; callers still try their extraction as before.
+        """
+        try:
+            self.wait.until(EC.any_of(*(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                for selector in selectors
+            )))
+            return True
+        except TimeoutException:
+            print(f"  [Warning] Page content not found after {PAGE_LOAD_TIMEOUT}s")
             return False
 
     def close_popups(self):
         """Close any SEMrush popups or modals."""
-        popup_selectors = [
-            "button[data-test='close-modal']",
-            ".srf-modal__close",
-            "[aria-label='Close']",
-            ".srf-popup__close",
-            "button.close-button"
-        ]
-        for selector in popup_selectors:
+        for selector in POPUP_SELECTORS:
             try:
                 elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 for el in elements:
@@ -118,21 +323,13 @@ class PaidMediaBenchmarks:
         # Navigate to Advertising Research
         url = f"https://www.semrush.com/analytics/adwords/positions/?db={self.database}&q={domain}"
         self.driver.get(url)
-        time.sleep(4)
+        self.wait_for_any(ADVERTISING_METRIC_SELECTORS + ADVERTISING_TABLE_SELECTORS)
         self.close_popups()
 
-        # Take screenshot
-        self.take_screenshot(f"advertising_research_{domain.replace('.', '_')}")
-
         # Try to extract key metrics
         try:
             # Paid keywords count
-            metrics_selectors = [
-                "[data-test='paid-keywords'] .srf-report-card__data",
-                ".srf-report-card__data",
-                "[class*='overview'] [class*='value']"
-            ]
-            for selector in metrics_selectors:
+            for selector in ADVERTISING_METRIC_SELECTORS:
                 try:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     if elements:
@@ -147,41 +344,258 @@ class PaidMediaBenchmarks:
         except Exception as e:
             print(f"  [Warning] Could not extract overview metrics: {e}")
 
-        # Navigate to paid keyword positions for detailed CPC data
-        time.sleep(2)
-        self.take_screenshot(f"paid_keywords_{domain.replace('.', '_')}")
+        if self.debug_screenshots or competitor_data['paid_keywords'] is None:
+            self.take_screenshot(f"advertising_research_{domain.replace('.', '_')}")
+
+        # Paid keyword positions table for detailed CPC data
+        self.wait_for_any(ADVERTISING_TABLE_SELECTORS)
 
         # Try to extract top paid keywords with CPCs
         try:
-            # Look for the keyword table
-            table_selectors = [
-                "table tbody tr",
-                "[data-test='positions-table'] tr",
-                ".srf-table tbody tr"
-            ]
-            for selector in table_selectors:
+            # Cell texts of the first 10 rows for each table selector, in one call
+            tables = self.driver.execute_script(TABLE_ROWS_JS, ADVERTISING_TABLE_SELECTORS, 10)
+            for rows in tables:
+                for cells in rows:
+                    if len(cells) >= 5:
+                        keyword_data = {
+                            'keyword': cells[0],
+                            'position': cells[1],
+                            'volume': cells[2],
+                            'cpc': cells[3],
+                            'traffic_pct': cells[4]
+                        }
+                        if keyword_data['keyword']:
+                            competitor_data['top_paid_keywords'].append(keyword_data)
+                if competitor_data['top_paid_keywords']:
+                    break
+        except Exception as e:
+            print(f"  [Warning] Could not extract keyword table: {e}")
+
+        if self.debug_screenshots or not competitor_data['top_paid_keywords']:
+            self.take_screenshot(f"paid_keywords_{domain.replace('.', '_')}")
+
+        return competitor_data
+
+    def extract_competitor(self, domain):
+        """Advertising research plus PLA data for one competitor."""
+        data = self.extract_advertising_research(domain)
+        # Also get PLA data for e-commerce
+        data['pla'] = self.extract_pla_data(domain)
+        return data
+
+    def extract_competitors(self, competitors):
+        """
+        Extract every competitor, reusing cached results from the last
+        cache.scrape_max_age_days and fanning the rest out over worker processes when
+        semrush.worker_debug_ports lists more than one Chrome instance.
+        """
+        # A competitor listed twice is scraped (and counted in the CPC stats) once
+        competitors = list(dict.fromkeys(competitors))
+        results = {}
+        todo = []
+        for domain in competitors:
+            cached = self._cache_get('competitor', domain)
+            if cached is not None:
+                results[domain] = cached
+                self._record_competitor(domain, cached)
+            else:
+                todo.append(domain)
+        if results:
+            print(f"  Using cached data for {len(results)} competitors")
+
+        for domain, data in self._iter_uncached_competitors(todo):
+            results[domain] = data
+            if data.get('paid_keywords') or data.get('top_paid_keywords'):
+                self._cache_put('competitor', domain, data)
+            self._record_competitor(domain, data)
+            self.save_checkpoint()
+
+        # Keep config order regardless of cache hits or which worker finished first
+        return {domain: results[domain] for domain in competitors if domain in results}
+
+    def _iter_uncached_competitors(self, competitors):
+        """
+        Scrape competitors sequentially, or across the worker browsers,
+        yielding (domain, data) as results come in.
+        """
+        ports = self.config.get('semrush', {}).get('worker_debug_ports') or []
+        if len(ports) < 2 or len(competitors) < 2:
+            for domain in competitors:
+                yield domain, self.extract_competitor(domain)
+                time.sleep(COMPETITOR_DELAY)
+            return
+
+        # Round-robin competitors over the browsers, one process per browser
+        groups = [(port, list(competitors[i::len(ports)])) for i, port in enumerate(ports)]
+        groups = [(port, domains) for port, domains in groups if domains]
+        print(f"  Using {len(groups)} Chrome workers on ports {[port for port, _ in groups]}")
+
+        # Workers start from this browser's SEMrush login instead of their own
+        cookies = self.get_session_cookies()
+
+        # Competitors a worker could not scrape (no connection, or it crashed)
+        leftover = set()
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            futures = {
+                executor.submit(_competitor_worker, self.config_path, port, domains, cookies): (port, domains)
+                for port, domains in groups
+            }
+            for future in as_completed(futures):
+                port, domains = futures[future]
+                try:
+                    results, missing = future.result()
+                except Exception as e:
+                    print(f"  [Warning] Chrome worker on port {port} failed: {e}")
+                    results, missing = {}, domains
+                yield from results.items()
+                leftover.update(missing)
+
+        # Scraped here instead, on the primary browser
+        if leftover:
+            print(f"  Retrying {len(leftover)} competitors on the primary browser")
+        for domain in competitors:
+            if domain in leftover:
+                yield domain, self.extract_competitor(domain)
+                time.sleep(COMPETITOR_DELAY)
+
+    def _load_scrape_cache(self):
+        """Previously scraped competitor/keyword results, {key: {'ts', 'data'}}."""
+        try:
+            return dict(load_json(self.scrape_cache_path))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _cache_get(self, kind, name):
+        """Cached result for (kind, name, database) if younger than the cache TTL."""
+        entry = self.scrape_cache.get(f"{kind}|{self.database}|{name}")
+        if entry and time.time() - entry['ts'] < self.scrape_cache_ttl:
+            return entry['data']
+        return None
+
+    def _cache_put(self, kind, name, data):
+        self.scrape_cache[f"{kind}|{self.database}|{name}"] = {'ts': time.time(), 'data': data}
+
+    def save_scrape_cache(self):
+        """Write the scrape cache, dropping expired entries."""
+        now = time.time()
+        fresh = {k: v for k, v in self.scrape_cache.items() if now - v['ts'] < self.scrape_cache_ttl}
+        save_json(self.scrape_cache_path, fresh)
+
+    def _build_api_session(self):
+        """
+        requests session carrying the logged-in browser's cookies and user
+        agent, with a connection pool reused across keyword lookups.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = self.driver.execute_script("return navigator.userAgent")
+        for cookie in self.driver.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'],
+                                domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        return session
+
+    def _fetch_keyword_api(self, keyword):
+        """
+        Look a keyword up through semrush.keyword_api_url, if configured.
+        Returns None (caller falls back to the browser) when the endpoint is
+        unset, refuses the session, or doesn't return volume/cpc/competition,
+        and RATE_LIMITED on a 429.
+        """
+        url_template = self.config.get('semrush', {}).get('keyword_api_url')
+        if not url_template or requests is None or self.api_disabled:
+            return None
+
+        if self.api_session is None:
+            self.api_session = self._build_api_session()
+
+        url = url_template.format(keyword=quote(keyword), database=self.database)
+        try:
+            response = self.api_session.get(url, timeout=15)
+        except requests.RequestException as e:
+            print(f"    [Warning] Keyword API request failed: {e}")
+            return None
+
+        if response.status_code == 429:
+            self._update_keyword_interval(rate_limited=True)
+            return RATE_LIMITED
+
+        if response.status_code in (401, 403):
+            print("    [Warning] Keyword API rejected the session, using the browser")
+            self.api_disabled = True
+            return None
+
+        try:
+            data = response.json() if response.ok else None
+        except ValueError:
+            data = None
+        if not isinstance(data, dict) or not any(data.get(k) for k in ('volume', 'cpc', 'competition')):
+            return None
+
+        return {
+            'keyword': keyword,
+            'volume': data.get('volume'),
+            'cpc': data.get('cpc'),
+            'competition': data.get('competition'),
+            'trend': data.get('trend')
+        }
+
+    def _throttle_keyword_request(self):
+        """Sleep only for whatever is left of the current keyword interval."""
+        wait = self.keyword_interval - (time.monotonic() - self.last_keyword_request)
+        if wait > 0:
+            time.sleep(wait)
+        self.last_keyword_request = time.monotonic()
+
+    def _update_keyword_interval(self, rate_limited):
+        """Back off exponentially on rate limiting, recover on clean responses."""
+        if rate_limited:
+            self.keyword_interval = min(self.keyword_interval * 2, KEYWORD_MAX_INTERVAL)
+            print(f"    [Warning] Rate limited, spacing keyword requests {self.keyword_interval:.1f}s apart")
+        else:
+            self.keyword_interval = max(self.keyword_interval / 2, KEYWORD_MIN_INTERVAL)
+
+    def _scrape_keyword_overview(self, keyword):
+        """
+        Read keyword metrics from the Keyword Overview page in the browser.
+        Returns None if SEMrush served its rate-limit page instead.
+        """
+        url = f"https://www.semrush.com/analytics/keywordoverview/?db={self.database}&q={keyword.replace(' ', '%20')}"
+        self.driver.get(url)
+        found = self.wait_for_any(KEYWORD_METRIC_SELECTORS)
+
+        rate_limited = not found and self.driver.execute_script(RATE_LIMIT_JS, RATE_LIMIT_MARKERS)
+        self._update_keyword_interval(rate_limited)
+        if rate_limited:
+            return None
+
+        self.close_popups()
+
+        kw_info = {
+            'keyword': keyword,
+            'volume': None,
+            'cpc': None,
+            'competition': None,
+            'trend': None
+        }
+
+        try:
+            # Try to extract keyword metrics
+            for selector in KEYWORD_METRIC_SELECTORS:
                 try:
-                    rows = self.driver.find_elements(By.CSS_SELECTOR, selector)[:10]  # Top 10
-                    for row in rows:
-                        cells = row.find_elements(By.TAG_NAME, "td")
-                        if len(cells) >= 5:
-                            keyword_data = {
-                                'keyword': cells[0].text if cells else '',
-                                'position': cells[1].text if len(cells) > 1 else '',
-                                'volume': cells[2].text if len(cells) > 2 else '',
-                                'cpc': cells[3].text if len(cells) > 3 else '',
-                                'traffic_pct': cells[4].text if len(cells) > 4 else ''
-                            }
-                            if keyword_data['keyword']:
-                                competitor_data['top_paid_keywords'].append(keyword_data)
-                    if competitor_data['top_paid_keywords']:
+                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    values = [el.text for el in elements if el.text]
+                    if values:
+                        kw_info['volume'] = values[0] if values else None
+                        kw_info['cpc'] = values[1] if len(values) > 1 else None
+                        kw_info['competition'] = values[2] if len(values) > 2 else None
                         break
                 except:
                     continue
         except Exception as e:
-            print(f"  [Warning] Could not extract keyword table: {e}")
+            print(f"    [Warning] Could not extract metrics: {e}")
 
-        return competitor_data
+        return kw_info
 
     def extract_keyword_cpc(self, keywords):
         """Extract CPC data for target keywords from SEMrush Keyword Overview."""
@@ -189,48 +603,43 @@ class PaidMediaBenchmarks:
 
         keyword_data = {}
 
-        for keyword in keywords[:20]:  # Limit to 20 keywords to avoid rate limiting
+        # Limit to 20 keywords to avoid rate limiting; a repeated keyword is
+        # looked up (and counted in the CPC/volume statistics) once
+        for keyword in dict.fromkeys(keywords[:20]):
             print(f"  Analyzing: {keyword}")
 
-            url = f"https://www.semrush.com/analytics/keywordoverview/?db={self.database}&q={keyword.replace(' ', '%20')}"
-            self.driver.get(url)
-            time.sleep(3)
-            self.close_popups()
-
-            kw_info = {
-                'keyword': keyword,
-                'volume': None,
-                'cpc': None,
-                'competition': None,
-                'trend': None
-            }
+            kw_info = self._cache_get('keyword', keyword)
+            if kw_info is not None:
+                keyword_data[keyword] = kw_info
+                self._record_keyword(keyword, kw_info)
+                continue
+
+            # JSON endpoint when configured, full page render otherwise;
+            # retried with a longer interval while SEMrush rate limits
+            kw_info = None
+            for _ in range(KEYWORD_MAX_ATTEMPTS):
+                self._throttle_keyword_request()
+                kw_info = self._fetch_keyword_api(keyword)
+                if kw_info is RATE_LIMITED:
+                    kw_info = None
+                    continue
+                kw_info = kw_info or self._scrape_keyword_overview(keyword)
+                if kw_info is not None:
+                    break
+            if kw_info is None:
+                print(f"    [Warning] Still rate limited, skipping {keyword}")
+                kw_info = {'keyword': keyword, 'volume': None, 'cpc': None, 'competition': None, 'trend': None}
 
-            try:
-                # Try to extract keyword metrics
-                metric_selectors = [
-                    "[data-test='keyword-overview'] .srf-report-card__data",
-                    ".srf-report-card__data",
-                    "[class*='metric'] [class*='value']"
-                ]
-                for selector in metric_selectors:
-                    try:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        values = [el.text for el in elements if el.text]
-                        if values:
-                            kw_info['volume'] = values[0] if values else None
-                            kw_info['cpc'] = values[1] if len(values) > 1 else None
-                            kw_info['competition'] = values[2] if len(values) > 2 else None
-                            break
-                    except:
-                        continue
-            except Exception as e:
-                print(f"    [Warning] Could not extract metrics: {e}")
+            if kw_info.get('volume') or kw_info.get('cpc'):
+                self._cache_put('keyword', keyword, kw_info)
 
             keyword_data[keyword] = kw_info
-            time.sleep(1)  # Rate limiting
+            self._record_keyword(keyword, kw_info)
+            self.save_checkpoint()
 
-        # Take one screenshot of keyword overview
-        self.take_screenshot("keyword_cpc_overview")
+        # One screenshot of the last keyword overview, debug only
+        if self.debug_screenshots and self.driver.current_url.startswith("https://www.semrush.com/analytics/keywordoverview/"):
+            self.take_screenshot("keyword_cpc_overview")
 
         return keyword_data
 
@@ -240,11 +649,9 @@ class PaidMediaBenchmarks:
 
         url = f"https://www.semrush.com/analytics/pla/positions/?db={self.database}&q={domain}"
         self.driver.get(url)
-        time.sleep(4)
+        self.wait_for_any([PLA_METRIC_SELECTOR])
         self.close_popups()
 
-        self.take_screenshot(f"pla_research_{domain.replace('.', '_')}")
-
         pla_data = {
             'domain': domain,
             'pla_keywords': None,
@@ -253,121 +660,150 @@ class PaidMediaBenchmarks:
 
         # Try to extract PLA metrics
         try:
-            elements = self.driver.find_elements(By.CSS_SELECTOR, ".srf-report-card__data")
+            elements = self.driver.find_elements(By.CSS_SELECTOR, PLA_METRIC_SELECTOR)
             values = [el.text for el in elements if el.text]
             if values:
                 pla_data['pla_keywords'] = values[0]
         except:
             pass
 
-        return pla_data
+        if self.debug_screenshots or pla_data['pla_keywords'] is None:
+            self.take_screenshot(f"pla_research_{domain.replace('.', '_')}")
 
-    def calculate_industry_averages(self):
-        """Calculate average CPCs and metrics across all analyzed competitors."""
-        print("\n[Calculating Industry Averages]")
+        return pla_data
 
-        all_cpcs = []
-        all_volumes = []
-
-        # Collect CPCs from competitor keyword data
-        for domain, data in self.benchmarks['competitors'].items():
-            for kw in data.get('top_paid_keywords', []):
-                try:
-                    cpc_str = kw.get('cpc', '').replace('$', '').replace(',', '')
-                    if cpc_str:
-                        all_cpcs.append(float(cpc_str))
-                except:
-                    pass
-
-        # Collect from keyword analysis
-        for kw, data in self.benchmarks['keywords'].items():
-            try:
-                cpc_str = str(data.get('cpc', '')).replace('$', '').replace(',', '')
-                if cpc_str:
-                    all_cpcs.append(float(cpc_str))
-                vol_str = str(data.get('volume', '')).replace(',', '').replace('K', '000').replace('M', '000000')
-                if vol_str and vol_str.replace('.', '').isdigit():
-                    all_volumes.append(float(vol_str))
-            except:
-                pass
+    def _record_cpcs(self, values):
+        """Add scraped CPC strings/numbers to the running statistics."""
+        for cpc in map(_parse_cpc, values):
+            if cpc is not None:
+                insort(self.cpc_values, cpc)
+                self.cpc_sum += cpc
+
+    def _record_competitor(self, domain, data):
+        """Store one competitor's results and fold its keyword CPCs into the statistics."""
+        self.benchmarks['competitors'][domain] = data
+        self._record_cpcs(kw.get('cpc', '') for kw in data.get('top_paid_keywords', []))
+
+    def _record_keyword(self, keyword, kw_info):
+        """Store one keyword's metrics and fold its CPC/volume into the statistics."""
+        self.benchmarks['keywords'][keyword] = kw_info
+        self._record_cpcs([kw_info.get('cpc', '')])
+        volume = _parse_volume(kw_info.get('volume', ''))
+        if volume is not None:
+            self.volume_sum += volume
+            self.volume_count += 1
+
+    def _cpc_median(self):
+        """Median of the sorted CPCs (mean of the middle two for an even count)."""
+        cpcs = self.cpc_values
+        mid = len(cpcs) // 2
+        return cpcs[mid] if len(cpcs) % 2 else (cpcs[mid - 1] + cpcs[mid]) / 2
+
+    def save_checkpoint(self):
+        """
+        Write the benchmarks gathered so far (with current averages) and the
+        scrape cache, so an interrupted run still leaves usable JSON behind.
+        """
+        self.calculate_industry_averages(quiet=True)
+        save_json(os.path.join(self.exports_dir, 'paid_media_benchmarks.json'), self.benchmarks, indent=None)
+        self.save_scrape_cache()
+
+    def calculate_industry_averages(self, quiet=False):
+        """
+        Calculate average CPCs and metrics across all analyzed competitors,
+        from the running statistics kept by _record_competitor/_record_keyword.
+        """
+        if not quiet:
+            print("\n[Calculating Industry Averages]")
+
+        cpcs = self.cpc_values
 
         self.benchmarks['industry_averages'] = {
-            'avg_cpc': sum(all_cpcs) / len(all_cpcs) if all_cpcs else None,
-            'min_cpc': min(all_cpcs) if all_cpcs else None,
-            'max_cpc': max(all_cpcs) if all_cpcs else None,
-            'median_cpc': sorted(all_cpcs)[len(all_cpcs)//2] if all_cpcs else None,
-            'avg_volume': sum(all_volumes) / len(all_volumes) if all_volumes else None,
+            'avg_cpc': self.cpc_sum / len(cpcs) if cpcs else None,
+            'min_cpc': cpcs[0] if cpcs else None,
+            'max_cpc': cpcs[-1] if cpcs else None,
+            'median_cpc': self._cpc_median() if cpcs else None,
+            'avg_volume': self.volume_sum / self.volume_count if self.volume_count else None,
             'total_keywords_analyzed': len(self.benchmarks['keywords']),
             'total_competitors_analyzed': len(self.benchmarks['competitors'])
         }
+        if quiet:
+            return
 
         print(f"  Average CPC: ${self.benchmarks['industry_averages']['avg_cpc']:.2f}" if self.benchmarks['industry_averages']['avg_cpc'] else "  Average CPC: N/A")
         print(f"  CPC Range: ${self.benchmarks['industry_averages']['min_cpc']:.2f} - ${self.benchmarks['industry_averages']['max_cpc']:.2f}" if self.benchmarks['industry_averages']['min_cpc'] else "  CPC Range: N/A")
 
     def save_benchmarks(self):
         """Save all benchmark data to JSON and CSV."""
-        # Save full JSON
+        # Full JSON, indented for reading; only the per-item checkpoint is compact
         json_path = os.path.join(self.exports_dir, 'paid_media_benchmarks.json')
-        with open(json_path, 'w') as f:
-            json.dump(self.benchmarks, f, indent=2)
+        save_json(json_path, self.benchmarks)
         print(f"\n[Saved] {json_path}")
 
-        # Save keyword CPCs to CSV
-        csv_path = os.path.join(self.exports_dir, 'keyword_cpcs.csv')
-        with open(csv_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Keyword', 'Volume', 'CPC', 'Competition'])
-            for kw, data in self.benchmarks['keywords'].items():
-                writer.writerow([
-                    kw,
-                    data.get('volume', ''),
-                    data.get('cpc', ''),
-                    data.get('competition', '')
-                ])
-        print(f"[Saved] {csv_path}")
-
-        # Save competitor summary to CSV
-        csv_path = os.path.join(self.exports_dir, 'competitor_paid_summary.csv')
-        with open(csv_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Domain', 'Paid Keywords', 'Paid Traffic', 'Est. Ad Spend', 'Top Keyword', 'Top CPC'])
-            for domain, data in self.benchmarks['competitors'].items():
-                top_kw = data.get('top_paid_keywords', [{}])[0] if data.get('top_paid_keywords') else {}
-                writer.writerow([
-                    domain,
-                    data.get('paid_keywords', ''),
-                    data.get('paid_traffic', ''),
-                    data.get('paid_traffic_cost', ''),
-                    top_kw.get('keyword', ''),
-                    top_kw.get('cpc', '')
-                ])
-        print(f"[Saved] {csv_path}")
-
-        # Save industry averages summary
+        keywords_path = os.path.join(self.exports_dir, 'keyword_cpcs.csv')
+        competitors_path = os.path.join(self.exports_dir, 'competitor_paid_summary.csv')
         summary_path = os.path.join(self.exports_dir, 'industry_benchmarks_summary.txt')
-        with open(summary_path, 'w') as f:
-            f.write("=" * 60 + "\n")
-            f.write("PAID MEDIA BENCHMARK SUMMARY\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 60 + "\n\n")
-
-            f.write("INDUSTRY AVERAGES:\n")
-            f.write("-" * 40 + "\n")
+
+        with ExitStack() as stack:
+            kw_file, comp_file, summary = (
+                stack.enter_context(open(path, 'w', newline=newline, buffering=WRITE_BUFFER_SIZE))
+                for path, newline in ((keywords_path, ''), (competitors_path, ''), (summary_path, None))
+            )
+
+            # Keyword CPCs
+            kw_writer = csv.DictWriter(kw_file, fieldnames=['Keyword', 'Volume', 'CPC', 'Competition'])
+            kw_writer.writeheader()
+            kw_writer.writerows(
+                {
+                    'Keyword': kw,
+                    'Volume': data.get('volume', ''),
+                    'CPC': data.get('cpc', ''),
+                    'Competition': data.get('competition', '')
+                }
+                for kw, data in self.benchmarks['keywords'].items()
+            )
+
+            # Industry averages summary header
+            summary.write("=" * 60 + "\n")
+            summary.write("PAID MEDIA BENCHMARK SUMMARY\n")
+            summary.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            summary.write("=" * 60 + "\n\n")
+
+            summary.write("INDUSTRY AVERAGES:\n")
+            summary.write("-" * 40 + "\n")
             avgs = self.benchmarks['industry_averages']
-            f.write(f"Average CPC: ${avgs.get('avg_cpc', 0):.2f}\n" if avgs.get('avg_cpc') else "Average CPC: N/A\n")
-            f.write(f"Median CPC: ${avgs.get('median_cpc', 0):.2f}\n" if avgs.get('median_cpc') else "Median CPC: N/A\n")
-            f.write(f"CPC Range: ${avgs.get('min_cpc', 0):.2f} - ${avgs.get('max_cpc', 0):.2f}\n" if avgs.get('min_cpc') else "CPC Range: N/A\n")
-            f.write(f"Competitors Analyzed: {avgs.get('total_competitors_analyzed', 0)}\n")
-            f.write(f"Keywords Analyzed: {avgs.get('total_keywords_analyzed', 0)}\n")
-
-            f.write("\n\nCOMPETITOR PAID MEDIA OVERVIEW:\n")
-            f.write("-" * 40 + "\n")
+            summary.write(f"Average CPC: ${avgs.get('avg_cpc', 0):.2f}\n" if avgs.get('avg_cpc') else "Average CPC: N/A\n")
+            summary.write(f"Median CPC: ${avgs.get('median_cpc', 0):.2f}\n" if avgs.get('median_cpc') else "Median CPC: N/A\n")
+            summary.write(f"CPC Range: ${avgs.get('min_cpc', 0):.2f} - ${avgs.get('max_cpc', 0):.2f}\n" if avgs.get('min_cpc') else "CPC Range: N/A\n")
+            summary.write(f"Competitors Analyzed: {avgs.get('total_competitors_analyzed', 0)}\n")
+            summary.write(f"Keywords Analyzed: {avgs.get('total_keywords_analyzed', 0)}\n")
+
+            summary.write("\n\nCOMPETITOR PAID MEDIA OVERVIEW:\n")
+            summary.write("-" * 40 + "\n")
+
+            # Competitor summary CSV and overview, one pass over the competitors
+            comp_writer = csv.DictWriter(comp_file, fieldnames=[
+                'Domain', 'Paid Keywords', 'Paid Traffic', 'Est. Ad Spend', 'Top Keyword', 'Top CPC'
+            ])
+            comp_writer.writeheader()
             for domain, data in self.benchmarks['competitors'].items():
-                f.write(f"\n{domain}:\n")
-                f.write(f"  Paid Keywords: {data.get('paid_keywords', 'N/A')}\n")
-                f.write(f"  Paid Traffic: {data.get('paid_traffic', 'N/A')}\n")
-                f.write(f"  Est. Monthly Spend: {data.get('paid_traffic_cost', 'N/A')}\n")
-
+                top_kw = data.get('top_paid_keywords', [{}])[0] if data.get('top_paid_keywords') else {}
+                comp_writer.writerow({
+                    'Domain': domain,
+                    'Paid Keywords': data.get('paid_keywords', ''),
+                    'Paid Traffic': data.get('paid_traffic', ''),
+                    'Est. Ad Spend': data.get('paid_traffic_cost', ''),
+                    'Top Keyword': top_kw.get('keyword', ''),
+                    'Top CPC': top_kw.get('cpc', '')
+                })
+
+                summary.write(f"\n{domain}:\n")
+                summary.write(f"  Paid Keywords: {data.get('paid_keywords', 'N/A')}\n")
+                summary.write(f"  Paid Traffic: {data.get('paid_traffic', 'N/A')}\n")
+                summary.write(f"  Est. Monthly Spend: {data.get('paid_traffic_cost', 'N/A')}\n")
+
+        print(f"[Saved] {keywords_path}")
+        print(f"[Saved] {competitors_path}")
         print(f"[Saved] {summary_path}")
 
     def run(self):
@@ -384,22 +820,16 @@ class PaidMediaBenchmarks:
             competitors = get_competitor_domains(self.config)
             print(f"\nAnalyzing {len(competitors)} competitors...")
 
-            # Extract advertising research for each competitor
-            for domain in competitors:
-                data = self.extract_advertising_research(domain)
-                self.benchmarks['competitors'][domain] = data
-
-                # Also get PLA data for e-commerce
-                pla_data = self.extract_pla_data(domain)
-                self.benchmarks['competitors'][domain]['pla'] = pla_data
-
-                time.sleep(2)
+            # Extract advertising research (and PLA data) for each competitor
+            self.benchmarks['competitors'] = self.extract_competitors(competitors)
 
             # Extract CPC data for market keywords
             market_keywords = self.config.get('market_keywords', [])
             if market_keywords:
                 self.benchmarks['keywords'] = self.extract_keyword_cpc(market_keywords)
 
+            self.save_scrape_cache()
+
             # Calculate industry averages
             self.calculate_industry_averages()
 
@@ -417,6 +847,31 @@ class PaidMediaBenchmarks:
             import traceback
             traceback.print_exc()
             return False
+        finally:
+            # The attached tab is the user's; leave it loading everything again
+            self.block_heavy_resources(blocked=False)
+
+
+def _competitor_worker(config_path, debug_port, domains, cookies=()):
+    """
+    Process pool entry point: extract `domains` through the Chrome on
+    `debug_port`, after copying the primary session's SEMrush cookies into it.
+    Returns (results, domains not processed), the latter being every domain
+    when the browser cannot be reached.
+    """
+    analyzer = PaidMediaBenchmarks(config_path)
+    if not analyzer.connect_to_chrome(debug_port):
+        return {}, list(domains)
+    analyzer.set_session_cookies(cookies)
+
+    results = {}
+    try:
+        for domain in domains:
+            results[domain] = analyzer.extract_competitor(domain)
+            time.sleep(COMPETITOR_DELAY)
+    finally:
+        analyzer.block_heavy_resources(blocked=False)
+    return results, []
 
 
 def main():
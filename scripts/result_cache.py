@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Pipeline Result Cache
+Records successful pipeline runs in SQLite, keyed by a hash of the config
+sections and input files each pipeline depends on, so unchanged pipelines
+can be skipped on re-runs.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pipeline_results (
+    pipeline TEXT NOT NULL,
+    cfg_hash TEXT NOT NULL,
+    output_manifest TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    PRIMARY KEY (pipeline, cfg_hash)
+)
+"""
+
+
+def _file_fingerprint(path):
+    """(path, size, mtime_ns) for an existing file, (path, None, None) otherwise"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [str(path), None, None]
+    return [str(path), st.st_size, st.st_mtime_ns]
+
+
+def _output_present(path):
+    """A file that exists, or a directory with at least one entry"""
+    if os.path.isdir(path):
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    return os.path.exists(path)
+
+
+def config_hash(pipeline, config, sections, input_paths=()):
+    """
+    Hash the config sections and input files a pipeline depends on.
+
+    Input files are fingerprinted by size and mtime rather than content, which
+    is enough to notice an upstream pipeline rewriting them.
+    """
+    payload = {
+        'pipeline': pipeline,
+        'config': {s: config.get(s) for s in sections},
+        'inputs': [_file_fingerprint(p) for p in input_paths],
+    }
+    canonical = json.dumps(payload, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """SQLite store of (pipeline, cfg_hash) -> output manifest."""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection committed on success (pipelines run on different threads)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def hit(self, pipeline, cfg_hash, max_age_seconds=None):
+        """
+        True if this pipeline already succeeded with the same hash (and is
+        fresh enough), and the outputs listed in its manifest still exist
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT ts, output_manifest FROM pipeline_results WHERE pipeline = ? AND cfg_hash = ?",
+                (pipeline, cfg_hash)
+            ).fetchone()
+        if row is None:
+            return False
+        ts, manifest = row
+        if max_age_seconds is not None and time.time() - ts > max_age_seconds:
+            return False
+        outputs = json.loads(manifest).get('outputs', [])
+        return all(_output_present(path) for path in outputs)
+
+    def put(self, pipeline, cfg_hash, manifest):
+        """Record a successful run, replacing older entries for the pipeline"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM pipeline_results WHERE pipeline = ?", (pipeline,))
+            conn.execute(
+                "INSERT INTO pipeline_results (pipeline, cfg_hash, output_manifest, ts) "
+                "VALUES (?, ?, ?, ?)",
+                (pipeline, cfg_hash, json.dumps(manifest, default=str), int(time.time()))
+            )
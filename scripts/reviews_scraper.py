@@ -4,19 +4,141 @@ Google Reviews Scraper
 Scrapes reviews for competitors from Google Maps
 """
 
-import time
+import asyncio
 import json
 import re
 import os
+from collections import Counter
+from contextlib import ExitStack
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-import pandas as pd
+from itertools import product
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+try:
+    from scripts.config_loader import load_config, get_competitor_names, get_data_dir, ensure_directories
+except ImportError:
+    from config_loader import load_config, get_competitor_names, get_data_dir, ensure_directories
+
+# Max milliseconds Playwright auto-waits for search results / the reviews tab
+WAIT_TIMEOUT_MS = 20000
+
+# Pause after each query on a page, so parallel queries don't hammer Maps
+QUERY_DELAY = 2
+
+# Requests Chrome skips on Maps pages (map tiles, photos, avatars, fonts,
+# trackers). Stylesheets still load: the reviews list only scrolls with them.
+BLOCKED_URL_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp",
+    "*googleusercontent.com/*", "*/maps/vt*",
+    "*.woff*", "*.ttf",
+    "*google-analytics*", "*doubleclick*",
+)
+
+# Reviews tab buttons, tried in order; the star rating area is the last resort
+REVIEWS_TAB_SELECTORS = (
+    "button[aria-label*='Reviews']",
+    "[data-tab-index='1']",
+    "button[jsaction*='reviews']",
+    "[role='tab'][data-tab-index='1']"
+)
+STAR_RATING_SELECTOR = "[role='img'][aria-label*='stars']"
+
+# Scrollable reviews list container, first one that matches wins
+SCROLLABLE_SELECTORS = (
+    "[role='feed']",
+    ".m6QErb.DxyBCb",
+    "[class*='review-dialog-list']",
+    "div[tabindex='-1']"
+)
+
+# Scrolls the element to the bottom every intervalMs until maxScrolls scrolls
+# are done or its height stops growing for 4 checks in a row, then resolves
+# with the number of scrolls made
+SCROLL_UNTIL_STABLE_JS = """
+(el, [maxScrolls, intervalMs]) => new Promise((done) => {
+    let last = -1, stable = 0, i = 0;
+    (function tick() {
+        if (i >= maxScrolls || stable > 3) return done(i);
+        el.scrollTop = el.scrollHeight;
+        i++;
+        setTimeout(() => {
+            if (el.scrollHeight === last) stable++; else { stable = 0; last = el.scrollHeight; }
+            tick();
+        }, intervalMs);
+    })();
+})
+"""
+SCROLL_INTERVAL_MS = 800
+
+MORE_BUTTON_SELECTOR = "button[aria-label='See more'], [class*='expand']"
+
+# Clicks every 'More' button, returns how many were clicked
+EXPAND_REVIEWS_JS = """
+(buttons) => buttons.filter((btn) => {
+    try { btn.click(); return true; } catch (e) { return false; }
+}).length
+"""
+
+# Review card selectors, first one that matches wins
+REVIEW_SELECTORS = (
+    "[data-review-id]",
+    "[class*='review'][class*='container']",
+    ".jftiEf",
+    "[jsaction*='review']"
+)
+
+# Reads rating label, text, reviewer and date for every review card in the
+# page, called with REVIEW_SELECTORS; missing fields come back null. Cards are
+# deduplicated by data-review-id first: Maps puts the same id on a card and on
+# elements inside it, and re-rendered cards can linger after scrolling.
+EXTRACT_REVIEWS_JS = """
+(selectors) => {
+    let cards = [];
+    for (const sel of selectors) {
+        cards = Array.from(document.querySelectorAll(sel));
+        if (cards.length) break;
+    }
+    const seen = new Set();
+    cards = cards.filter((card) => {
+        const holder = card.closest("[data-review-id]");
+        const key = holder ? holder.getAttribute("data-review-id") : card;
+        if (seen.has(key)) return false;
+        seen.add(key);
+        return true;
+    });
+    const textOf = (el) => el ? el.innerText.trim() : null;
+    return cards.map((card) => {
+        const rating = card.querySelector("[role='img'][aria-label*='star']");
+        let text = null;
+        for (const sel of [".wiI7pd", "[class*='review-text']", "[data-review-text]"]) {
+            const el = card.querySelector(sel);
+            if (el) { text = textOf(el); break; }
+        }
+        if (text === null) text = card.innerText.trim().slice(0, 1000);
+        return {
+            rating: rating ? rating.getAttribute("aria-label") : null,
+            text: text,
+            reviewer: textOf(card.querySelector("[class*='author'], .d4r55")),
+            date: textOf(card.querySelector("[class*='date'], .rsqaWe")),
+        };
+    });
+}
+"""
+
+# First number in a rating label, for labels that don't start with it
+_RATING_RE = re.compile(r'(\d+)')
+
 
-from config_loader import load_config, get_competitor_names, get_data_dir, ensure_directories
+def _parse_rating(label):
+    """Star count from an aria-label such as "4 stars", None if there is none"""
+    if not label:
+        return None
+    # English labels lead with the count; other locales may not
+    try:
+        return int(label.partition(' ')[0])
+    except ValueError:
+        match = _RATING_RE.search(label)
+        return int(match.group(1)) if match else None
 
 
 class ReviewsScraper:
@@ -28,306 +150,262 @@ class ReviewsScraper:
             self.config = load_config()
         else:
             self.config = config_path
-        self.driver = None
-        self.wait = None
+        self.browser = None
+        self.context = None
         self.output_dir = get_data_dir(self.config) / "reviews"
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.all_reviews = []
 
-    def connect_to_session(self):
-        """Connect to existing Chrome session"""
+    async def connect_to_session(self, playwright):
+        """Connect to existing Chrome session over the DevTools protocol"""
         port = self.config.get('semrush', {}).get('chrome_debug_port', 9222)
         print(f"🔌 Connecting to Chrome on port {port}...")
 
-        chrome_options = Options()
-        chrome_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{port}")
-
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.wait = WebDriverWait(self.driver, 20)
+            self.browser = await playwright.chromium.connect_over_cdp(f"http://127.0.0.1:{port}")
+            # Reuse the existing profile (cookies, consent) when there is one
+            if self.browser.contexts:
+                self.context = self.browser.contexts[0]
+            else:
+                self.context = await self.browser.new_context()
             print("✅ Connected!")
             return True
         except:
-            return self.setup_new_driver()
+            return await self.setup_new_browser(playwright)
 
-    def setup_new_driver(self):
-        """Setup new Chrome driver if session fails"""
+    async def setup_new_browser(self, playwright):
+        """Launch a new Chrome instance if the session fails"""
         print("🚀 Starting new Chrome instance...")
-        chrome_options = Options()
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 20)
+        self.browser = await playwright.chromium.launch(
+            headless=False,
+            args=["--disable-blink-features=AutomationControlled"]
+        )
+        self.context = await self.browser.new_context(viewport={"width": 1920, "height": 1080})
         return True
 
-    def search_google_maps(self, query):
+    async def block_heavy_resources(self, page):
+        """Stop the page loading images, fonts and trackers, over its own CDP session"""
+        try:
+            cdp = await self.context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            await cdp.send("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+        except Exception as e:
+            print(f"   ⚠️ Could not block page resources: {e}")
+
+    async def search_google_maps(self, page, query):
         """Search Google Maps for a business"""
         print(f"🔍 Searching: {query}")
         search_url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}"
-        self.driver.get(search_url)
-        time.sleep(4)
+        # Maps keeps connections open, so networkidle may never fire; the
+        # locators below auto-wait for the content they need instead
+        await page.goto(search_url, wait_until="domcontentloaded")
         return True
 
-    def click_first_result(self):
+    async def click_first_result(self, page):
         """Click on first search result"""
         try:
-            results = self.wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "[role='feed'] > div"))
-            )
-            if results:
-                results[0].click()
-                time.sleep(3)
-                return True
-        except Exception as e:
+            await page.locator("[role='feed'] > div").first.click(timeout=WAIT_TIMEOUT_MS)
+            return True
+        except PlaywrightTimeoutError as e:
             print(f"No results: {e}")
         return False
 
-    def open_reviews_panel(self):
+    async def open_reviews_panel(self, page):
         """Open reviews panel"""
-        selectors = [
-            "button[aria-label*='Reviews']",
-            "[data-tab-index='1']",
-            "button[jsaction*='reviews']",
-            "[role='tab'][data-tab-index='1']"
-        ]
+        selectors = REVIEWS_TAB_SELECTORS + (STAR_RATING_SELECTOR,)
+
+        # Wait for any of them to render, then take the first in priority order
+        try:
+            await page.wait_for_selector(", ".join(selectors), timeout=WAIT_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            return False
 
         for selector in selectors:
+            button = page.locator(selector).first
+            if not await button.count():
+                continue
             try:
-                btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                btn.click()
-                time.sleep(3)
+                await button.click()
+                await page.wait_for_selector(", ".join(REVIEW_SELECTORS), timeout=WAIT_TIMEOUT_MS)
                 return True
-            except:
+            except PlaywrightTimeoutError:
                 continue
 
-        # Try clicking star rating area
-        try:
-            rating = self.driver.find_element(By.CSS_SELECTOR, "[role='img'][aria-label*='stars']")
-            rating.click()
-            time.sleep(3)
-            return True
-        except:
-            pass
-
         return False
 
-    def scroll_reviews(self, scroll_count=None):
+    async def scroll_reviews(self, page, scroll_count=None):
         """Scroll to load more reviews"""
         if scroll_count is None:
             scroll_count = self.config.get('google_reviews', {}).get('max_scroll_count', 15)
 
-        scrollable_selectors = [
-            "[role='feed']",
-            ".m6QErb.DxyBCb",
-            "[class*='review-dialog-list']",
-            "div[tabindex='-1']"
-        ]
-
-        scrollable = None
-        for selector in scrollable_selectors:
-            try:
-                scrollable = self.driver.find_element(By.CSS_SELECTOR, selector)
+        for selector in SCROLLABLE_SELECTORS:
+            scrollable = page.locator(selector).first
+            if await scrollable.count():
+                # Whole loop runs in the page, one round-trip
+                scrolls = await scrollable.evaluate(SCROLL_UNTIL_STABLE_JS, [scroll_count, SCROLL_INTERVAL_MS])
+                print(f"   Scrolled {scrolls}/{scroll_count} times")
                 break
-            except:
-                continue
-
-        if scrollable:
-            for i in range(scroll_count):
-                self.driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollHeight",
-                    scrollable
-                )
-                time.sleep(1.5)
-                print(f"   Scrolling... {i+1}/{scroll_count}")
 
-    def expand_reviews(self):
+    async def expand_reviews(self, page):
         """Click 'More' buttons to expand reviews"""
         try:
-            more_buttons = self.driver.find_elements(By.CSS_SELECTOR,
-                "button[aria-label='See more'], [class*='expand']")
-            for btn in more_buttons:
-                try:
-                    btn.click()
-                    time.sleep(0.3)
-                except:
-                    pass
+            await page.locator(MORE_BUTTON_SELECTOR).evaluate_all(EXPAND_REVIEWS_JS)
         except:
             pass
 
-    def extract_reviews(self, brand_name, location):
+    async def extract_reviews(self, page, brand_name, location):
         """Extract all visible reviews"""
-        reviews = []
-
-        review_selectors = [
-            "[data-review-id]",
-            "[class*='review'][class*='container']",
-            ".jftiEf",
-            "[jsaction*='review']"
-        ]
-
-        review_elements = []
-        for selector in review_selectors:
-            try:
-                review_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if review_elements:
-                    break
-            except:
-                continue
-
-        print(f"   Found {len(review_elements)} review elements")
-
-        for elem in review_elements:
-            try:
-                review_data = {
-                    "brand": brand_name,
-                    "location": location,
-                    "scraped_at": datetime.now().isoformat()
-                }
-
-                # Extract rating
-                try:
-                    rating_elem = elem.find_element(By.CSS_SELECTOR,
-                        "[role='img'][aria-label*='star']")
-                    rating_text = rating_elem.get_attribute("aria-label")
-                    if rating_text:
-                        match = re.search(r'(\d+)', rating_text)
-                        if match:
-                            review_data["rating"] = int(match.group(1))
-                except:
-                    review_data["rating"] = None
-
-                # Extract text
-                try:
-                    text_selectors = [".wiI7pd", "[class*='review-text']", "[data-review-text]"]
-                    for sel in text_selectors:
-                        try:
-                            text_elem = elem.find_element(By.CSS_SELECTOR, sel)
-                            review_data["text"] = text_elem.text.strip()
-                            break
-                        except:
-                            continue
-                    if "text" not in review_data:
-                        review_data["text"] = elem.text[:1000]
-                except:
-                    review_data["text"] = ""
-
-                # Extract reviewer name
-                try:
-                    name_elem = elem.find_element(By.CSS_SELECTOR, "[class*='author'], .d4r55")
-                    review_data["reviewer"] = name_elem.text.strip()
-                except:
-                    review_data["reviewer"] = "Anonymous"
-
-                # Extract date
-                try:
-                    date_elem = elem.find_element(By.CSS_SELECTOR, "[class*='date'], .rsqaWe")
-                    review_data["date"] = date_elem.text.strip()
-                except:
-                    review_data["date"] = "Unknown"
-
-                if review_data.get("text") and len(review_data["text"]) > 10:
-                    reviews.append(review_data)
+        # All review cards are read in one in-page pass
+        raw_reviews = await page.evaluate(EXTRACT_REVIEWS_JS, list(REVIEW_SELECTORS)) or []
+        print(f"   Found {len(raw_reviews)} review elements")
 
-            except Exception as e:
-                continue
+        scraped_at = datetime.now().isoformat()
+        reviews = []
+        for raw in raw_reviews:
+            review_data = {
+                "brand": brand_name,
+                "location": location,
+                "scraped_at": scraped_at,
+                "rating": _parse_rating(raw.get('rating')),
+                "text": raw.get('text') or "",
+                "reviewer": raw.get('reviewer') or "Anonymous",
+                "date": raw.get('date') or "Unknown",
+            }
+
+            if review_data.get("text") and len(review_data["text"]) > 10:
+                reviews.append(review_data)
 
         return reviews
 
     def build_search_queries(self):
         """Build search queries from config"""
-        queries = []
         competitors = self.config.get('competitors', [])
         locations = self.config.get('google_reviews', {}).get('locations', ['New York', 'Los Angeles'])
         store_types = self.config.get('google_reviews', {}).get('store_types', ['store'])
 
-        for comp in competitors:
-            name = comp.get('name', comp.get('domain', '').split('.')[0])
-            for location in locations:
-                queries.append({
-                    "brand": name,
-                    "query": f"{name} store {location}"
-                })
-            for store_type in store_types:
-                if store_type != 'store':
-                    queries.append({
-                        "brand": name,
-                        "query": f"{name} {store_type}"
-                    })
-
-        return queries
-
-    def scrape_reviews(self, brand, query):
-        """Scrape reviews for a single query"""
-        print(f"\n{'='*50}")
-        print(f"🏪 {query}")
-        print("=" * 50)
+        names = [comp.get('name', comp.get('domain', '').split('.')[0]) for comp in competitors]
+        # Per brand: one "store <location>" query per location, then one per
+        # extra store type ("store" is already covered by the location queries)
+        suffixes = [f"store {location}" for location in locations]
+        suffixes += [store_type for store_type in store_types if store_type != 'store']
 
-        reviews = []
-        try:
-            self.search_google_maps(query)
-            time.sleep(2)
-
-            if self.click_first_result():
-                time.sleep(2)
+        return [
+            {"brand": name, "query": f"{name} {suffix}"}
+            for name, suffix in product(names, suffixes)
+        ]
 
-                if self.open_reviews_panel():
-                    self.scroll_reviews()
-                    self.expand_reviews()
+    async def scrape_reviews(self, brand, query, semaphore):
+        """Scrape reviews for a single query on its own page"""
+        async with semaphore:
+            print(f"\n{'='*50}")
+            print(f"🏪 {query}")
+            print("=" * 50)
 
-                    reviews = self.extract_reviews(brand, query)
-                    print(f"   ✅ Extracted {len(reviews)} reviews")
+            reviews = []
+            page = None
+            try:
+                page = await self.context.new_page()
+                await self.block_heavy_resources(page)
+                await self.search_google_maps(page, query)
+
+                if await self.click_first_result(page):
+                    if await self.open_reviews_panel(page):
+                        await self.scroll_reviews(page)
+                        await self.expand_reviews(page)
+
+                        reviews = await self.extract_reviews(page, brand, query)
+                        print(f"   ✅ {query}: extracted {len(reviews)} reviews")
+                    else:
+                        print(f"   ⚠️ {query}: could not open reviews panel")
                 else:
-                    print("   ⚠️ Could not open reviews panel")
-            else:
-                print("   ⚠️ No results found")
-
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
+                    print(f"   ⚠️ {query}: no results found")
 
-        return reviews
+            except Exception as e:
+                print(f"   ❌ {query}: {e}")
+            finally:
+                if page is not None:
+                    await page.close()
+
+            await asyncio.sleep(QUERY_DELAY)
+            return reviews
+
+    async def _scrape_all(self, jsonl_file):
+        """
+        Scrape every query, streaming reviews to jsonl_file as each finishes.
+        Returns a Counter of reviews per brand.
+        """
+        brand_counts = Counter()
+        async with async_playwright() as playwright:
+            if not await self.connect_to_session(playwright):
+                return brand_counts
+
+            # google_reviews.max_concurrent Maps pages at once
+            limit = max(1, int(self.config.get('google_reviews', {}).get('max_concurrent', 1)))
+            semaphore = asyncio.Semaphore(limit)
+            tasks = [
+                asyncio.create_task(self.scrape_reviews(q['brand'], q['query'], semaphore))
+                for q in self.build_search_queries()
+            ]
+
+            with ExitStack() as stack:
+                # Opened on the first review so an empty run keeps the previous file
+                out = None
+                for task in asyncio.as_completed(tasks):
+                    reviews = await task
+                    if reviews:
+                        if out is None:
+                            out = stack.enter_context(open(jsonl_file, 'w', encoding='utf-8'))
+                        out.writelines(json.dumps(review) + "\n" for review in reviews)
+                        brand_counts.update(review['brand'] for review in reviews)
+
+            return brand_counts
 
     def run_full_scrape(self):
-        """Run complete scrape for all competitors"""
+        """
+        Run complete scrape for all competitors, returns the number of reviews.
+        Reviews are streamed to all_reviews.jsonl as each query finishes.
+        """
         print("=" * 60)
         print("🚀 Google Reviews Scraper")
         print("=" * 60)
 
         ensure_directories()
 
-        if not self.connect_to_session():
-            return []
+        jsonl_file = self.output_dir / "all_reviews.jsonl"
+        brand_counts = asyncio.run(self._scrape_all(jsonl_file))
+        review_count = sum(brand_counts.values())
 
-        queries = self.build_search_queries()
-        all_reviews = []
+        # Save results
+        if review_count:
+            import pandas as pd
 
-        for q in queries:
-            reviews = self.scrape_reviews(q['brand'], q['query'])
-            all_reviews.extend(reviews)
-            time.sleep(2)
+            print(f"\n💾 Saved {review_count} reviews to {jsonl_file}")
+            df = pd.read_json(jsonl_file, lines=True, dtype=False, convert_dates=False)
 
-        # Save results
-        if all_reviews:
-            # CSV
-            df = pd.DataFrame(all_reviews)
+            # Parquet for reloading, needs pyarrow or fastparquet
+            parquet_file = self.output_dir / "all_reviews.parquet"
+            try:
+                df.to_parquet(parquet_file, compression="zstd", index=False)
+                print(f"💾 Saved {parquet_file}")
+            except ImportError:
+                # Don't leave a Parquet file from an earlier run behind
+                parquet_file.unlink(missing_ok=True)
+                print("   (Parquet export skipped: install pyarrow)")
+
+            # CSV for inspection
             csv_file = self.output_dir / "all_reviews.csv"
             df.to_csv(csv_file, index=False)
-            print(f"\n💾 Saved {len(all_reviews)} reviews to {csv_file}")
-
-            # JSON
-            json_file = self.output_dir / "all_reviews.json"
-            with open(json_file, 'w') as f:
-                json.dump(all_reviews, f, indent=2)
+            print(f"💾 Saved {csv_file}")
 
-            # Summary
+            # Summary, tallied while streaming
             print("\n📈 Reviews by Brand:")
-            print(df.groupby("brand").size())
+            for brand, count in brand_counts.most_common():
+                print(f"   {brand}: {count}")
 
         print("\n" + "=" * 60)
         print("✅ SCRAPING COMPLETE!")
         print("=" * 60)
 
-        return all_reviews
+        return review_count
 
 
 def main():
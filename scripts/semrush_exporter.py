@@ -5,8 +5,12 @@ Exports organic keywords, backlinks, traffic data, and competitor analysis
 Uses existing logged-in Chrome session via remote debugging
 """
 
+import base64
+import hashlib
+import io
 import time
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -14,12 +18,96 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Optional: slices full-page captures into per-section files
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    from scripts.config_loader import load_config, get_all_domains, get_target_domain, get_competitor_domains, get_output_dir, ensure_directories
+    from scripts.cdp_screenshot import full_page_params
+except ImportError:
+    from config_loader import load_config, get_all_domains, get_target_domain, get_competitor_domains, get_output_dir, ensure_directories
+    from cdp_screenshot import full_page_params
+
+# Hours a report screenshot is reused instead of re-opening the report
+# (cache.screenshot_max_age_hours; 0 always re-captures)
+DEFAULT_SCREENSHOT_MAX_AGE_HOURS = 24
+
+# Matches the _YYYYmmdd_HHMMSS suffix save_screenshot() adds, any format
+_TIMESTAMP_GLOB = "_" + "[0-9]" * 8 + "_" + "[0-9]" * 6 + ".*"
+
+# Hex digits of the report URL's hash in reusable screenshot names, so a
+# different database, competitor set or industry never reuses a capture
+URL_KEY_LENGTH = 8
+
+# Screenshot encodings Chrome can produce (semrush.screenshot_format). WebP
+# and JPEG encode faster and come out several times smaller than PNG.
+SCREENSHOT_FORMATS = ("webp", "jpeg", "png")
+DEFAULT_SCREENSHOT_FORMAT = "webp"
+DEFAULT_SCREENSHOT_QUALITY = 85
+
+# Max seconds to wait for a report to render before capturing it anyway
+REPORT_LOAD_TIMEOUT = 10
+
+# Pause after the report renders, for chart/table animations to finish
+RENDER_SETTLE_DELAY = 0.3
+
+# A report that has fired its load event and fetched nothing for this long is
+# treated as rendered even when none of its READY_SELECTORS matched
+NETWORK_IDLE_MS = 500
+
+# Load event fired and no resource finished in the last arguments[0] ms. A
+# PerformanceObserver (installed once per page, replaying buffered entries)
+# records when the last resource finished.
+NETWORK_IDLE_JS = """
+if (window.__exporterLastResource === undefined) {
+    window.__exporterLastResource = performance.now();
+    new PerformanceObserver(() => { window.__exporterLastResource = performance.now(); })
+        .observe({type: 'resource', buffered: true});
+    return false;
+}
+return document.readyState === 'complete'
+    && performance.now() - window.__exporterLastResource >= arguments[0];
+"""
 
-from config_loader import load_config, get_all_domains, get_target_domain, get_competitor_domains, get_output_dir, ensure_directories
+# Per-report elements that mean the data has rendered; any one is enough.
+# The generic SEMrush table/card selectors back up the report-specific ones.
+_GENERIC_READY = ("[class*='srf-report-card']", ".sm-table", "table tbody tr")
+READY_SELECTORS = {
+    "organic": ("[data-test='positions-table']",) + _GENERIC_READY,
+    "backlinks": ("[data-test='backlinks-report']", "[data-test='backlinks-table']") + _GENERIC_READY,
+    "traffic": ("[data-test='traffic-overview']", "[class*='traffic'] [class*='value']") + _GENERIC_READY,
+    "pages": ("[data-test='pages-table']",) + _GENERIC_READY,
+    "competitors": ("[data-test='competitors-table']",) + _GENERIC_READY,
+    "keyword_gap": ("[data-test='keyword-gap-table']", "[class*='keywordgap']") + _GENERIC_READY,
+    "market": ("[class*='trends'] [class*='value']", "[data-test='market-overview']") + _GENERIC_READY,
+    "keyword_magic": ("[data-test='keyword-magic-table']",) + _GENERIC_READY,
+}
+
+# Report containers to capture instead of the whole viewport; first match
+# wins, and with no match the full viewport is captured as before.
+_GENERIC_CAPTURE = ("[data-test='report-content']", "main")
+CAPTURE_SELECTORS = {
+    "organic": ("[data-test='positions-table']",) + _GENERIC_CAPTURE,
+    "backlinks": ("[data-test='backlinks-report']",) + _GENERIC_CAPTURE,
+    "traffic": ("[data-test='traffic-overview']",) + _GENERIC_CAPTURE,
+    "traffic_channels": ("[data-test='traffic-channels']", "[class*='traffic-channels']"),
+    "traffic_geo": ("[data-test='traffic-geo']", "[class*='traffic-geo']"),
+    "pages": ("[data-test='pages-table']",) + _GENERIC_CAPTURE,
+    "competitors": ("[data-test='competitors-table']",) + _GENERIC_CAPTURE,
+    "keyword_gap": ("[data-test='keyword-gap-table']",) + _GENERIC_CAPTURE,
+    "market": ("[data-test='market-overview']",) + _GENERIC_CAPTURE,
+    "market_details": ("[data-test='market-details']", "[class*='trends'] section:nth-of-type(2)"),
+    "keyword_magic": ("[data-test='keyword-magic-table']",) + _GENERIC_CAPTURE,
+}
 
 
 class SEMrushExporter:
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, force=False):
         # Handle both config path strings and config dicts
         if isinstance(config_path, str):
             self.config = load_config(config_path)
@@ -29,12 +117,26 @@ class SEMrushExporter:
             self.config = config_path
         self.driver = None
         self.wait = None
+        self.report_wait = None
         self.output_dir = get_output_dir(self.config) / "screenshots" / "semrush"
         self.output_dir.mkdir(parents=True, exist_ok=True)
-
-    def connect_to_session(self):
+        semrush = self.config.get('semrush', {})
+        self.screenshot_format = semrush.get('screenshot_format', DEFAULT_SCREENSHOT_FORMAT)
+        if self.screenshot_format not in SCREENSHOT_FORMATS:
+            print(f"⚠️ Unknown screenshot_format {self.screenshot_format!r}, using png")
+            self.screenshot_format = "png"
+        self.screenshot_quality = semrush.get('screenshot_quality', DEFAULT_SCREENSHOT_QUALITY)
+        max_age_hours = self.config.get('cache', {}).get('screenshot_max_age_hours', DEFAULT_SCREENSHOT_MAX_AGE_HOURS)
+        # force (master.py --force) re-captures every report
+        self.force = force
+        self.screenshot_ttl = 0 if force else max_age_hours * 3600
+        # Whether the last export_* call was served from earlier screenshots
+        self.last_export_cached = False
+
+    def connect_to_session(self, port=None):
         """Connect to existing Chrome session via remote debugging"""
-        port = self.config.get('semrush', {}).get('chrome_debug_port', 9222)
+        if port is None:
+            port = self.config.get('semrush', {}).get('chrome_debug_port', 9222)
         print(f"🔌 Connecting to Chrome on port {port}...")
 
         chrome_options = Options()
@@ -43,6 +145,10 @@ class SEMrushExporter:
         try:
             self.driver = webdriver.Chrome(options=chrome_options)
             self.wait = WebDriverWait(self.driver, 30)
+            self.report_wait = WebDriverWait(self.driver, REPORT_LOAD_TIMEOUT)
+            # Explicit waits only; an implicit wait would stretch every
+            # find_elements miss in close_popups() and the capture lookups
+            self.driver.implicitly_wait(0)
             print(f"✅ Connected! Current URL: {self.driver.current_url}")
             return True
         except Exception as e:
@@ -71,58 +177,192 @@ class SEMrushExporter:
         except:
             pass
 
-    def save_screenshot(self, name):
-        """Save screenshot with timestamp"""
-        filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        path = self.output_dir / filename
-        self.driver.save_screenshot(str(path))
+    def _capture(self, **params):
+        """Image bytes in screenshot_format from one CDP Page.captureScreenshot"""
+        params["format"] = self.screenshot_format
+        if self.screenshot_format != "png":
+            params["quality"] = self.screenshot_quality
+        result = self.driver.execute_cdp_cmd("Page.captureScreenshot", params)
+        return base64.b64decode(result['data'])
+
+    def save_screenshot(self, name, element=None):
+        """
+        Save screenshot with timestamp. With an element, only that element
+        is captured (fewer pixels to encode); otherwise the whole viewport.
+        """
+        path = self.output_dir / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{self.screenshot_format}"
+        try:
+            clip = None
+            if element is not None:
+                try:
+                    rect = element.rect
+                    if rect['width'] and rect['height']:
+                        clip = {**rect, "scale": 1}
+                except WebDriverException:
+                    # Element went stale
+                    clip = None
+            if clip:
+                path.write_bytes(self._capture(clip=clip, captureBeyondViewport=True))
+            else:
+                path.write_bytes(self._capture())
+        except WebDriverException:
+            # No CDP on this driver: Selenium's own PNG capture
+            path = path.with_suffix(".png")
+            if element is None or not element.screenshot(str(path)):
+                self.driver.save_screenshot(str(path))
         print(f"📸 {path}")
         return path
 
+    def cached_screenshot(self, name):
+        """
+        Newest screenshot saved under name within the screenshot TTL, or
+        None. Sets last_export_cached, so callers can skip the pause that
+        only matters after a real page load.
+        """
+        path = None
+        if self.screenshot_ttl > 0:
+            cutoff = time.time() - self.screenshot_ttl
+            fresh = [(p.stat().st_mtime, p) for p in self.output_dir.glob(name + _TIMESTAMP_GLOB)]
+            fresh = [(mtime, p) for mtime, p in fresh if mtime >= cutoff]
+            if fresh:
+                path = max(fresh)[1]
+                print(f"♻️  Reusing {path.name}")
+        self.last_export_cached = path is not None
+        return path
+
+    def find_capture_element(self, key):
+        """First element matching CAPTURE_SELECTORS[key], or None"""
+        for selector in CAPTURE_SELECTORS.get(key, ()):
+            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            if elements:
+                return elements[0]
+        return None
+
+    def _full_page_image(self):
+        """Bytes of the whole page, beyond the viewport, in one CDP capture"""
+        metrics = self.driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+        return self._capture(**full_page_params(metrics))
+
+    def capture_sections(self, sections, full_name):
+        """
+        Capture sections further down the report, given as
+        (CAPTURE_SELECTORS key, name, scroll offset) tuples. Found sections
+        are captured as elements. The rest are cut from one full-page
+        capture at their old scroll offsets, one viewport high, with no
+        scrolling or sleeps; without Pillow the full page is saved as
+        full_name instead. Returns the last path written.
+        """
+        path = None
+        missing = []
+        for key, name, scroll_y in sections:
+            element = self.find_capture_element(key)
+            if element is not None:
+                path = self.save_screenshot(name, element)
+            else:
+                missing.append((name, scroll_y))
+        if not missing:
+            return path
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        try:
+            image = self._full_page_image()
+        except WebDriverException:
+            # No CDP on this driver: fall back to scrolling the viewport
+            for name, scroll_y in missing:
+                self.driver.execute_script(f"window.scrollTo(0, {scroll_y})")
+                time.sleep(2)
+                path = self.save_screenshot(name)
+            return path
+
+        if Image is None:
+            path = self.output_dir / f"{full_name}_{timestamp}.{self.screenshot_format}"
+            path.write_bytes(image)
+            print(f"📸 {path}")
+            return path
+
+        page = Image.open(io.BytesIO(image))
+        # CDP captures in device pixels, scroll offsets are CSS pixels
+        scale = self.driver.execute_script("return window.devicePixelRatio") or 1
+        viewport = self.driver.execute_script("return window.innerHeight") * scale
+        for name, scroll_y in missing:
+            top = min(int(scroll_y * scale), max(page.height - 1, 0))
+            path = self.output_dir / f"{name}_{timestamp}.{self.screenshot_format}"
+            section = page.crop((0, top, page.width, min(top + int(viewport), page.height)))
+            section.save(path, quality=self.screenshot_quality)
+            print(f"📸 {path}")
+        return path
+
+    def network_idle(self, driver):
+        """Wait condition: page loaded and no resource finished for NETWORK_IDLE_MS"""
+        return driver.execute_script(NETWORK_IDLE_JS, NETWORK_IDLE_MS)
+
+    def wait_for_report(self, report):
+        """
+        Wait until any READY_SELECTORS[report] element is present or the
+        page's network has gone idle. Returns False on timeout; the caller
+        still captures whatever has rendered.
+        """
+        try:
+            self.report_wait.until(EC.any_of(
+                *(EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                  for selector in READY_SELECTORS[report]),
+                self.network_idle,
+            ))
+            time.sleep(RENDER_SETTLE_DELAY)
+            return True
+        except TimeoutException:
+            print(f"⚠️ Report not rendered after {REPORT_LOAD_TIMEOUT}s, capturing anyway")
+            return False
+
+    def _load_and_capture(self, url, report, name):
+        """
+        Open a report, wait for it to render, close popups and screenshot
+        it - unless a screenshot of the same URL is still fresh. Rendered
+        captures are saved as {name}_{URL hash} so later runs can reuse them;
+        a capture taken after the render timed out keeps the plain name and
+        is never reused.
+        """
+        cache_name = f"{name}_{hashlib.sha1(url.encode()).hexdigest()[:URL_KEY_LENGTH]}"
+        cached = self.cached_screenshot(cache_name)
+        if cached is not None:
+            return cached
+        self.driver.get(url)
+        rendered = self.wait_for_report(report)
+        self.close_popups()
+        return self.save_screenshot(cache_name if rendered else name, self.find_capture_element(report))
+
     def export_organic_keywords(self, domain):
         """Export organic keywords for a domain"""
         print(f"\n🔑 Organic Keywords: {domain}")
         db = self.config.get('semrush', {}).get('database', 'us')
 
         url = f"https://www.semrush.com/analytics/organic/positions/?db={db}&q={domain}&searchType=domain"
-        self.driver.get(url)
-        time.sleep(6)
-        self.close_popups()
-
-        return self.save_screenshot(f"organic_{domain.replace('.', '_')}")
+        return self._load_and_capture(url, "organic", f"organic_{domain.replace('.', '_')}")
 
     def export_backlinks(self, domain):
         """Export backlinks data"""
         print(f"\n🔗 Backlinks: {domain}")
 
         url = f"https://www.semrush.com/analytics/backlinks/backlinks/?q={domain}&searchType=domain"
-        self.driver.get(url)
-        time.sleep(6)
-        self.close_popups()
-
-        return self.save_screenshot(f"backlinks_{domain.replace('.', '_')}")
+        return self._load_and_capture(url, "backlinks", f"backlinks_{domain.replace('.', '_')}")
 
     def export_traffic_analytics(self, domain):
         """Export traffic analytics"""
         print(f"\n📈 Traffic Analytics: {domain}")
 
         url = f"https://www.semrush.com/analytics/traffic/overview/?q={domain}"
-        self.driver.get(url)
-        time.sleep(6)
-        self.close_popups()
-
         # Main view
-        self.save_screenshot(f"traffic_{domain.replace('.', '_')}")
-
-        # Scroll for more data
-        self.driver.execute_script("window.scrollTo(0, 600)")
-        time.sleep(2)
-        self.save_screenshot(f"traffic_{domain.replace('.', '_')}_channels")
-
-        # Geographic data
-        self.driver.execute_script("window.scrollTo(0, 1200)")
-        time.sleep(2)
-        return self.save_screenshot(f"traffic_{domain.replace('.', '_')}_geo")
+        safe_domain = domain.replace('.', '_')
+        main = self._load_and_capture(url, "traffic", f"traffic_{safe_domain}")
+        if self.last_export_cached:
+            # Sections were captured along with the cached main view
+            return main
+
+        # Channels breakdown and geographic data
+        return self.capture_sections([
+            ("traffic_channels", f"traffic_{safe_domain}_channels", 600),
+            ("traffic_geo", f"traffic_{safe_domain}_geo", 1200),
+        ], f"traffic_{safe_domain}_full")
 
     def export_top_pages(self, domain):
         """Export top pages"""
@@ -130,11 +370,7 @@ class SEMrushExporter:
         db = self.config.get('semrush', {}).get('database', 'us')
 
         url = f"https://www.semrush.com/analytics/organic/pages/?db={db}&q={domain}&searchType=domain"
-        self.driver.get(url)
-        time.sleep(6)
-        self.close_popups()
-
-        return self.save_screenshot(f"pages_{domain.replace('.', '_')}")
+        return self._load_and_capture(url, "pages", f"pages_{domain.replace('.', '_')}")
 
     def export_competitors_organic(self, domain):
         """Export organic competitors"""
@@ -142,11 +378,7 @@ class SEMrushExporter:
         db = self.config.get('semrush', {}).get('database', 'us')
 
         url = f"https://www.semrush.com/analytics/organic/competitors/?db={db}&q={domain}&searchType=domain"
-        self.driver.get(url)
-        time.sleep(6)
-        self.close_popups()
-
-        return self.save_screenshot(f"competitors_{domain.replace('.', '_')}")
+        return self._load_and_capture(url, "competitors", f"competitors_{domain.replace('.', '_')}")
 
     def export_keyword_gap(self):
         """Export keyword gap analysis between target and competitors"""
@@ -162,11 +394,7 @@ class SEMrushExporter:
 
         comps_param = ",".join(competitors)
         url = f"https://www.semrush.com/analytics/keywordgap/?db={db}&q={target}&domains={comps_param}&searchType=domain"
-        self.driver.get(url)
-        time.sleep(8)
-        self.close_popups()
-
-        return self.save_screenshot("keyword_gap")
+        return self._load_and_capture(url, "keyword_gap", "keyword_gap")
 
     def export_market_explorer(self):
         """Export market explorer / industry trends"""
@@ -176,16 +404,12 @@ class SEMrushExporter:
         region = self.config.get('industry', {}).get('region', 'us')
 
         url = f"https://www.semrush.com/trends/overview/{region}/{category}"
-        self.driver.get(url)
-        time.sleep(6)
-        self.close_popups()
-
-        self.save_screenshot("market_trends")
+        main = self._load_and_capture(url, "market", "market_trends")
+        if self.last_export_cached:
+            return main
 
-        # Scroll for more
-        self.driver.execute_script("window.scrollTo(0, 800)")
-        time.sleep(2)
-        return self.save_screenshot("market_trends_2")
+        # Details further down the page
+        return self.capture_sections([("market_details", "market_trends_2", 800)], "market_trends_full")
 
     def export_keyword_research(self):
         """Export keyword research for market keywords"""
@@ -197,18 +421,66 @@ class SEMrushExporter:
         for kw in keywords:
             print(f"   Researching: {kw}")
             url = f"https://www.semrush.com/analytics/keywordmagic/?q={kw.replace(' ', '%20')}&db={db}"
-            self.driver.get(url)
-            time.sleep(6)
-            self.close_popups()
-
             safe_name = kw.replace(' ', '_')
-            self.save_screenshot(f"keyword_{safe_name}")
+            self._load_and_capture(url, "keyword_magic", f"keyword_{safe_name}")
+            if self.last_export_cached:
+                continue
 
             # Scroll for more keywords
             self.driver.execute_script("window.scrollTo(0, 400)")
             time.sleep(1)
             self.save_screenshot(f"keyword_{safe_name}_list")
 
+    def export_domain(self, domain):
+        """Run the five per-domain reports for one domain on this exporter's browser"""
+        print(f"\n{'='*60}")
+        print(f"📊 Processing: {domain}")
+        print("=" * 60)
+
+        # Traffic analytics last (may require paid plan)
+        for export in (self.export_organic_keywords, self.export_backlinks, self.export_top_pages,
+                       self.export_competitors_organic, self.export_traffic_analytics):
+            export(domain)
+            # Pause between page loads; reused screenshots loaded nothing
+            if not self.last_export_cached:
+                time.sleep(2)
+
+    def export_domains(self, domains):
+        """
+        Export every domain, sequentially on this browser or, when
+        semrush.worker_debug_ports lists 2+ logged-in Chrome instances, split
+        round-robin across one process per browser.
+        """
+        ports = self.config.get('semrush', {}).get('worker_debug_ports') or []
+        if len(ports) < 2 or len(domains) < 2:
+            for domain in domains:
+                self.export_domain(domain)
+            return
+
+        groups = [(port, list(domains[i::len(ports)])) for i, port in enumerate(ports)]
+        groups = [(port, group) for port, group in groups if group]
+        print(f"\n🧵 Using {len(groups)} Chrome workers on ports {[port for port, _ in groups]}")
+
+        # Domains a worker could not export (no connection, or it crashed)
+        leftover = set()
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [
+                (port, group, executor.submit(_export_worker, self.config, port, group, self.force))
+                for port, group in groups
+            ]
+            for port, group, future in futures:
+                try:
+                    leftover.update(future.result())
+                except Exception as e:
+                    print(f"⚠️ Chrome worker on port {port} failed: {e}")
+                    leftover.update(group)
+
+        if leftover:
+            print(f"\n🔁 Exporting {len(leftover)} domains on this browser instead")
+        for domain in domains:
+            if domain in leftover:
+                self.export_domain(domain)
+
     def run_full_export(self):
         """Run complete export for all domains"""
         print("=" * 60)
@@ -220,37 +492,17 @@ class SEMrushExporter:
         if not self.connect_to_session():
             return False
 
-        all_domains = get_all_domains(self.config)
-        target = get_target_domain(self.config)
-
-        for domain in all_domains:
-            print(f"\n{'='*60}")
-            print(f"📊 Processing: {domain}")
-            print("=" * 60)
-
-            self.export_organic_keywords(domain)
-            time.sleep(2)
-
-            self.export_backlinks(domain)
-            time.sleep(2)
-
-            self.export_top_pages(domain)
-            time.sleep(2)
-
-            self.export_competitors_organic(domain)
-            time.sleep(2)
-
-            # Traffic analytics (may require paid plan)
-            self.export_traffic_analytics(domain)
-            time.sleep(2)
+        self.export_domains(list(get_all_domains(self.config)))
 
         # Gap analysis
         self.export_keyword_gap()
-        time.sleep(2)
+        if not self.last_export_cached:
+            time.sleep(2)
 
         # Market trends
         self.export_market_explorer()
-        time.sleep(2)
+        if not self.last_export_cached:
+            time.sleep(2)
 
         # Keyword research
         self.export_keyword_research()
@@ -261,12 +513,25 @@ class SEMrushExporter:
         print(f"📁 Data saved to: {self.output_dir}")
 
         # List files
-        files = list(self.output_dir.glob("*.png"))
+        files = [p for fmt in SCREENSHOT_FORMATS for p in self.output_dir.glob(f"*.{fmt}")]
         print(f"\n📊 Exported {len(files)} screenshots")
 
         return True
 
 
+def _export_worker(config, port, domains, force=False):
+    """
+    Process pool entry point: export `domains` through the Chrome on `port`.
+    Returns the domains not exported (all of them if the browser is unreachable).
+    """
+    exporter = SEMrushExporter(config, force=force)
+    if not exporter.connect_to_session(port):
+        return list(domains)
+    for domain in domains:
+        exporter.export_domain(domain)
+    return []
+
+
 def main():
     exporter = SEMrushExporter()
     exporter.run_full_export()
@@ -8,11 +8,16 @@ import os
 import json
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 import pandas as pd
 import numpy as np
 
-from config_loader import load_config, get_data_dir, get_output_dir, ensure_directories
+try:
+    from scripts.config_loader import load_config, save_json, get_data_dir, get_output_dir, ensure_directories
+except ImportError:
+    from config_loader import load_config, save_json, get_data_dir, get_output_dir, ensure_directories
 
 # Optional NLP imports
 try:
@@ -23,7 +28,6 @@ except ImportError:
 
 try:
     import nltk
-    from nltk.tokenize import word_tokenize
     from nltk.corpus import stopwords
     from nltk.stem import WordNetLemmatizer
     NLTK_AVAILABLE = True
@@ -31,7 +35,19 @@ except ImportError:
     NLTK_AVAILABLE = False
 
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+    VADER_AVAILABLE = True
+except ImportError:
+    VADER_AVAILABLE = False
+
+# Optional: one Aho-Corasick pass over a review instead of a regex per category
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
     from sklearn.decomposition import LatentDirichletAllocation
     SKLEARN_AVAILABLE = True
 except ImportError:
@@ -51,6 +67,128 @@ COMPLAINT_CATEGORIES = {
     "authenticity": ["fake", "authentic", "counterfeit", "real", "genuine"]
 }
 
+# One case-insensitive alternation per category, compiled once. Keywords match
+# as substrings (no word boundaries) so "burn" still catches "burned".
+CATEGORY_PATTERNS = {
+    category: re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+    for category, keywords in COMPLAINT_CATEGORIES.items()
+}
+
+# All keywords in one automaton, each mapped to its category's position in
+# COMPLAINT_CATEGORIES so matches can be reported in category order
+_CATEGORY_NAMES = tuple(COMPLAINT_CATEGORIES)
+if ahocorasick is not None:
+    KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _index, _keywords in enumerate(COMPLAINT_CATEGORIES.values()):
+        for _kw in _keywords:
+            # A keyword listed under two categories matches both
+            _existing = KEYWORD_AUTOMATON.get(_kw, ())
+            KEYWORD_AUTOMATON.add_word(_kw, _existing + (_index,))
+    KEYWORD_AUTOMATON.make_automaton()
+else:
+    KEYWORD_AUTOMATON = None
+
+# Distinct words whose lemma is remembered across reviews
+LEMMA_CACHE_SIZE = 65536
+
+# Reviews parsed per chunk when reading JSON Lines
+REVIEW_CHUNK_SIZE = 10000
+
+# Low-cardinality review columns stored as pandas categoricals
+CATEGORY_COLUMNS = ("brand", "location")
+
+# Vocabulary sizes for key phrases (1-3 grams) and topic modeling (words)
+N_PHRASE_FEATURES = 100
+N_TOPIC_FEATURES = 200
+
+# Sentiment scoring is split across worker processes above this many reviews
+PARALLEL_MIN_REVIEWS = 5000
+
+# Words for the fallback scorer when neither VADER nor TextBlob is available
+NEGATIVE_WORDS = ["bad", "terrible", "awful", "horrible", "poor", "worst", "disappointed", "hate", "waste"]
+POSITIVE_WORDS = ["great", "amazing", "love", "excellent", "best", "wonderful", "fantastic", "perfect"]
+
+# Stripped by preprocessing (applied after lowercasing)
+_NON_ALPHA_RE = re.compile(r'[^a-z\s]')
+
+
+def _most_frequent_terms(counts, features, limit, columns=None):
+    """
+    Columns of the limit most frequent terms (optionally among columns),
+    kept in vocabulary order. Ties are broken with the same default
+    (unstable) argsort sklearn's max_features uses on the same totals, so
+    the selection matches it exactly. Returns (counts submatrix, feature names).
+    """
+    if columns is None:
+        columns = np.arange(counts.shape[1])
+    totals = np.asarray(counts[:, columns].sum(axis=0)).ravel()
+    keep = np.sort(columns[(-totals).argsort()[:limit]])
+    return counts[:, keep], features[keep]
+
+# NLTK data packages already found or downloaded in this process
+_NLTK_READY = set()
+
+
+def _ensure_nltk_data(package, resource):
+    """Download an NLTK data package unless it is installed; checked once per process"""
+    if package in _NLTK_READY:
+        return
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package, quiet=True)
+    _NLTK_READY.add(package)
+
+
+@lru_cache(maxsize=None)
+def _text_resources():
+    """
+    Stop words, lemmatizer and its cached lemmatize(), built once per
+    process and shared by every SentimentAnalyzer (so is the lemma cache).
+    """
+    _ensure_nltk_data('stopwords', 'corpora/stopwords')
+    _ensure_nltk_data('wordnet', 'corpora/wordnet')
+    lemmatizer = WordNetLemmatizer()
+    # Review vocabulary repeats heavily, so most lookups hit the cache
+    return (frozenset(stopwords.words('english')), lemmatizer,
+            lru_cache(maxsize=LEMMA_CACHE_SIZE)(lemmatizer.lemmatize))
+
+
+def _keyword_sentiment(text):
+    """Simple keyword-based polarity in [-1, 1]"""
+    text_lower = text.lower()
+    neg = sum(1 for w in NEGATIVE_WORDS if w in text_lower)
+    pos = sum(1 for w in POSITIVE_WORDS if w in text_lower)
+
+    if neg + pos == 0:
+        return 0
+    return (pos - neg) / (pos + neg)
+
+
+@lru_cache(maxsize=None)
+def _sentiment_scorer(engine):
+    """
+    Scoring function for analysis.sentiment_engine: VADER compound score,
+    TextBlob polarity, or the keyword fallback, whichever is available first.
+    Built once per engine and process.
+    """
+    if engine == 'vader' and VADER_AVAILABLE:
+        try:
+            _ensure_nltk_data('vader_lexicon', 'sentiment/vader_lexicon.zip')
+            polarity_scores = SentimentIntensityAnalyzer().polarity_scores
+            return lambda text: polarity_scores(text)['compound']
+        except Exception:
+            pass
+    if TEXTBLOB_AVAILABLE:
+        return lambda text: TextBlob(text).sentiment.polarity
+    return _keyword_sentiment
+
+
+def _score_texts(engine, texts):
+    """Process pool entry point: score a chunk of review texts."""
+    score = _sentiment_scorer(engine)
+    return [score(t) if t and isinstance(t, str) else 0 for t in texts]
+
 
 class SentimentAnalyzer:
     def __init__(self, config_path=None):
@@ -68,58 +206,92 @@ class SentimentAnalyzer:
         self.output_dir = get_output_dir(self.config) / "analysis"
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # "vader" (default, rule-based and much faster) or "textblob"
+        self.sentiment_engine = self.config.get('analysis', {}).get('sentiment_engine', 'vader')
+        self._score = _sentiment_scorer(self.sentiment_engine)
+        # Processes for scoring large review sets (default: one per CPU)
+        self.workers = self.config.get('analysis', {}).get('workers') or os.cpu_count() or 1
+
         if NLTK_AVAILABLE:
             try:
-                nltk.download('punkt', quiet=True)
-                nltk.download('stopwords', quiet=True)
-                nltk.download('wordnet', quiet=True)
-                self.stop_words = set(stopwords.words('english'))
-                self.lemmatizer = WordNetLemmatizer()
+                self.stop_words, self.lemmatizer, self._lemmatize = _text_resources()
             except:
-                self.stop_words = set()
+                self.stop_words = frozenset()
                 self.lemmatizer = None
 
     def load_reviews(self):
         """Load reviews from data directory"""
         print("📂 Loading reviews...")
 
-        # Try JSON first
+        parquet_file = self.data_dir / "all_reviews.parquet"
+        jsonl_file = self.data_dir / "all_reviews.jsonl"
         json_file = self.data_dir / "all_reviews.json"
         csv_file = self.data_dir / "all_reviews.csv"
 
-        if json_file.exists():
+        # Parquet first when a reader is installed
+        if parquet_file.exists():
+            try:
+                self.reviews_df = pd.read_parquet(parquet_file)
+                print(f"✅ Loaded {len(self.reviews_df)} reviews from Parquet")
+            except ImportError:
+                pass
+
+        if self.reviews_df is not None:
+            pass
+        elif jsonl_file.exists():
+            # Parsed in chunks so the whole file is never held as one string
+            with pd.read_json(jsonl_file, lines=True, dtype=False, convert_dates=False,
+                              chunksize=REVIEW_CHUNK_SIZE) as reader:
+                chunks = list(reader)
+            self.reviews_df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            print(f"✅ Loaded {len(self.reviews_df)} reviews from JSON Lines")
+        elif json_file.exists():
+            # Written by older versions of the scraper
             with open(json_file, 'r') as f:
                 data = json.load(f)
             self.reviews_df = pd.DataFrame(data)
             print(f"✅ Loaded {len(self.reviews_df)} reviews from JSON")
         elif csv_file.exists():
-            self.reviews_df = pd.read_csv(csv_file)
+            self.reviews_df = pd.read_csv(csv_file, dtype={c: 'category' for c in CATEGORY_COLUMNS})
             print(f"✅ Loaded {len(self.reviews_df)} reviews from CSV")
         else:
             print("❌ No review files found!")
             return False
 
+        self._compact_dtypes()
         return True
 
+    def _compact_dtypes(self):
+        """Store brand/location as categoricals and ratings as float32"""
+        df = self.reviews_df
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+        if 'rating' in df.columns:
+            # Missing ratings stay NaN, so an integer dtype would not fit
+            df['rating'] = pd.to_numeric(df['rating'], errors='coerce').astype('float32')
+
     def calculate_sentiment(self, text):
         """Calculate sentiment score"""
         if not text or not isinstance(text, str):
             return 0
 
-        if TEXTBLOB_AVAILABLE:
-            return TextBlob(text).sentiment.polarity
-        else:
-            # Simple keyword-based
-            negative = ["bad", "terrible", "awful", "horrible", "poor", "worst", "disappointed", "hate", "waste"]
-            positive = ["great", "amazing", "love", "excellent", "best", "wonderful", "fantastic", "perfect"]
+        return self._score(text)
 
-            text_lower = text.lower()
-            neg = sum(1 for w in negative if w in text_lower)
-            pos = sum(1 for w in positive if w in text_lower)
+    def score_texts(self, texts):
+        """
+        Sentiment for every text. Large review sets are split into one
+        contiguous chunk per worker process, each loading its own scorer.
+        """
+        texts = list(texts)
+        if self.workers < 2 or len(texts) < PARALLEL_MIN_REVIEWS:
+            return [self.calculate_sentiment(t) for t in texts]
 
-            if neg + pos == 0:
-                return 0
-            return (pos - neg) / (pos + neg)
+        size = -(-len(texts) // self.workers)
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            scored = executor.map(_score_texts, [self.sentiment_engine] * len(chunks), chunks)
+            return [score for chunk in scored for score in chunk]
 
     def filter_negative(self):
         """Filter to negative reviews only"""
@@ -128,12 +300,14 @@ class SentimentAnalyzer:
         threshold = self.config.get('analysis', {}).get('sentiment_threshold', -0.1)
         min_rating = self.config.get('analysis', {}).get('min_rating_negative', 3)
 
-        self.reviews_df['sentiment'] = self.reviews_df['text'].apply(self.calculate_sentiment)
+        sentiment = np.array(self.score_texts(self.reviews_df['text']), dtype=np.float64)
 
+        # Compare at full precision: a score of exactly -0.1 rounds below the
+        # threshold once stored as float32
+        mask = sentiment < threshold
         if 'rating' in self.reviews_df.columns:
-            mask = (self.reviews_df['rating'] <= min_rating) | (self.reviews_df['sentiment'] < threshold)
-        else:
-            mask = self.reviews_df['sentiment'] < threshold
+            mask |= (self.reviews_df['rating'] <= min_rating).to_numpy()
+        self.reviews_df['sentiment'] = sentiment.astype(np.float32)
 
         self.negative_reviews = self.reviews_df[mask].copy()
         print(f"✅ Found {len(self.negative_reviews)} negative reviews")
@@ -145,73 +319,97 @@ class SentimentAnalyzer:
         if not text:
             return ["other"]
 
-        text_lower = text.lower()
-        categories = []
+        if KEYWORD_AUTOMATON is not None:
+            found = {index for _, indexes in KEYWORD_AUTOMATON.iter(text.lower()) for index in indexes}
+            return [_CATEGORY_NAMES[i] for i in sorted(found)] or ["other"]
 
-        for category, keywords in COMPLAINT_CATEGORIES.items():
-            for kw in keywords:
-                if kw in text_lower:
-                    categories.append(category)
-                    break
-
-        return categories if categories else ["other"]
+        return [category for category, pattern in CATEGORY_PATTERNS.items()
+                if pattern.search(text)] or ["other"]
 
     def preprocess_text(self, text):
         """Clean and preprocess text"""
         if not text:
             return ""
 
-        text = text.lower()
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        return self.preprocess_texts(pd.Series([text])).iloc[0]
 
-        if NLTK_AVAILABLE and self.lemmatizer:
-            try:
-                tokens = word_tokenize(text)
-                tokens = [self.lemmatizer.lemmatize(t) for t in tokens
-                         if t not in self.stop_words and len(t) > 2]
-                return ' '.join(tokens)
-            except:
-                pass
+    def preprocess_texts(self, texts):
+        """
+        Clean and preprocess a Series of texts. Lowercasing and stripping
+        non-letters run as vectorized string ops; only stopword removal and
+        (cached) lemmatization go word by word. The text is letters and whitespace by
+        then, so str.split() tokenizes it the same as word_tokenize would.
+        """
+        cleaned = texts.fillna('').astype(str).str.lower().str.replace(_NON_ALPHA_RE, '', regex=True)
 
-        return text
+        if not (NLTK_AVAILABLE and self.lemmatizer):
+            return cleaned
 
-    def extract_key_phrases(self, texts, n=20):
-        """Extract key phrases using TF-IDF"""
+        stop_words = self.stop_words
+        lemmatize = self._lemmatize
+
+        try:
+            return cleaned.map(lambda text: ' '.join(
+                lemmatize(w) for w in text.split() if len(w) > 2 and w not in stop_words
+            ))
+        except Exception:
+            return cleaned
+
+    def count_terms(self, texts):
+        """
+        Tokenize the corpus once into 1-3 gram counts, shared by key phrase
+        extraction and topic modeling. Returns (counts, features), or None
+        when sklearn is missing or no term passes min_df.
+        """
         if not SKLEARN_AVAILABLE or not texts:
+            return None
+
+        try:
+            vectorizer = CountVectorizer(ngram_range=(1, 3), stop_words='english', min_df=2)
+            counts = vectorizer.fit_transform(texts)
+            return counts, vectorizer.get_feature_names_out()
+        except ValueError:
+            return None
+
+    def extract_key_phrases(self, term_counts, n=20):
+        """Extract key phrases using TF-IDF over count_terms() output"""
+        if term_counts is None:
             return []
 
         try:
-            vectorizer = TfidfVectorizer(
-                max_features=100,
-                ngram_range=(1, 3),
-                stop_words='english',
-                min_df=2
-            )
-            matrix = vectorizer.fit_transform(texts)
-            features = vectorizer.get_feature_names_out()
+            counts, features = _most_frequent_terms(*term_counts, N_PHRASE_FEATURES)
+            matrix = TfidfTransformer().fit_transform(counts)
             scores = np.array(matrix.mean(axis=0)).flatten()
             top_idx = scores.argsort()[-n:][::-1]
             return [(features[i], scores[i]) for i in top_idx]
         except:
             return []
 
-    def topic_modeling(self, texts, n_topics=None):
-        """Extract topics using LDA"""
-        if not SKLEARN_AVAILABLE or not texts or len(texts) < 5:
+    def topic_modeling(self, term_counts, n_topics=None):
+        """Extract topics using LDA over the single words of count_terms() output"""
+        if term_counts is None or term_counts[0].shape[0] < 5:
             return []
 
         if n_topics is None:
             n_topics = self.config.get('analysis', {}).get('n_topics', 10)
 
         try:
-            vectorizer = CountVectorizer(max_features=200, stop_words='english', min_df=2)
-            matrix = vectorizer.fit_transform(texts)
-            features = vectorizer.get_feature_names_out()
-
+            counts, features = term_counts
+            words = np.flatnonzero([' ' not in f for f in features])
+            matrix, features = _most_frequent_terms(counts, features, N_TOPIC_FEATURES, words)
+
+            # "batch" (default) or "online" (mini-batches, less memory on big corpora)
+            learning_method = self.config.get('analysis', {}).get('lda_backend', 'batch')
+            # Topics are only reproducible for a fixed n_jobs: the E-step is
+            # split across workers, so 1 (default) keeps them machine-independent
+            lda_jobs = self.config.get('analysis', {}).get('lda_jobs', 1)
             lda = LatentDirichletAllocation(
-                n_components=min(n_topics, len(texts) // 2),
+                n_components=min(n_topics, matrix.shape[0] // 2),
                 random_state=42,
-                max_iter=20
+                max_iter=20,
+                learning_method=learning_method,
+                batch_size=256,
+                n_jobs=lda_jobs
             )
             lda.fit(matrix)
 
@@ -238,43 +436,45 @@ class SentimentAnalyzer:
         print("   Categorizing...")
         self.negative_reviews['categories'] = self.negative_reviews['text'].apply(self.categorize_complaint)
 
-        category_counts = Counter()
-        for cats in self.negative_reviews['categories']:
+        # Row positions per category (in first-seen order), built in one pass
+        category_rows = {}
+        for i, cats in enumerate(self.negative_reviews['categories']):
             for c in cats:
-                category_counts[c] += 1
+                category_rows.setdefault(c, []).append(i)
+        category_counts = Counter({c: len(rows) for c, rows in category_rows.items()})
 
         # Preprocess
         print("   Preprocessing...")
-        self.negative_reviews['processed'] = self.negative_reviews['text'].apply(self.preprocess_text)
+        self.negative_reviews['processed'] = self.preprocess_texts(self.negative_reviews['text'])
         texts = self.negative_reviews['processed'].dropna().tolist()
+        term_counts = self.count_terms(texts)
 
         # Key phrases
         print("   Extracting phrases...")
         n_phrases = self.config.get('analysis', {}).get('n_key_phrases', 20)
-        phrases = self.extract_key_phrases(texts, n_phrases)
+        phrases = self.extract_key_phrases(term_counts, n_phrases)
 
         # Topics
         print("   Topic modeling...")
-        topics = self.topic_modeling(texts)
+        topics = self.topic_modeling(term_counts)
 
         # By brand
         brand_analysis = {}
         if 'brand' in self.negative_reviews.columns:
-            for brand in self.negative_reviews['brand'].unique():
-                brand_reviews = self.negative_reviews[self.negative_reviews['brand'] == brand]
-                brand_cats = Counter()
-                for cats in brand_reviews['categories']:
-                    for c in cats:
-                        brand_cats[c] += 1
-                brand_analysis[brand] = dict(brand_cats.most_common(10))
+            # (brand, category) review counts in one pass; sort=False keeps
+            # first-seen order, so ties rank as they would in a Counter
+            pairs = self.negative_reviews[['brand', 'categories']].explode('categories')
+            counts = pairs.groupby(['brand', 'categories'], sort=False, observed=True).size()
+            for brand, brand_counts in counts.groupby(level=0, sort=False, observed=True):
+                top = brand_counts.droplevel(0).nlargest(10)
+                brand_analysis[brand] = {c: int(n) for c, n in top.items()}
 
         # Sample complaints
-        samples = {}
-        for category in list(category_counts.keys())[:10]:
-            cat_reviews = self.negative_reviews[
-                self.negative_reviews['categories'].apply(lambda x: category in x)
-            ]['text'].head(3).tolist()
-            samples[category] = cat_reviews
+        review_texts = self.negative_reviews['text']
+        samples = {
+            category: review_texts.iloc[rows[:3]].tolist()
+            for category, rows in list(category_rows.items())[:10]
+        }
 
         self.analysis = {
             "total_negative": len(self.negative_reviews),
@@ -340,8 +540,7 @@ class SentimentAnalyzer:
         print(f"📄 Report saved: {report_file}")
 
         json_file = self.output_dir / "analysis.json"
-        with open(json_file, 'w') as f:
-            json.dump(self.analysis, f, indent=2, default=str)
+        save_json(json_file, self.analysis, default=str)
         print(f"📄 JSON saved: {json_file}")
 
         if self.negative_reviews is not None:
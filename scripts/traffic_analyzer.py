@@ -4,14 +4,192 @@ Traffic Metrics Analyzer
 Captures detailed traffic metrics, keyword graphs, and channel data from SEMrush
 """
 
+import asyncio
+import base64
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import quote, urlencode, urlsplit
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+try:
+    from scripts.config_loader import load_config, get_competitor_domains, get_output_dir, ensure_directories
+    from scripts.cdp_screenshot import full_page_params
+except ImportError:
+    from config_loader import load_config, get_competitor_domains, get_output_dir, ensure_directories
+    from cdp_screenshot import full_page_params
+
+# Optional semrush.traffic_backend: playwright (async pages over CDP)
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    async_playwright = None
+
+# Screenshot encodings Chrome can produce (semrush.screenshot_format)
+SCREENSHOT_FORMATS = ("webp", "jpeg", "png")
+DEFAULT_SCREENSHOT_FORMAT = "webp"
+DEFAULT_SCREENSHOT_QUALITY = 85
+
+# (budget multiple, webp/jpeg quality cap): quality drops as the bytes a run
+# has captured pass multiples of semrush.screenshot_budget_mb, so disk use
+# stays bounded on long runs
+DEFAULT_SCREENSHOT_BUDGET_MB = 100
+QUALITY_STEPS = ((5, 55), (1, 70))
+
+# Max seconds to wait for a report to render before capturing it anyway
+REPORT_LOAD_TIMEOUT = 15
+
+# Pause after a report renders (or after a scroll/click), for chart/table
+# animations and lazy sections to start loading
+RENDER_SETTLE_DELAY = 0.3
+
+# Max seconds to wait for spinners to clear after a scroll or click
+SECTION_RENDER_TIMEOUT = 2
+
+# Per-report elements that mean the data has rendered; any one is enough.
+# The generic SEMrush table/card selectors back up the report-specific ones.
+_GENERIC_READY = ("[class*='srf-report-card']", ".sm-table", "table tbody tr")
+READY_SELECTORS = {
+    "traffic_overview": ("[data-testid='traffic-overview-chart']", "[data-test='traffic-overview']") + _GENERIC_READY,
+    "traffic_sources": ("[data-testid='traffic-sources-chart']", "[data-test='traffic-sources']") + _GENERIC_READY,
+    "traffic_journey": ("[data-testid='traffic-journey-chart']", "[data-test='traffic-journey']") + _GENERIC_READY,
+    "historical": ("[data-test='domain-overview']", "[class*='overview'] svg") + _GENERIC_READY,
+    "top_keywords": ("[data-test='positions-table']",) + _GENERIC_READY,
+    "keyword_magic": ("[data-test='keyword-magic-table']",) + _GENERIC_READY,
+}
+
+# Step through the page one viewport at a time (so lazy sections see the
+# viewport), then return to the top; one async round trip for the whole page.
+# Stops at the bottom, when a step no longer moves the window (the report
+# scrolls in its own container, or sub-pixel heights) or after arguments[1]
+# steps (infinite-scroll tables).
+SCROLL_THROUGH_JS = """
+const done = arguments[arguments.length - 1];
+const [stepMs, maxSteps] = arguments;
+let steps = 0;
+const step = () => {
+    const bottom = window.scrollY + window.innerHeight >= document.documentElement.scrollHeight - 1;
+    if (bottom || steps >= maxSteps) { window.scrollTo(0, 0); done(true); return; }
+    const before = window.scrollY;
+    window.scrollBy(0, window.innerHeight);
+    steps++;
+    if (window.scrollY === before) { window.scrollTo(0, 0); done(true); return; }
+    setTimeout(step, stepMs);
+};
+step();
+"""
+SCROLL_STEP_MS = 150
+SCROLL_MAX_STEPS = 40
+# Max seconds for the whole scroll-through
+SCROLL_SCRIPT_TIMEOUT = 30
+
+# Click an in-app link to arguments[0] (same path and every query param of
+# the target, e.g. q and db), so the SEMrush client-side router swaps the
+# view without a full page load. Returns false when no such link is on the page.
+IN_APP_LINK_JS = """
+const target = new URL(arguments[0], location.href);
+if (target.host !== location.host) return false;
+for (const a of document.querySelectorAll('a[href]')) {
+    const href = new URL(a.href, location.href);
+    if (href.pathname === target.pathname
+            && Array.from(target.searchParams).every(([key, value]) => href.searchParams.get(key) === value)) {
+        a.click();
+        return true;
+    }
+}
+return false;
+"""
+# Only the traffic report tabs link to each other; other reports load directly
+IN_APP_LINK_PATH = "/analytics/traffic/"
+
+SEMRUSH_ANALYTICS_URL = "https://www.semrush.com/analytics/"
+
+# Route the single-page app to arguments[0] without reloading it, and check
+# that a search box now shows arguments[0] (the new view has taken over)
+HISTORY_NAV_JS = """
+history.pushState({}, '', arguments[0]);
+window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));
+"""
+SEARCH_BOX_SHOWS_JS = """
+const text = arguments[0].trim().toLowerCase();
+return Array.from(document.querySelectorAll('input')).some(
+    input => input.value.trim().toLowerCase() === text);
+"""
+
+# Requests dropped while capturing keyword tables (report text is unaffected)
+BLOCKED_URL_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.mp4",
+    "*.woff*", "*.ttf",
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*", "*hotjar*",
+)
+
+# Window for semrush.headless_mode; tall, so most reports fit one viewport
+HEADLESS_WINDOW_SIZE = "1920,3000"
+
+# Popup close buttons, and the keyword table's Traffic column to sort by:
+# attribute selectors first, the text-matching XPath only if none match
+POPUP_CLOSE_SELECTOR = "[aria-label='Close'], .modal-close, button[class*='close']"
+TRAFFIC_SORT_SELECTOR = "th[data-test='traffic'], th[data-column='traffic'], [data-test='sort-traffic']"
+TRAFFIC_SORT_LOCATOR = (By.XPATH, "//th[contains(., 'Traffic')] | //button[contains(., 'Traffic')]")
+
+# Click every visible close button in one round trip. Hidden matches are
+# skipped, as Selenium's click would refuse them. Returns how many were clicked.
+CLOSE_POPUPS_JS = """
+let clicked = 0;
+document.querySelectorAll(arguments[0]).forEach(btn => {
+    if (btn.offsetParent === null) return;
+    try { btn.click(); clicked++; } catch (e) {}
+});
+return clicked;
+"""
+
+# Longest time range buttons on the historical report, and a click on the
+# first visible button whose text is one of arguments[0] (true if clicked)
+TIME_RANGE_LABELS = ("2Y", "All time", "All", "Max")
+CLICK_BUTTON_BY_TEXT_JS = """
+for (const btn of document.querySelectorAll('button')) {
+    if (btn.offsetParent !== null && arguments[0].includes(btn.innerText.trim())) {
+        btn.click();
+        return true;
+    }
+}
+return false;
+"""
+
+# Loading indicators that mean a section is still fetching its data
+SPINNER_SELECTOR = ".loading-spinner, [class*='spinner'], [class*='loader']"
+
+# Page loaded and no visible loading indicator
+SECTION_READY_JS = """
+if (document.readyState !== 'complete') return false;
+return !Array.from(document.querySelectorAll(arguments[0])).some(el => el.offsetParent !== null);
+"""
 
-from config_loader import load_config, get_competitor_domains, get_output_dir, ensure_directories
+# Report tabs open at once per browser with the playwright backend
+# (semrush.traffic_pages)
+DEFAULT_TRAFFIC_PAGES = 3
+
+
+def report_url(path, **params):
+    """SEMrush analytics URL for path, with params percent-encoded (keywords may contain &, # or +)"""
+    return f"{SEMRUSH_ANALYTICS_URL}{path}?{urlencode(params, quote_via=quote)}"
+
+
+def page_function(body, async_script=False):
+    """
+    Wrap an execute_script body (reading arguments[i]) as a Playwright page
+    function taking the arguments as one list. With async_script the body
+    gets a callback as its last argument, as in execute_async_script.
+    """
+    if async_script:
+        return f"(args) => new Promise((done) => (function () {{{body}}}).apply(null, [...args, done]))"
+    return f"(args) => (function () {{{body}}}).apply(null, args)"
 
 
 class TrafficAnalyzer:
@@ -25,166 +203,463 @@ class TrafficAnalyzer:
             self.config = config_path
         self.driver = None
         self.wait = None
+        self.report_wait = None
         self.output_dir = get_output_dir(self.config) / "screenshots" / "traffic"
         self.output_dir.mkdir(parents=True, exist_ok=True)
-
-    def connect_to_session(self):
-        """Connect to existing Chrome session"""
-        port = self.config.get('semrush', {}).get('chrome_debug_port', 9222)
-        print(f"🔌 Connecting to Chrome on port {port}...")
-
+        semrush = self.config.get('semrush', {})
+        # Settings read on every report, resolved once
+        self.semrush = semrush
+        self.database = semrush.get('database', 'us')
+        self.headless = bool(semrush.get('headless_mode'))
+        # Repeated keywords would only re-capture the same report
+        self.market_keywords = list(dict.fromkeys(self.config.get('market_keywords', [])))
+        self.screenshot_format = semrush.get('screenshot_format', DEFAULT_SCREENSHOT_FORMAT)
+        if self.screenshot_format not in SCREENSHOT_FORMATS:
+            print(f"⚠️ Unknown screenshot_format {self.screenshot_format!r}, using png")
+            self.screenshot_format = "png"
+        self.screenshot_quality = semrush.get('screenshot_quality', DEFAULT_SCREENSHOT_QUALITY)
+        self.screenshot_budget = semrush.get('screenshot_budget_mb', DEFAULT_SCREENSHOT_BUDGET_MB) * 1_000_000
+        self.bytes_written = 0
+        # Screenshot files are written off the Selenium timeline, in order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-writer")
+        self._pending_writes = []
+        # One timestamp per run plus a shot counter, instead of the clock per shot
+        self._run_ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self._shot_count = 0
+        # Cleared the first time history navigation does not take
+        self._history_nav = True
+
+    def connect_to_session(self, port=None):
+        """
+        Connect to existing Chrome session, or with semrush.headless_mode
+        start a headless Chrome on semrush.headless_user_data_dir (a profile
+        already logged in to SEMrush, not in use by another Chrome)
+        """
+        semrush = self.semrush
         chrome_options = Options()
-        chrome_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{port}")
+        if self.headless:
+            if not semrush.get('headless_user_data_dir'):
+                # A temporary profile would capture logged-out pages
+                print("❌ headless_mode needs semrush.headless_user_data_dir (a profile logged in to SEMrush)")
+                return False
+            print("🔌 Starting headless Chrome...")
+            for arg in ("--headless=new", "--disable-gpu", "--disable-extensions",
+                        f"--window-size={HEADLESS_WINDOW_SIZE}",
+                        f"--user-data-dir={semrush['headless_user_data_dir']}"):
+                chrome_options.add_argument(arg)
+        else:
+            if port is None:
+                port = semrush.get('chrome_debug_port', 9222)
+            print(f"🔌 Connecting to Chrome on port {port}...")
+            chrome_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{port}")
 
         try:
             self.driver = webdriver.Chrome(options=chrome_options)
             self.wait = WebDriverWait(self.driver, 30)
+            self.report_wait = WebDriverWait(self.driver, REPORT_LOAD_TIMEOUT)
             print("✅ Connected!")
             return True
         except Exception as e:
             print(f"❌ Connection failed: {e}")
             return False
 
+    def close_session(self):
+        """Quit a headless Chrome this analyzer started; an attached session is left open"""
+        if self.driver is not None and self.headless:
+            self.driver.quit()
+            self.driver = None
+
     def close_popups(self):
         """Close any modal popups"""
         try:
-            close_btns = self.driver.find_elements(By.CSS_SELECTOR,
-                "[aria-label='Close'], .modal-close, button[class*='close']")
-            for btn in close_btns:
-                try:
-                    btn.click()
-                    time.sleep(0.5)
-                except:
-                    pass
+            return self.driver.execute_script(CLOSE_POPUPS_JS, POPUP_CLOSE_SELECTOR)
         except:
-            pass
-
-    def save_screenshot(self, name):
-        """Save screenshot"""
-        filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        path = self.output_dir / filename
-        self.driver.save_screenshot(str(path))
+            return 0
+
+    def current_quality(self):
+        """screenshot_quality, capped by QUALITY_STEPS as bytes_written passes the budget"""
+        for multiple, quality in QUALITY_STEPS:
+            if self.bytes_written >= multiple * self.screenshot_budget:
+                return min(self.screenshot_quality, quality)
+        return self.screenshot_quality
+
+    def capture_page(self, full_page=False, image_format=None):
+        """
+        Image bytes in image_format (default screenshot_format), straight
+        from CDP Page.captureScreenshot: the viewport, or with full_page the
+        whole document in one capture
+        """
+        metrics = self.driver.execute_cdp_cmd("Page.getLayoutMetrics", {}) if full_page else None
+        params = self.screenshot_params(image_format, metrics)
+        result = self.driver.execute_cdp_cmd("Page.captureScreenshot", params)
+        return base64.b64decode(result['data'])
+
+    def screenshot_params(self, image_format=None, metrics=None):
+        """Page.captureScreenshot params; with Page.getLayoutMetrics metrics, the whole document"""
+        image_format = image_format or self.screenshot_format
+        params = {"format": image_format}
+        if image_format != "png":
+            params["quality"] = self.current_quality()
+        if metrics:
+            params.update(full_page_params(metrics))
+        return params
+
+    def screenshot_path(self, name, image_format=None):
+        """Next file for a shot: {name}_{run timestamp}_{shot number}.{format}"""
+        self._shot_count += 1
+        filename = f"{name}_{self._run_ts}_{self._shot_count:03d}.{image_format or self.screenshot_format}"
+        return self.output_dir / filename
+
+    def write_screenshot(self, path, image):
+        """Queue image bytes for the writer thread"""
+        self.bytes_written += len(image)
+        self._pending_writes.append(self._writer.submit(path.write_bytes, image))
+
+    def save_screenshot(self, name, full_page=False, image_format=None):
+        """
+        Save screenshot (full_page: the whole report instead of the
+        viewport; image_format: e.g. "png" to keep one shot lossless)
+        """
+        path = self.screenshot_path(name, image_format)
+        try:
+            self.write_screenshot(path, self.capture_page(full_page, image_format))
+        except WebDriverException:
+            # No CDP on this driver: Selenium's own PNG capture
+            path = path.with_suffix(".png")
+            self.driver.save_screenshot(str(path))
         print(f"📸 {path}")
         return path
 
-    def capture_traffic_overview(self, domain):
-        """Capture traffic overview with historical graphs"""
-        print(f"\n📈 Traffic Overview: {domain}")
+    def block_heavy_resources(self, blocked=True):
+        """Stop (or with blocked=False, resume) loading images, fonts and trackers"""
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            urls = list(BLOCKED_URL_PATTERNS) if blocked else []
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+        except Exception as e:
+            print(f"  [Warning] Could not change blocked page resources: {e}")
+
+    def save_full_page(self, name, image_format=None):
+        """
+        Capture the whole report in one shot. The page is stepped through
+        first so lazy-loaded sections below the fold render, then captured
+        from the top without further scrolling.
+        """
+        try:
+            self.driver.set_script_timeout(SCROLL_SCRIPT_TIMEOUT)
+            self.driver.execute_async_script(SCROLL_THROUGH_JS, SCROLL_STEP_MS, SCROLL_MAX_STEPS)
+        except WebDriverException:
+            try:
+                self.driver.execute_script("window.scrollTo(0, 0);")
+            except WebDriverException:
+                pass
+        self.wait_for_render()
+        return self.save_screenshot(name, full_page=True, image_format=image_format)
+
+    def flush_screenshots(self):
+        """Wait for queued screenshot writes; returns how many failed"""
+        failed = 0
+        for future in self._pending_writes:
+            error = future.exception()
+            if error is not None:
+                failed += 1
+                print(f"⚠️ Screenshot write failed: {error}")
+        self._pending_writes = []
+        return failed
+
+    def wait_for_report(self, report):
+        """
+        Wait until any READY_SELECTORS[report] element is present. Returns
+        False on timeout; the caller still captures whatever has rendered.
+        """
+        try:
+            self.report_wait.until(EC.any_of(*(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                for selector in READY_SELECTORS[report]
+            )))
+            time.sleep(RENDER_SETTLE_DELAY)
+            return True
+        except TimeoutException:
+            print(f"⚠️ Report not rendered after {REPORT_LOAD_TIMEOUT}s, capturing anyway")
+            return False
+
+    def wait_for_render(self):
+        """
+        After a scroll or click: give lazy sections a moment to start
+        loading, then wait (at most SECTION_RENDER_TIMEOUT) for spinners to clear
+        """
+        time.sleep(RENDER_SETTLE_DELAY)
+        try:
+            WebDriverWait(self.driver, SECTION_RENDER_TIMEOUT, poll_frequency=0.1).until(
+                lambda driver: driver.execute_script(SECTION_READY_JS, SPINNER_SELECTOR)
+            )
+        except TimeoutException:
+            pass
 
-        url = f"https://www.semrush.com/analytics/traffic/overview/?q={domain}"
+    def history_navigate(self, url, search_text):
+        """
+        Route the already-loaded app view to url with history.pushState
+        (e.g. keyword magic from one keyword to the next), skipping the app's
+        boot on a full load. Confirmed by a search box showing search_text;
+        if that never happens, returns False and is not tried again this run.
+        """
+        if not self._history_nav or urlsplit(self.driver.current_url).path != urlsplit(url).path:
+            return False
+        self.driver.execute_script(HISTORY_NAV_JS, url)
+        try:
+            self.report_wait.until(lambda driver: driver.execute_script(SEARCH_BOX_SHOWS_JS, search_text))
+        except TimeoutException:
+            print("  [Warning] In-app navigation did not switch the report, reloading pages instead")
+            self._history_nav = False
+            return False
+        self.wait_for_render()
+        return True
+
+    def navigate(self, url, search_text=None):
+        """
+        Go to url through an in-app link when it is a traffic tab the current
+        page links to (IN_APP_LINK_PATH), or with search_text through
+        history navigation, falling back to a full driver.get().
+        Nothing is reloaded when the browser is already on url.
+        """
+        try:
+            if self.driver.current_url == url:
+                return
+            if search_text and self.history_navigate(url, search_text):
+                return
+            path = urlsplit(url).path
+            if path.startswith(IN_APP_LINK_PATH) and self.driver.execute_script(IN_APP_LINK_JS, url):
+                self.report_wait.until(lambda driver: urlsplit(driver.current_url).path == path)
+                # The previous view's tables may still match READY_SELECTORS
+                # until the new view's spinners have come and gone
+                self.wait_for_render()
+                return
+        except (TimeoutException, WebDriverException):
+            pass
         self.driver.get(url)
-        time.sleep(7)
+
+    def open_report(self, url, report, search_text=None):
+        """Open a report, wait for it to render and close popups"""
+        self.navigate(url, search_text)
+        self.wait_for_report(report)
         self.close_popups()
 
-        # Main overview
-        self.save_screenshot(f"traffic_overview_{domain.replace('.', '_')}")
+    def capture_traffic_overview(self, domain):
+        """Capture traffic overview with historical graphs"""
+        print(f"\n📈 Traffic Overview: {domain}")
+        safe_domain = domain.replace('.', '_')
 
-        # Channels
-        self.driver.execute_script("window.scrollTo(0, 600)")
-        time.sleep(2)
-        self.save_screenshot(f"traffic_channels_{domain.replace('.', '_')}")
+        url = report_url("traffic/overview/", q=domain)
+        self.open_report(url, "traffic_overview")
 
-        # Geographic
-        self.driver.execute_script("window.scrollTo(0, 1200)")
-        time.sleep(2)
-        self.save_screenshot(f"traffic_geo_{domain.replace('.', '_')}")
+        # Overview, channels and geographic data in one capture
+        self.save_full_page(f"traffic_overview_{safe_domain}")
 
     def capture_traffic_sources(self, domain):
         """Capture traffic sources breakdown"""
         print(f"\n📊 Traffic Sources: {domain}")
+        safe_domain = domain.replace('.', '_')
 
-        url = f"https://www.semrush.com/analytics/traffic/traffic-sources/?q={domain}"
-        self.driver.get(url)
-        time.sleep(7)
-        self.close_popups()
-
-        self.save_screenshot(f"sources_{domain.replace('.', '_')}")
+        url = report_url("traffic/traffic-sources/", q=domain)
+        self.open_report(url, "traffic_sources")
 
-        self.driver.execute_script("window.scrollTo(0, 500)")
-        time.sleep(2)
-        self.save_screenshot(f"sources_detail_{domain.replace('.', '_')}")
+        # Breakdown and detail table in one capture
+        self.save_full_page(f"sources_{safe_domain}")
 
     def capture_traffic_journey(self, domain):
         """Capture traffic journey / user flow"""
         print(f"\n🔄 Traffic Journey: {domain}")
+        safe_domain = domain.replace('.', '_')
 
-        url = f"https://www.semrush.com/analytics/traffic/traffic-journey/?q={domain}"
-        self.driver.get(url)
-        time.sleep(7)
-        self.close_popups()
+        url = report_url("traffic/traffic-journey/", q=domain)
+        self.open_report(url, "traffic_journey")
 
-        self.save_screenshot(f"journey_{domain.replace('.', '_')}")
+        self.save_screenshot(f"journey_{safe_domain}")
 
     def capture_historical_data(self, domain):
         """Capture historical traffic data"""
         print(f"\n📅 Historical Data: {domain}")
+        safe_domain = domain.replace('.', '_')
 
-        url = f"https://www.semrush.com/analytics/overview/?q={domain}&searchType=domain"
-        self.driver.get(url)
-        time.sleep(6)
-        self.close_popups()
+        url = report_url("overview/", q=domain, searchType="domain")
+        self.open_report(url, "historical")
 
         # Try to select longer time range
         try:
-            time_buttons = self.driver.find_elements(By.CSS_SELECTOR, "button")
-            for btn in time_buttons:
-                if btn.text in ["2Y", "All time", "All", "Max"]:
-                    btn.click()
-                    time.sleep(3)
-                    break
+            if self.driver.execute_script(CLICK_BUTTON_BY_TEXT_JS, list(TIME_RANGE_LABELS)):
+                self.wait_for_render()
         except:
             pass
 
-        self.save_screenshot(f"historical_{domain.replace('.', '_')}")
-
-        self.driver.execute_script("window.scrollTo(0, 400)")
-        time.sleep(2)
-        self.save_screenshot(f"historical_graph_{domain.replace('.', '_')}")
+        # Summary and graph in one capture
+        self.save_full_page(f"historical_{safe_domain}")
 
     def capture_top_keywords(self, domain):
         """Capture top organic keywords"""
         print(f"\n🏆 Top Keywords: {domain}")
-        db = self.config.get('semrush', {}).get('database', 'us')
-
-        url = f"https://www.semrush.com/analytics/organic/positions/?db={db}&q={domain}&searchType=domain"
-        self.driver.get(url)
-        time.sleep(6)
-        self.close_popups()
+        safe_domain = domain.replace('.', '_')
+        url = report_url("organic/positions/", db=self.database, q=domain, searchType="domain")
+        self.open_report(url, "top_keywords")
 
         # Try to sort by traffic
         try:
-            traffic_header = self.driver.find_element(By.XPATH,
-                "//th[contains(., 'Traffic')] | //button[contains(., 'Traffic')]")
+            headers = self.driver.find_elements(By.CSS_SELECTOR, TRAFFIC_SORT_SELECTOR)
+            traffic_header = headers[0] if headers else self.driver.find_element(*TRAFFIC_SORT_LOCATOR)
             traffic_header.click()
-            time.sleep(2)
+            self.wait_for_render()
         except:
             pass
 
-        self.save_screenshot(f"top_keywords_{domain.replace('.', '_')}")
-
-        self.driver.execute_script("window.scrollTo(0, 400)")
-        time.sleep(1)
-        self.save_screenshot(f"top_keywords_more_{domain.replace('.', '_')}")
+        # Whole keyword table in one capture
+        self.save_full_page(f"top_keywords_{safe_domain}")
 
     def capture_market_keywords(self):
         """Capture market keyword research"""
         print(f"\n🎯 Market Keywords...")
 
-        keywords = self.config.get('market_keywords', [])
-        db = self.config.get('semrush', {}).get('database', 'us')
+        # Only table data is captured here; unblocked again for the user's tab
+        self.block_heavy_resources()
+        try:
+            for kw in self.market_keywords:
+                url = report_url("keywordmagic/", q=kw, db=self.database)
+                # After the first keyword, the loaded app is re-routed in place
+                self.open_report(url, "keyword_magic", search_text=kw)
+
+                safe_name = kw.replace(' ', '_')
+                # Summary and keyword list in one capture
+                self.save_full_page(f"market_kw_{safe_name}")
+        finally:
+            self.block_heavy_resources(blocked=False)
+
+    def analyze_domain(self, domain):
+        """Capture the five traffic reports for one domain on this analyzer's browser"""
+        print(f"\n{'#'*60}")
+        print(f"# {domain}")
+        print("#" * 60)
+
+        self.capture_traffic_overview(domain)
+        time.sleep(2)
+
+        self.capture_traffic_sources(domain)
+        time.sleep(2)
 
-        for kw in keywords:
-            url = f"https://www.semrush.com/analytics/keywordmagic/?q={kw.replace(' ', '%20')}&db={db}"
-            self.driver.get(url)
-            time.sleep(6)
-            self.close_popups()
+        self.capture_traffic_journey(domain)
+        time.sleep(2)
 
-            safe_name = kw.replace(' ', '_')
-            self.save_screenshot(f"market_kw_{safe_name}")
+        self.capture_top_keywords(domain)
+        time.sleep(2)
 
-            self.driver.execute_script("window.scrollTo(0, 400)")
-            time.sleep(1)
-            self.save_screenshot(f"market_kw_{safe_name}_list")
+        self.capture_historical_data(domain)
+        time.sleep(3)
+
+    def analyze_domains(self, domains):
+        """
+        Analyze every domain, sequentially on this browser or, when
+        semrush.worker_debug_ports lists 2+ logged-in Chrome instances, split
+        round-robin across one process per browser.
+        """
+        ports = self.semrush.get('worker_debug_ports') or []
+        # Headless workers would all open the same profile directory
+        if self.headless or len(ports) < 2 or len(domains) < 2:
+            for domain in domains:
+                self.analyze_domain(domain)
+            return
+
+        groups = [(port, list(domains[i::len(ports)])) for i, port in enumerate(ports)]
+        groups = [(port, group) for port, group in groups if group]
+        print(f"\n🧵 Using {len(groups)} Chrome workers on ports {[port for port, _ in groups]}")
+
+        # Domains a worker could not analyze (no connection, or it crashed)
+        leftover = set()
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [
+                # Each browser gets an equal share of the run's screenshot budget
+                (port, group, executor.submit(_analysis_worker, self.config, port, group,
+                                              self.screenshot_budget / len(groups)))
+                for port, group in groups
+            ]
+            for port, group, future in futures:
+                try:
+                    bytes_written, missing = future.result()
+                except Exception as e:
+                    print(f"⚠️ Chrome worker on port {port} failed: {e}")
+                    bytes_written, missing = 0, group
+                self.bytes_written += bytes_written
+                leftover.update(missing)
+
+        if leftover:
+            print(f"\n🔁 Analyzing {len(leftover)} domains on this browser instead")
+        for domain in domains:
+            if domain in leftover:
+                self.analyze_domain(domain)
+
+    async def playwright_contexts(self, playwright):
+        """
+        Browser contexts for the playwright backend: a headless Chrome on
+        headless_user_data_dir with semrush.headless_mode, else the logged-in
+        profile of every Chrome on worker_debug_ports (or chrome_debug_port)
+        """
+        if self.headless:
+            user_data_dir = self.semrush.get('headless_user_data_dir')
+            if not user_data_dir:
+                # A temporary profile would capture logged-out pages
+                print("❌ headless_mode with traffic_backend: playwright needs semrush.headless_user_data_dir")
+                return []
+            print("🔌 Starting headless Chrome...")
+            width, height = (int(n) for n in HEADLESS_WINDOW_SIZE.split(","))
+            try:
+                # Installed Chrome, not bundled Chromium: only Chrome can
+                # decrypt the cookies of a profile logged in with Chrome
+                context = await playwright.chromium.launch_persistent_context(
+                    user_data_dir,
+                    channel="chrome",
+                    headless=True,
+                    viewport={"width": width, "height": height},
+                )
+            except Exception as e:
+                print(f"❌ Could not start headless Chrome: {e}")
+                return []
+            return [context]
+
+        contexts = []
+        for port in self.semrush.get('worker_debug_ports') or [self.semrush.get('chrome_debug_port', 9222)]:
+            print(f"🔌 Connecting to Chrome on port {port}...")
+            try:
+                browser = await playwright.chromium.connect_over_cdp(f"http://127.0.0.1:{port}")
+            except Exception as e:
+                print(f"❌ Connection failed: {e}")
+                continue
+            contexts.append(browser.contexts[0] if browser.contexts else await browser.new_context())
+        if contexts:
+            print("✅ Connected!")
+        return contexts
+
+    async def run_playwright_analysis(self, domains):
+        """
+        semrush.traffic_backend: playwright. Every domain and every market
+        keyword gets its own page, spread round-robin over the browsers;
+        up to semrush.traffic_pages pages run at once in each browser.
+        Returns False if no browser could be reached.
+        """
+        async with async_playwright() as playwright:
+            contexts = await self.playwright_contexts(playwright)
+            if not contexts:
+                return False
+
+            limit = max(1, int(self.semrush.get('traffic_pages', DEFAULT_TRAFFIC_PAGES)))
+            semaphores = [asyncio.Semaphore(limit) for _ in contexts]
+            jobs = [(PlaywrightReportPage.analyze_domain, domain) for domain in domains]
+            jobs += [(PlaywrightReportPage.capture_market_keyword, kw) for kw in self.market_keywords]
+            print(f"\n🧵 {len(jobs)} report pages over {len(contexts)} browser(s), {limit} at once each")
+
+            await asyncio.gather(*(
+                PlaywrightReportPage.run(self, contexts[i % len(contexts)], semaphores[i % len(contexts)], job, arg)
+                for i, (job, arg) in enumerate(jobs)
+            ))
+
+            if self.headless:
+                await contexts[0].close()
+            return True
 
     def run_full_analysis(self):
         """Run complete traffic analysis"""
@@ -194,46 +669,185 @@ class TrafficAnalyzer:
 
         ensure_directories()
 
-        if not self.connect_to_session():
-            return False
-
-        competitors = get_competitor_domains(self.config)
-
-        for domain in competitors:
-            print(f"\n{'#'*60}")
-            print(f"# {domain}")
-            print("#" * 60)
-
-            self.capture_traffic_overview(domain)
-            time.sleep(2)
+        domains = list(dict.fromkeys(get_competitor_domains(self.config)))
+        backend = self.semrush.get('traffic_backend', 'selenium')
+        if backend == 'playwright' and async_playwright is None:
+            print("⚠️ traffic_backend: playwright needs the playwright package, using Selenium")
+            backend = 'selenium'
 
-            self.capture_traffic_sources(domain)
-            time.sleep(2)
+        if backend == 'playwright':
+            if not asyncio.run(self.run_playwright_analysis(domains)):
+                return False
+        else:
+            if not self.connect_to_session():
+                return False
+
+            try:
+                self.analyze_domains(domains)
+
+                # Market analysis (on this browser, after every domain is done)
+                print(f"\n{'#'*60}")
+                print("# MARKET ANALYSIS")
+                print("#" * 60)
+
+                self.capture_market_keywords()
+            finally:
+                self.close_session()
+        self.flush_screenshots()
+
+        # Count files: one directory pass over every format, no Path objects
+        suffixes = tuple(f".{fmt}" for fmt in SCREENSHOT_FORMATS)
+        with os.scandir(self.output_dir) as entries:
+            count = sum(1 for entry in entries if entry.name.endswith(suffixes))
+        print("\n" + "=" * 60)
+        print(f"✅ ANALYSIS COMPLETE! {count} screenshots saved")
+        print("=" * 60)
+        print(f"📁 Output: {self.output_dir}")
+        print(f"💾 Screenshots: {self.bytes_written / 1_000_000:.1f} MB "
+              f"(semrush.screenshot_budget_mb: {self.screenshot_budget / 1_000_000:g})")
 
-            self.capture_traffic_journey(domain)
-            time.sleep(2)
+        return True
 
-            self.capture_top_keywords(domain)
-            time.sleep(2)
 
-            self.capture_historical_data(domain)
-            time.sleep(3)
+class PlaywrightReportPage:
+    """
+    One Playwright page driven the way TrafficAnalyzer drives its Selenium
+    tab (same selectors, in-page scripts and screenshot files), for
+    semrush.traffic_backend: playwright
+    """
+
+    def __init__(self, analyzer, page, cdp):
+        self.analyzer = analyzer
+        self.page = page
+        self.cdp = cdp
+
+    @classmethod
+    async def run(cls, analyzer, context, semaphore, job, arg):
+        """Run job(report_page, arg) on a new page of context, once semaphore allows"""
+        async with semaphore:
+            page = await context.new_page()
+            try:
+                await job(cls(analyzer, page, await context.new_cdp_session(page)), arg)
+            except Exception as e:
+                print(f"❌ {arg}: {e}")
+            finally:
+                await page.close()
+
+    async def run_script(self, body, *args, async_script=False):
+        """Evaluate an execute_script body on the page; None if it fails"""
+        try:
+            return await self.page.evaluate(page_function(body, async_script), list(args))
+        except Exception:
+            return None
 
-        # Market analysis
-        print(f"\n{'#'*60}")
-        print("# MARKET ANALYSIS")
-        print("#" * 60)
+    async def open_report(self, url, report):
+        """Open a report, wait for it to render and close popups"""
+        await self.page.goto(url, wait_until="domcontentloaded")
+        try:
+            await self.page.wait_for_selector(", ".join(READY_SELECTORS[report]), state="attached",
+                                              timeout=REPORT_LOAD_TIMEOUT * 1000)
+            await asyncio.sleep(RENDER_SETTLE_DELAY)
+        except PlaywrightTimeoutError:
+            print(f"⚠️ Report not rendered after {REPORT_LOAD_TIMEOUT}s, capturing anyway")
+        await self.run_script(CLOSE_POPUPS_JS, POPUP_CLOSE_SELECTOR)
+
+    async def wait_for_render(self):
+        """As TrafficAnalyzer.wait_for_render"""
+        await asyncio.sleep(RENDER_SETTLE_DELAY)
+        try:
+            await self.page.wait_for_function(page_function(SECTION_READY_JS), arg=[SPINNER_SELECTOR],
+                                              polling=100, timeout=SECTION_RENDER_TIMEOUT * 1000)
+        except PlaywrightTimeoutError:
+            pass
 
-        self.capture_market_keywords()
+    async def save_screenshot(self, name, full_page=False):
+        """CDP capture of the viewport (or whole report) into the analyzer's screenshot files"""
+        metrics = await self.cdp.send("Page.getLayoutMetrics") if full_page else None
+        result = await self.cdp.send("Page.captureScreenshot", self.analyzer.screenshot_params(metrics=metrics))
+        path = self.analyzer.screenshot_path(name)
+        self.analyzer.write_screenshot(path, base64.b64decode(result['data']))
+        print(f"📸 {path}")
 
-        # Count files
-        files = list(self.output_dir.glob("*.png"))
-        print("\n" + "=" * 60)
-        print(f"✅ ANALYSIS COMPLETE! {len(files)} screenshots saved")
-        print("=" * 60)
-        print(f"📁 Output: {self.output_dir}")
+    async def save_full_page(self, name):
+        """As TrafficAnalyzer.save_full_page, with the same SCROLL_SCRIPT_TIMEOUT"""
+        try:
+            await asyncio.wait_for(
+                self.run_script(SCROLL_THROUGH_JS, SCROLL_STEP_MS, SCROLL_MAX_STEPS, async_script=True),
+                SCROLL_SCRIPT_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            await self.run_script("window.scrollTo(0, 0);")
+        await self.wait_for_render()
+        await self.save_screenshot(name, full_page=True)
+
+    async def sort_by_traffic(self):
+        """Click the keyword table's Traffic header, attribute selectors first"""
+        header = self.page.locator(TRAFFIC_SORT_SELECTOR).or_(
+            self.page.locator(f"xpath={TRAFFIC_SORT_LOCATOR[1]}")).first
+        try:
+            await header.click(timeout=SECTION_RENDER_TIMEOUT * 1000)
+            await self.wait_for_render()
+        except PlaywrightTimeoutError:
+            pass
 
-        return True
+    async def analyze_domain(self, domain):
+        """The five traffic reports for one domain, paced as on the Selenium tab"""
+        print(f"\n🌐 {domain}: traffic reports")
+        safe_domain = domain.replace('.', '_')
+        db = self.analyzer.database
+
+        await self.open_report(report_url("traffic/overview/", q=domain), "traffic_overview")
+        await self.save_full_page(f"traffic_overview_{safe_domain}")
+        await asyncio.sleep(2)
+
+        await self.open_report(report_url("traffic/traffic-sources/", q=domain), "traffic_sources")
+        await self.save_full_page(f"sources_{safe_domain}")
+        await asyncio.sleep(2)
+
+        await self.open_report(report_url("traffic/traffic-journey/", q=domain), "traffic_journey")
+        await self.save_screenshot(f"journey_{safe_domain}")
+        await asyncio.sleep(2)
+
+        await self.open_report(report_url("organic/positions/", db=db, q=domain, searchType="domain"),
+                               "top_keywords")
+        await self.sort_by_traffic()
+        await self.save_full_page(f"top_keywords_{safe_domain}")
+        await asyncio.sleep(2)
+
+        await self.open_report(report_url("overview/", q=domain, searchType="domain"), "historical")
+        if await self.run_script(CLICK_BUTTON_BY_TEXT_JS, list(TIME_RANGE_LABELS)):
+            await self.wait_for_render()
+        await self.save_full_page(f"historical_{safe_domain}")
+
+    async def capture_market_keyword(self, kw):
+        """One keyword magic report; its page only ever shows table data, so heavy resources stay blocked"""
+        print(f"\n🎯 Market Keyword: {kw}")
+        try:
+            await self.cdp.send("Network.enable")
+            await self.cdp.send("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+        except Exception as e:
+            print(f"  [Warning] Could not block page resources: {e}")
+
+        await self.open_report(report_url("keywordmagic/", q=kw, db=self.analyzer.database), "keyword_magic")
+        await self.save_full_page(f"market_kw_{kw.replace(' ', '_')}")
+
+
+def _analysis_worker(config, port, domains, screenshot_budget=None):
+    """
+    Process pool entry point: analyze `domains` through the Chrome on `port`,
+    against screenshot_budget bytes (its share of the run's budget).
+    Returns (bytes captured, domains not analyzed), the latter being every
+    domain when the browser cannot be reached.
+    """
+    analyzer = TrafficAnalyzer(config)
+    if screenshot_budget is not None:
+        analyzer.screenshot_budget = screenshot_budget
+    if not analyzer.connect_to_session(port):
+        return 0, list(domains)
+    for domain in domains:
+        analyzer.analyze_domain(domain)
+    analyzer.flush_screenshots()
+    return analyzer.bytes_written, []
 
 
 def main():
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+WebDriver Connection Pool
+Widens the urllib3 pool Selenium uses to talk to chromedriver, so waits,
+finds and execute_script calls share keep-alive connections instead of
+queueing on (and recycling) a single one.
+"""
+
+# Connections kept open to chromedriver per driver
+POOL_MAXSIZE = 20
+
+
+def widen_connection_pool(driver, maxsize=POOL_MAXSIZE):
+    """
+    Replace the driver's pool manager with one holding up to maxsize
+    keep-alive connections and no urllib3 retries (a failed command should
+    fail, not be replayed).
+
+    webdriver.Chrome does not take a ClientConfig, so the remote connection's
+    config is updated in place and its pool rebuilt. Selenium versions
+    without ClientConfig, or drivers created without keep-alive, are left as
+    they are. Returns the driver.
+    """
+    executor = getattr(driver, 'command_executor', None)
+    client_config = getattr(executor, '_client_config', None)
+    if client_config is None or not client_config.keep_alive:
+        return driver
+
+    # RemoteConnection reads the pool kwargs from this nested key
+    client_config.init_args_for_pool_manager = {
+        "init_args_for_pool_manager": {"maxsize": maxsize, "retries": False},
+    }
+    old_conn = executor._conn
+    executor._conn = executor._get_connection_manager()
+    old_conn.clear()
+
+    return driver